@@ -0,0 +1,80 @@
+"""
+Import Time Budget
+==================
+
+Measures the cold import time of the data_utils entry points in fresh
+interpreters and checks it against a budget. It also checks that modules
+whose analysis functions do not need altair do not import it. Exits with
+status 1 if any check fails.
+
+The repository has no test suite or CI, so this is a standalone check
+script run by hand rather than a pytest test.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --scale 2   # slower machines
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+# Module -> cold import budget in seconds (best of --repeat runs)
+IMPORT_BUDGETS = {
+    "data_utils.__main__": 0.05,
+    "data_utils.privacy_policy_analyzer": 1.0,
+    "data_utils.privacy_policy_extractor": 1.0,
+    "data_utils.data_cleaner": 1.0
+}
+
+# Modules that must load without these dependencies
+FORBIDDEN_IMPORTS = {
+    "data_utils.__main__": ["pandas", "numpy", "altair"],
+    "data_utils.privacy_policy_analyzer": ["altair"],
+    "data_utils.privacy_policy_extractor": ["altair"],
+    "data_utils.data_cleaner": ["altair"]
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure_import(module):
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        dict: {"seconds": import time, "modules": modules loaded afterwards}
+    """
+    result = subprocess.run([sys.executable, "-c", _PROBE.format(module=module)], cwd=project_root,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='Imports per module (the fastest counts)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget by this factor')
+    args = parser.parse_args()
+
+    failures = []
+    for module, budget in IMPORT_BUDGETS.items():
+        runs = [measure_import(module) for _ in range(args.repeat)]
+        seconds = min(run["seconds"] for run in runs)
+        loaded = set(runs[0]["modules"])
+        forbidden = [name for name in FORBIDDEN_IMPORTS.get(module, []) if name in loaded]
+        ok = seconds <= budget * args.scale and not forbidden
+        print(f"{'ok  ' if ok else 'FAIL'} {module:40s} {seconds * 1000:8.1f} ms (budget {budget * args.scale * 1000:.0f} ms)"
+              + (f"  imports {', '.join(forbidden)}" if forbidden else ""))
+        if not ok:
+            failures.append(module)
+
+    sys.exit(1 if failures else 0)
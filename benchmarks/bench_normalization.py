@@ -0,0 +1,83 @@
+"""
+Name Normalization Benchmark
+============================
+
+Compares per-row `Series.apply` normalization (the previous implementation)
+with the factorized batch kernels in `data_utils.normalization`, on the
+company names of `data-brokers-15-10-2025.csv` and on a synthetic registry.
+
+Usage:
+    python benchmarks/bench_normalization.py --rows 10000000
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from data_utils.normalization import compact_lowercase_values, normalize_company_names
+
+
+def per_row_normalize_name(name):
+    if not isinstance(name, str):
+        return ""
+    name = name.upper()
+    name = re.sub(r'\b(INC|LLC|CORPORATION)\b', '', name)
+    name = re.sub(r'[^\w\s]', '', name)
+    name = re.sub(r'\s+', ' ', name).strip()
+    return name
+
+
+def per_row_compact(value):
+    if pd.isna(value):
+        return ""
+    return re.sub(r'\s+', '', str(value).lower())
+
+
+def synthetic_names(rows, unique_names=50_000, seed=42):
+    """
+    Draw `rows` company names from a pool of `unique_names` bases decorated
+    with the suffix and punctuation variants seen across state registries.
+    """
+    rng = np.random.default_rng(seed)
+    bases = np.array([f"Broker {i} Data" for i in range(unique_names)], dtype=object)
+    suffixes = np.array(["", " Inc.", ", LLC", " Corporation", " inc", "  LLC "], dtype=object)
+    picks = bases[rng.integers(0, unique_names, rows)] + suffixes[rng.integers(0, len(suffixes), rows)]
+    return pd.Series(picks, dtype=object)
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def compare(label, names):
+    old_name_time, old_names = time_call(lambda s: s.apply(per_row_normalize_name), names)
+    new_name_time, new_names = time_call(normalize_company_names, names)
+    old_url_time, old_urls = time_call(lambda s: s.apply(per_row_compact), names)
+    new_url_time, new_urls = time_call(compact_lowercase_values, names)
+    assert old_names.equals(new_names) and old_urls.equals(new_urls)
+
+    print(f"{label} ({len(names):,} rows, {names.nunique():,} distinct)")
+    print(f"  normalize_company_names: {old_name_time:8.3f}s -> {new_name_time:8.3f}s "
+          f"({old_name_time / new_name_time:.1f}x)")
+    print(f"  compact_lowercase_values: {old_url_time:8.3f}s -> {new_url_time:8.3f}s "
+          f"({old_url_time / new_url_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000_000, help='Rows in the synthetic registry')
+    args = parser.parse_args()
+
+    registry = pd.read_csv(project_root / 'data/raw_data/data-brokers-15-10-2025.csv', usecols=['Company Name'])
+    compare('data-brokers-15-10-2025.csv', registry['Company Name'])
+    compare('Synthetic registry', synthetic_names(args.rows))
@@ -0,0 +1,101 @@
+"""
+Privacy Policy Summary Benchmark
+================================
+
+Compares the previous `prepare_privacy_policy_summary` implementation (parse
+each question with string splits, melt, label, groupby twice, build records)
+with the single-pass bincount engine, on the scraped policy responses and on
+a synthetic set of LLM responses.
+
+Usage:
+    python benchmarks/bench_policy_summary.py --rows 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from data_utils.privacy_policy_analyzer import (
+    CATEGORY_TITLES, LLM_QUESTIONS, QUESTION_LABELS, RESPONSE_LABELS,
+    parse_llm_responses, prepare_privacy_policy_summary
+)
+
+
+def previous_build_response_summary(df, question_key):
+    long_df = df.melt(id_vars=["Name"], var_name="category", value_name="response")
+    long_df = long_df.dropna(subset=["response"])
+    long_df["question"] = QUESTION_LABELS.get(question_key, question_key)
+    long_df["response_label"] = long_df["response"].map(RESPONSE_LABELS)
+    long_df["category_label"] = (
+        long_df["category"].map(CATEGORY_TITLES)
+        .fillna(long_df["category"].str.replace("_", " ").str.title())
+    )
+    counts = (
+        long_df.groupby(["question", "category", "category_label", "response", "response_label"], as_index=False)
+        .size()
+        .rename(columns={"size": "count"})
+    )
+    counts["share"] = counts["count"] / counts.groupby(["question", "category"])["count"].transform("sum")
+    return counts
+
+
+def previous_prepare_summary(llm_data):
+    frames = [
+        previous_build_response_summary(parse_llm_responses(llm_data, column, categories), question)
+        for question, (column, categories, _) in LLM_QUESTIONS.items()
+    ]
+    summary_df = pd.concat(frames, ignore_index=True)
+    summary_df["response_label"] = pd.Categorical(
+        summary_df["response_label"], categories=["Yes", "No", "Not Mentioned"], ordered=True
+    )
+    summary_df.sort_values(["question", "category", "response_label"], inplace=True)
+    return summary_df.to_dict(orient="records")
+
+
+def synthetic_responses(rows, seed=42):
+    """
+    Draw random well-formed or missing responses for every LLM question.
+    """
+    rng = np.random.default_rng(seed)
+    data = {"Name": [f"Broker {i}" for i in range(rows)]}
+    for column, categories, max_response in LLM_QUESTIONS.values():
+        pool = np.array([
+            "[" + ", ".join(map(str, rng.integers(0, max_response + 1, len(categories)))) + "]"
+            for _ in range(2_000)
+        ] + ["", None], dtype=object)
+        data[column] = pool[rng.integers(0, len(pool), rows)]
+    return pd.DataFrame(data)
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def compare(label, llm_data):
+    old_time, old_records = time_call(previous_prepare_summary, llm_data)
+    new_time, new_summary = time_call(prepare_privacy_policy_summary, llm_data)
+    columnar_time, _ = time_call(lambda data: prepare_privacy_policy_summary(data, records=False), llm_data)
+    assert old_records == new_summary["summary"]
+
+    print(f"{label} ({len(llm_data):,} policies)")
+    print(f"  records:  {old_time:8.3f}s -> {new_time:8.3f}s ({old_time / new_time:.1f}x)")
+    print(f"  columnar: {old_time:8.3f}s -> {columnar_time:8.3f}s ({old_time / columnar_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Synthetic policies to summarize')
+    args = parser.parse_args()
+
+    scraped = pd.read_csv(project_root / 'data/raw_data/privacy_policies/privacy-policy-scraping-final.csv')
+    compare('privacy-policy-scraping-final.csv', scraped)
+    compare('Synthetic responses', synthetic_responses(args.rows))
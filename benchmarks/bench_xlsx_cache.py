@@ -0,0 +1,67 @@
+"""
+Workbook Cache Benchmark
+========================
+
+Compares reading the full registry workbook with pd.read_excel against
+columnar_cache.read_excel_cached, cold (empty cache: the sheet is parsed and
+the Parquet copy written) and warm (the copy is read). Every read runs in a
+fresh interpreter so in-process memoization does not count, and the cache
+lives in a temporary directory.
+
+Usage:
+    python benchmarks/bench_xlsx_cache.py
+    python benchmarks/bench_xlsx_cache.py --input data.xlsx --repeat 5
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from data_utils.paths import RAW_REGISTRY  # noqa: E402
+
+_PROBE = """
+import json, time
+import pandas as pd
+from data_utils.columnar_cache import read_excel_cached
+start = time.perf_counter()
+data = {call}
+print(json.dumps({{"seconds": time.perf_counter() - start, "rows": len(data)}}))
+"""
+
+CASES = {
+    "read_excel": "pd.read_excel({path!r})",
+    "cached_cold": "read_excel_cached({path!r}, cache_dir={cache_dir!r})",
+    "cached_warm": "read_excel_cached({path!r}, cache_dir={cache_dir!r})"
+}
+
+
+def run_case(call):
+    result = subprocess.run([sys.executable, "-c", _PROBE.format(call=call)], cwd=project_root,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', type=Path, default=RAW_REGISTRY, help='Workbook to read')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case (the fastest counts)')
+    args = parser.parse_args()
+
+    timings = {name: [] for name in CASES}
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # Cases run in order, so the warm read finds the copy the cold one wrote
+            for name, template in CASES.items():
+                run = run_case(template.format(path=str(args.input), cache_dir=cache_dir))
+                timings[name].append(run["seconds"])
+
+    baseline = min(timings["read_excel"])
+    for name, seconds in timings.items():
+        best = min(seconds)
+        print(f"{name:12s} {best * 1000:9.1f} ms  ({baseline / best:5.1f}x read_excel)")
@@ -0,0 +1,57 @@
+"""
+Parallel Merge Check
+====================
+
+Checks that merge_by_normalized_name(..., workers=N) returns exactly the
+serial groupby result, values and dtypes, for the cleaned registry and for
+the merged broker CSV, both as pd.read_csv returns them and compacted by
+schema.apply_schema (Int8, category and Arrow boolean columns). Exits with
+status 1 if a check fails.
+
+Usage:
+    python benchmarks/check_parallel_merge.py
+    python benchmarks/check_parallel_merge.py --workers 4
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from data_utils.data_cleaner import initial_clean_and_one_hot, merge_by_normalized_name, read_registry  # noqa: E402
+from data_utils.paths import BROKERS_CSV, RAW_REGISTRY  # noqa: E402
+from data_utils.schema import apply_schema  # noqa: E402
+
+
+def compare(label, data, workers):
+    """Merge `data` serially and in parallel and report whether they match. Returns True if they do."""
+    serial = merge_by_normalized_name(data.copy())
+    try:
+        parallel = merge_by_normalized_name(data.copy(), workers=workers)
+        pd.testing.assert_frame_equal(serial, parallel)
+    except Exception as e:
+        print(f"FAIL {label:28s} {type(e).__name__}: {str(e).splitlines()[0]}")
+        return False
+    print(f"ok   {label:28s} {len(serial)} brokers, {serial.dtypes.nunique()} distinct dtypes")
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes of the parallel merge')
+    args = parser.parse_args()
+
+    registry = initial_clean_and_one_hot(read_registry(RAW_REGISTRY))
+    brokers = pd.read_csv(BROKERS_CSV)
+    cases = {
+        "cleaned registry": registry,
+        "cleaned registry, schema": apply_schema(registry),
+        "broker CSV": brokers,
+        "broker CSV, schema": apply_schema(brokers, compact_text=False)
+    }
+    failures = sum(not compare(label, data, args.workers) for label, data in cases.items())
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,112 @@
+"""
+Policy Chart Aggregation Check
+==============================
+
+Checks that create_policy_analysis_chart(aggregate=True), which embeds only
+per-category response counts, renders the same chart as the row-level spec
+(aggregate=False) that embeds every row and counts in Vega. Each of the
+project's stacked bar figures is built both ways, rendered to SVG with
+vl-convert and compared byte for byte, and the same is done for a synthetic
+set of LLM responses. The disparity figures are checked the same way for
+create_dumbbell_chart(aggregate=True), which embeds one mean per category
+and source. Also prints the size of both specs. Exits with status 1 if a
+check fails.
+
+The repository has no test suite, so this is a standalone check script run
+by hand rather than a pytest test.
+
+Usage:
+    python benchmarks/check_policy_chart.py
+    python benchmarks/check_policy_chart.py --rows 50000
+"""
+
+import argparse
+import functools
+import re
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import altair as alt  # noqa: E402
+import vl_convert  # noqa: E402
+
+from data_utils import figures, privacy_policy_analyzer  # noqa: E402
+from data_utils.privacy_policy_analyzer import (  # noqa: E402
+    LLM_QUESTIONS, analyze_data_use_practices, create_policy_analysis_chart, decode_llm_responses
+)
+from synthetic import synthetic_llm_responses  # noqa: E402
+
+# Figures drawn with create_policy_analysis_chart
+FIGURE_NAMES = ["policy-data-use", "policy-entity-sharing", "policy-user-rights", "registry-data-types"]
+# Figures drawn with gap_analysis_chart.create_dumbbell_chart
+DUMBBELL_FIGURE_NAMES = ["disparity-data-types", "disparity-use-cases", "disparity-entities"]
+
+
+def _reset_altair_names():
+    # Altair numbers the params of .interactive() charts when they are built
+    # and their views when they are serialized; restarting both counters
+    # gives two builds of a figure the same names
+    alt.Chart._counter = alt.Parameter._counter = 0
+
+
+def build_figure(name, aggregate, module=privacy_policy_analyzer, function="create_policy_analysis_chart"):
+    """Build a registered figure with `module.function` forced to aggregate=aggregate."""
+    original = getattr(module, function)
+
+    @functools.wraps(original)
+    def patched(*args, **kwargs):
+        return original(*args, **{**kwargs, "aggregate": aggregate})
+
+    setattr(module, function, patched)
+    _reset_altair_names()
+    try:
+        return figures.FIGURES[name]["build"]()
+    finally:
+        setattr(module, function, original)
+
+
+def _render(spec):
+    # vl-convert numbers clip paths across renders, so a chart with clipped
+    # marks gets new ids each time it is rendered
+    return re.sub(r"clip\d+", "clip", vl_convert.vegalite_to_svg(spec))
+
+
+def compare(label, aggregated, row_level):
+    """Render both charts and report whether the SVGs match. Returns True if they do."""
+    specs = []
+    for chart in (aggregated, row_level):
+        _reset_altair_names()
+        specs.append(chart.to_json())
+    aggregated_json, row_level_json = specs
+    same = _render(aggregated_json) == _render(row_level_json)
+    print(f"{'ok  ' if same else 'FAIL'} {label:24s} spec {len(aggregated_json) / 1024:8.1f} KB aggregated, "
+          f"{len(row_level_json) / 1024:8.1f} KB row-level")
+    return same
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20_000, help='Synthetic LLM responses to chart')
+    args = parser.parse_args()
+    # The row-level specs embed more rows than Altair allows by default
+    alt.data_transformers.disable_max_rows()
+
+    failures = 0
+    for name in FIGURE_NAMES:
+        failures += not compare(name, build_figure(name, True), build_figure(name, False))
+    gap = figures._gap_module()
+    for name in DUMBBELL_FIGURE_NAMES:
+        failures += not compare(name, build_figure(name, True, gap, "create_dumbbell_chart"),
+                                build_figure(name, False, gap, "create_dumbbell_chart"))
+
+    llm_data = synthetic_llm_responses(args.rows)
+    data_use = analyze_data_use_practices(llm_data, decode_llm_responses(llm_data))[0]
+    options = dict(category_columns=LLM_QUESTIONS["Q1"][1], title='Synthetic data use', xlabel='Data Use Category',
+                   legend_labels=['0 = Explicitly Not Allowed', '1 = Explicitly Allowed', '2 = Not Mentioned'])
+    failures += not compare(f"synthetic ({args.rows} rows)",
+                            create_policy_analysis_chart(data_use, aggregate=True, **options),
+                            create_policy_analysis_chart(data_use, aggregate=False, **options))
+
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,78 @@
+"""
+Registry Source Merge Check
+===========================
+
+Regression check for clean_data(sources=...): merging the other registries
+must not change any answer the full registry reports. For every broker in
+the default output, each reported (0/1) Collects* value and each
+RegistrySource_* flag that is set must be unchanged once the sources are
+merged in. Also checks that the streaming path gives the same answers.
+Exits with status 1 if a check fails.
+
+Usage:
+    python benchmarks/check_registry_sources.py
+    python benchmarks/check_registry_sources.py --sources ydr
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from data_utils.data_cleaner import clean_data  # noqa: E402
+from data_utils.paths import RAW_REGISTRY  # noqa: E402
+from data_utils.registry_sources import SOURCES  # noqa: E402
+
+
+def changed_answers(base, merged):
+    """
+    Reported answers and registry flags of `base` that differ in `merged`.
+
+    Returns:
+        list: (broker name, column, base value, merged value)
+    """
+    merged = merged.set_index('Name')
+    changes = []
+    for name, row in base.set_index('Name').iterrows():
+        if name not in merged.index:
+            changes.append((name, 'Name', name, None))
+            continue
+        for col, value in row.items():
+            reported = (col.startswith('Collects') and value in (0, 1)) or \
+                       (col.startswith('RegistrySource_') and value is True)
+            if reported and merged.at[name, col] != value:
+                changes.append((name, col, value, merged.at[name, col]))
+    return changes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sources', nargs='+', default=list(SOURCES), help='Registries to merge in')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        output_dir = Path(output_dir)
+        base = clean_data(RAW_REGISTRY, output_path=output_dir / 'base.csv')
+        merged = clean_data(RAW_REGISTRY, output_path=output_dir / 'merged.csv', sources=args.sources)
+        streamed = clean_data(RAW_REGISTRY, output_path=output_dir / 'streamed.csv', sources=args.sources,
+                              chunksize=1000)
+
+    failures = 0
+    changes = changed_answers(base, merged)
+    print(f"{'ok  ' if not changes else 'FAIL'} {len(changes)} reported answers changed by merging {', '.join(args.sources)}")
+    for change in changes[:20]:
+        print("     ", *change)
+    failures += bool(changes)
+
+    collects_cols = [col for col in merged.columns if col.startswith('Collects')]
+    one_hot_cols = [col for col in merged.columns if col.startswith('RegistrySource_')]
+    streamed = streamed.set_index('Name').reindex(merged['Name'])
+    differs = (streamed[collects_cols + one_hot_cols].to_numpy() != merged[collects_cols + one_hot_cols].to_numpy())
+    print(f"{'ok  ' if not differs.any() else 'FAIL'} streaming and in-memory answers agree "
+          f"({len(merged)} brokers, {len(merged) - len(base)} only in the added registries)")
+    failures += bool(differs.any())
+
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,243 @@
+"""
+data_utils Benchmark Suite
+==========================
+
+Times and memory-profiles the data_utils hot paths on synthetic inputs
+(see synthetic.py) at several sizes and writes the results to JSON, so runs
+from different commits can be compared.
+
+Inputs are generated once per size in a temporary directory. Each
+(benchmark, size) case then runs in a fresh interpreter, so its peak RSS is
+not inflated by earlier cases; input loading is excluded from the timings.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 1000000
+    python benchmarks/run_benchmarks.py --benchmarks clean_data merge_by_normalized_name --sizes 10000000
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "notebooks"))
+
+from synthetic import synthetic_llm_responses, synthetic_registry, synthetic_survey
+
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_DIR = project_root / "benchmarks" / "results"
+
+
+def _rss_mb():
+    """Current resident set size in MB (Linux), or None."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return None
+
+
+def _reset_peak_rss():
+    """Reset the kernel's peak RSS counter (Linux >= 4.0); returns success."""
+    try:
+        with open("/proc/self/clear_refs", "w") as handle:
+            handle.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb(reset):
+    if reset:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+# Benchmarks: each returns a zero-argument callable; loading inputs and
+# importing modules happen before the timer starts
+# ========================================================================
+
+def _bench_clean_data(inputs):
+    from data_utils.data_cleaner import clean_data
+    return lambda: clean_data(inputs["registry_csv"], output_path=inputs["workdir"] / "uq-data-brokers.csv")
+
+
+def _bench_merge(inputs):
+    from data_utils.data_cleaner import merge_by_normalized_name
+    cleaned = pd.read_pickle(inputs["cleaned_pkl"])
+    return lambda: merge_by_normalized_name(cleaned)
+
+
+def _bench_parse_llm_responses(inputs):
+    from data_utils.privacy_policy_analyzer import LLM_QUESTIONS, parse_llm_responses
+    llm_data = pd.read_pickle(inputs["llm_pkl"])
+    return lambda: [
+        parse_llm_responses(llm_data, column, categories) for column, categories, _ in LLM_QUESTIONS.values()
+    ]
+
+
+def _bench_decode_llm_responses(inputs):
+    from data_utils.privacy_policy_analyzer import decode_llm_responses
+    llm_data = pd.read_pickle(inputs["llm_pkl"])
+    return lambda: decode_llm_responses(llm_data)
+
+
+def _bench_summary(inputs):
+    from data_utils.privacy_policy_analyzer import prepare_privacy_policy_summary
+    llm_data = pd.read_pickle(inputs["llm_pkl"])
+    return lambda: prepare_privacy_policy_summary(llm_data)
+
+
+def _bench_gap_data_types(inputs):
+    from data_utils.survey import decode_survey
+    from gap_analysis_chart import create_gap_chart_data_types
+    brokers, survey = pd.read_pickle(inputs["merged_pkl"]), pd.read_pickle(inputs["survey_pkl"])
+    return lambda: create_gap_chart_data_types(brokers, decode_survey(survey))
+
+
+def _bench_gap_use_cases(inputs):
+    from data_utils import columnar_cache
+    from data_utils.privacy_policy_analyzer import explicit_permission_rates
+    from data_utils.survey import decode_survey
+    from gap_analysis_chart import create_gap_chart_use_cases
+    survey = pd.read_pickle(inputs["survey_pkl"])
+    # Keep the columnar cache of the synthetic CSV out of data/.cache
+    columnar_cache.DEFAULT_CACHE_DIR = inputs["workdir"] / "cache"
+    return lambda: create_gap_chart_use_cases(decode_survey(survey), explicit_permission_rates(inputs["llm_csv"]))
+
+
+BENCHMARKS = {
+    "clean_data": _bench_clean_data,
+    "merge_by_normalized_name": _bench_merge,
+    "parse_llm_responses": _bench_parse_llm_responses,
+    "decode_llm_responses": _bench_decode_llm_responses,
+    "prepare_privacy_policy_summary": _bench_summary,
+    "gap_chart_data_types": _bench_gap_data_types,
+    "gap_chart_use_cases": _bench_gap_use_cases
+}
+
+
+def _run_case(name, inputs, queue):
+    """Worker process body: set up, reset the peak RSS, time one benchmark."""
+    import contextlib
+    import io
+
+    run = BENCHMARKS[name](inputs)
+    reset = _reset_peak_rss()
+    rss_before = _rss_mb()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        run()
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    queue.put({
+        "seconds": wall,
+        "cpu_seconds": cpu,
+        "rss_before_mb": rss_before,
+        "peak_rss_mb": _peak_rss_mb(reset),
+        "peak_is_process_lifetime": not reset
+    })
+
+
+def prepare_inputs(rows, workdir):
+    """
+    Generate and store every synthetic input for one size.
+    """
+    from data_utils.data_cleaner import initial_clean_and_one_hot, merge_by_normalized_name
+
+    workdir.mkdir(parents=True, exist_ok=True)
+    registry = synthetic_registry(rows)
+    registry.to_csv(workdir / "registry.csv", index=False)
+    cleaned = initial_clean_and_one_hot(registry)
+    cleaned.to_pickle(workdir / "cleaned.pkl")
+    merge_by_normalized_name(cleaned.copy()).to_pickle(workdir / "merged.pkl")
+    llm_data = synthetic_llm_responses(rows)
+    llm_data.to_pickle(workdir / "llm.pkl")
+    llm_data.to_csv(workdir / "llm.csv", index=False)
+    synthetic_survey(rows).to_pickle(workdir / "survey.pkl")
+    return {
+        "workdir": workdir,
+        "registry_csv": workdir / "registry.csv",
+        "cleaned_pkl": workdir / "cleaned.pkl",
+        "merged_pkl": workdir / "merged.pkl",
+        "llm_pkl": workdir / "llm.pkl",
+        "llm_csv": workdir / "llm.csv",
+        "survey_pkl": workdir / "survey.pkl"
+    }
+
+
+def run_benchmarks(names, sizes, repeat=1):
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            start = time.perf_counter()
+            inputs = prepare_inputs(rows, Path(tmp) / str(rows))
+            print(f"{rows:>12,} rows: inputs generated in {time.perf_counter() - start:.1f}s")
+            for name in names:
+                for attempt in range(repeat):
+                    queue = context.Queue()
+                    process = context.Process(target=_run_case, args=(name, inputs, queue))
+                    process.start()
+                    process.join()
+                    if process.exitcode != 0:
+                        measurement = {"error": f"exit code {process.exitcode}"}
+                    else:
+                        measurement = queue.get()
+                    results.append({"benchmark": name, "rows": rows, "repeat": attempt, **measurement})
+                    seconds = measurement.get("seconds")
+                    peak = measurement.get("peak_rss_mb")
+                    print(f"{'':>12}  {name:32s} " + (
+                        f"{seconds:9.3f}s  peak RSS {peak:8.1f} MB" if seconds is not None else measurement["error"]
+                    ))
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=project_root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Rows per synthetic input')
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per benchmark and size')
+    parser.add_argument('--output', type=Path, default=None,
+                        help='Results file (default: benchmarks/results/<timestamp>-<commit>.json)')
+    args = parser.parse_args()
+
+    commit = _git_commit()
+    started = datetime.now(timezone.utc)
+    results = run_benchmarks(args.benchmarks, args.sizes, args.repeat)
+
+    output = args.output or RESULTS_DIR / f"{started:%Y%m%dT%H%M%SZ}-{(commit or 'unknown')[:10]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "started_at": started.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "results": results
+    }, indent=2))
+    print(f"Results saved to {output}")
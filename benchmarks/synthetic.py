@@ -0,0 +1,168 @@
+"""
+Synthetic Data Generators
+=========================
+
+Registries, LLM responses and survey answers shaped like the project's real
+inputs, for benchmarking at sizes the real data does not reach.
+
+- `synthetic_registry` mimics the raw registry read by `clean_data`: the same
+  34 columns, ~3.4 rows per broker (spread over the five registry sources and
+  spelled with suffix/punctuation variants that collide after name
+  normalization), ~28% of rows without any Collects* data, a few exact
+  duplicate rows, and Collects* values drawn from the real per-column
+  frequencies.
+- `synthetic_llm_responses` mimics `privacy-policy-scraping-final.csv`.
+- `synthetic_survey` resamples the real survey responses.
+
+All generators are deterministic for a given seed.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+REGISTRY_SOURCES = {
+    "Oregon": 0.318,
+    "Vermont": 0.294,
+    "California (Attorney General)": 0.165,
+    "California (California Privacy Protection Agency)": 0.148,
+    "Texas": 0.075
+}
+
+# P(0), P(1), P(2) of each Collects* column among rows reporting any (real registry)
+COLLECTS_FREQUENCIES = {
+    "CollectsNames": (0.023, 0.186, 0.791),
+    "CollectsAddresses": (0.037, 0.171, 0.792),
+    "CollectsDOB": (0.073, 0.074, 0.853),
+    "CollectsPOB": (0.119, 0.015, 0.866),
+    "CollectsMMN": (0.126, 0.008, 0.866),
+    "CollectsBiometricData": (0.139, 0.006, 0.855),
+    "CollectsSSNGovID": (0.131, 0.017, 0.852),
+    "CollectsOtherInfo": (0.019, 0.147, 0.834),
+    "CollectsMinorsData": (0.648, 0.081, 0.271),
+    "CollectsReproductiveHealthData": (0.226, 0.005, 0.769),
+    "CollectsEmploymentData": (0.005, 0.049, 0.946),
+    "CollectsNetworkData": (0.004, 0.045, 0.951),
+    "CollectsCommercialData": (0.003, 0.078, 0.919)
+}
+
+ROWS_PER_BROKER = 3.4
+UNREPORTED_SHARE = 0.284
+DUPLICATE_SHARE = 0.03
+
+_NAME_SUFFIXES = np.array([" Inc.", ", LLC", " Corporation", " INC", "", " llc", "  Inc"], dtype=object)
+_WORDS = np.array([
+    "Data", "Info", "People", "Search", "Analytics", "Media", "Marketing", "Digital", "Consumer",
+    "Insights", "Solutions", "Group", "Network", "Labs", "Intelligence", "Partners", "Global", "Direct"
+], dtype=object)
+
+
+def _broker_names(brokers, rng):
+    first = _WORDS[rng.integers(0, len(_WORDS), brokers)]
+    second = _WORDS[rng.integers(0, len(_WORDS), brokers)]
+    return first + " " + second + " " + np.arange(brokers).astype(str)
+
+
+def synthetic_registry(rows, seed=0):
+    """
+    Generate a raw registry with `rows` rows.
+
+    Args:
+        rows (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: Registry with the columns of Data_Broker_Full_Registry_2025.xlsx
+    """
+    rng = np.random.default_rng(seed)
+    brokers = max(1, int(rows / ROWS_PER_BROKER))
+    unique_rows = rows - int(rows * DUPLICATE_SHARE)
+
+    broker = rng.integers(0, brokers, unique_rows)
+    base_names = _broker_names(brokers, rng)
+    names = base_names[broker] + _NAME_SUFFIXES[rng.integers(0, len(_NAME_SUFFIXES), unique_rows)]
+    slugs = np.char.lower(np.char.replace(base_names.astype(str), " ", ""))
+    domains = np.char.add(slugs, ".com").astype(object)
+    zips = rng.integers(10000, 99999, brokers)
+
+    data = pd.DataFrame({
+        "GroupUUID_Combined": np.char.add(slugs, "_0").astype(object)[broker],
+        "Name": names,
+        "RegistrySource": rng.choice(list(REGISTRY_SOURCES), unique_rows, p=list(REGISTRY_SOURCES.values())),
+        "WebsiteURL": ("https://www." + domains + "/")[broker],
+        "PrivacyPolicyURL": ("https://www." + domains + "/privacy")[broker],
+        "OptOutURL": ("https://www." + domains + "/opt-out")[broker],
+        "AlternateOptOutURLs": None,
+        "AdditionalWebsiteURL": ('["https://www.' + domains + '/"]')[broker],
+        "Email": ("privacy@" + domains)[broker],
+        "Phone": np.where(rng.random(unique_rows) < 0.2, rng.integers(2_000_000_000, 9_999_999_999, unique_rows), np.nan),
+        "ContactPerson": None,
+        "ContactPersonTitle": None,
+        "AlternateContactPersons": None,
+        "Address": (rng.integers(1, 9999, brokers).astype(str).astype(object) + " Main St")[broker],
+        "AddressLine4": None,
+        "City": "Springfield",
+        "County": None,
+        "State": rng.choice(["CA", "OR", "VT", "TX", "NY"], brokers)[broker],
+        # Mixed int/str like the real ZipCode column
+        "ZipCode": np.where(rng.random(brokers) < 0.8, zips.astype(object), zips.astype(str).astype(object) + "-0000")[broker],
+        "Country": "United States",
+        "DataCategories": '["Not Minors Data"]'
+    })
+
+    reported = rng.random(unique_rows) >= UNREPORTED_SHARE
+    for column, frequencies in COLLECTS_FREQUENCIES.items():
+        values = rng.choice(np.array([0.0, 1.0, 2.0]), unique_rows, p=frequencies)
+        data[column] = np.where(reported, values, np.nan)
+
+    duplicates = data.iloc[rng.integers(0, unique_rows, rows - unique_rows)]
+    return pd.concat([data, duplicates], ignore_index=True)
+
+
+def synthetic_llm_responses(rows, seed=42, missing_share=0.001):
+    """
+    Generate LLM analysis results for `rows` policies.
+
+    Args:
+        rows (int): Number of policies
+        seed (int): Random seed
+        missing_share (float): Share of missing responses per question
+
+    Returns:
+        pd.DataFrame: Name, PrivacyPolicyURL and the LLM Q1-Q3 columns
+    """
+    from data_utils.privacy_policy_analyzer import LLM_QUESTIONS
+
+    rng = np.random.default_rng(seed)
+    data = {
+        "Name": [f"broker{i}" for i in range(rows)],
+        "PrivacyPolicyURL": [f"https://www.broker{i}.com/privacy" for i in range(rows)]
+    }
+    for column, categories, max_response in LLM_QUESTIONS.values():
+        pool = np.array([
+            "[" + ", ".join(map(str, rng.integers(0, max_response + 1, len(categories)))) + "]"
+            for _ in range(2_000)
+        ], dtype=object)
+        values = pool[rng.integers(0, len(pool), rows)]
+        values[rng.random(rows) < missing_share] = None
+        data[column] = values
+    return pd.DataFrame(data)
+
+
+def synthetic_survey(rows, seed=7):
+    """
+    Resample the real survey responses to `rows` respondents.
+
+    Args:
+        rows (int): Number of respondents
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: Survey with the columns of survey_results.csv
+    """
+    survey = pd.read_csv(PROJECT_ROOT / "data/raw_data/survey/survey_results.csv")
+    return survey.sample(n=rows, replace=True, random_state=seed).reset_index(drop=True)
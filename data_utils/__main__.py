@@ -0,0 +1,156 @@
+"""
+data_utils Command Line
+=======================
+
+Runs the individual processing steps as short batch jobs. Paths default to
+the project's data files (see paths.py), independent of the working
+directory. Each command imports only the modules it needs, so `--help` and
+the table-only commands start without loading altair.
+
+Usage:
+    python -m data_utils clean [--chunksize N] [--workers N] [--sources california ydr]
+    python -m data_utils prep-policies
+    python -m data_utils sample-policies --budget N [--calls-per-policy K] [--estimate]
+    python -m data_utils analyze
+    python -m data_utils report [--output report.txt]
+    python -m data_utils charts [figure ...] [--force]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from . import paths
+
+
+def _clean(args):
+    from .data_cleaner import clean_data
+    result = clean_data(args.input, chunksize=args.chunksize, resolve_entities=args.resolve_entities,
+                        output_path=args.output, workers=args.workers, sources=args.sources)
+    return 0 if len(result) else 1
+
+
+def _prep_policies(args):
+    from .privacy_policy_extractor import prepare_privacy_policy_dataset
+    prepare_privacy_policy_dataset(args.input, args.output_dir)
+    return 0
+
+
+def _sample_policies(args):
+    import pandas as pd
+    from .policy_sampling import estimate_answer_shares, sample_policies
+    sample = sample_policies(pd.read_csv(args.input), pd.read_csv(args.brokers), args.budget,
+                             calls_per_policy=args.calls_per_policy, min_stratum=args.min_stratum, seed=args.seed)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    sample.to_csv(args.output, index=False)
+    print(f"Sampled {len(sample)} policies from {sample['Stratum'].nunique()} strata "
+          f"(cost {sample['Cost'].sum():g} of {args.budget:g}) to {args.output}")
+    if args.estimate:
+        from .privacy_policy_analyzer import load_privacy_policy_data
+        llm_data = load_privacy_policy_data(args.estimate)
+        if llm_data is None:
+            return 1
+        estimates = estimate_answer_shares(sample, llm_data)
+        print(estimates[["question", "category", "response_label", "percentage", "std_error", "policies"]]
+              .to_string(index=False, float_format="%.1f"))
+    return 0
+
+
+def _analyze(args):
+    from .privacy_policy_analyzer import load_privacy_policy_data, prepare_privacy_policy_summary
+    llm_data = load_privacy_policy_data(args.input)
+    if llm_data is None:
+        return 1
+    summary = prepare_privacy_policy_summary(llm_data, records=False)["summary_table"]
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    summary.to_csv(args.output, index=False)
+    print(f"Summary of {len(llm_data)} policies saved to {args.output}")
+    return 0
+
+
+def _report(args):
+    from .privacy_policy_analyzer import (
+        analyze_data_use_practices, analyze_sharing_entities, analyze_user_controls,
+        decode_llm_responses, generate_analysis_report, load_privacy_policy_data
+    )
+    llm_data = load_privacy_policy_data(args.input)
+    if llm_data is None:
+        return 1
+    decoded = decode_llm_responses(llm_data)
+    report = generate_analysis_report(
+        analyze_data_use_practices(llm_data, decoded)[1],
+        analyze_sharing_entities(llm_data, decoded)[1],
+        analyze_user_controls(llm_data, decoded)[1]
+    )
+    if args.output:
+        args.output.write_text(report + "\n")
+        print(f"Report saved to {args.output}")
+    else:
+        print(report)
+    return 0
+
+
+def _charts(args):
+    from .figures import main as figures_main
+    figures_main(args.figures + (["--force"] if args.force else []) + (["--list"] if args.list else []) +
+                 (["--jobs", str(args.jobs)] if args.jobs else []))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m data_utils", description="Data broker analysis steps.")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    clean = commands.add_parser("clean", help="Clean and merge the raw registry")
+    clean.add_argument("--input", type=Path, default=paths.RAW_REGISTRY, help="Registry file (XLSX or CSV)")
+    clean.add_argument("--output", type=Path, default=paths.BROKERS_CSV, help="Merged registry CSV")
+    clean.add_argument("--chunksize", type=int, default=None, help="Stream the registry in chunks of N rows")
+    clean.add_argument("--workers", type=int, default=None, help="Merge with N processes")
+    clean.add_argument("--sources", nargs="+", default=None, metavar="SOURCE",
+                       help="Also merge these registries (california, ydr)")
+    clean.add_argument("--resolve-entities", action="store_true", help="Also merge near-duplicate names")
+    clean.set_defaults(handler=_clean)
+
+    prep = commands.add_parser("prep-policies", help="Extract the privacy policy URLs to analyze")
+    prep.add_argument("--input", type=Path, default=paths.BROKERS_CSV, help="Merged registry CSV")
+    prep.add_argument("--output-dir", type=Path, default=paths.POLICY_DIR, help="Output directory")
+    prep.set_defaults(handler=_prep_policies)
+
+    sample = commands.add_parser("sample-policies", help="Draw a stratified sample of policies within an LLM budget")
+    sample.add_argument("--budget", type=float, required=True, help="LLM calls to spend")
+    sample.add_argument("--calls-per-policy", type=int, default=1, help="LLM calls per policy")
+    sample.add_argument("--min-stratum", type=int, default=10, help="Pool strata with fewer policies")
+    sample.add_argument("--seed", type=int, default=42, help="Sampling seed")
+    sample.add_argument("--input", type=Path, default=paths.UNIQUE_POLICIES_CSV, help="Unique policies CSV")
+    sample.add_argument("--brokers", type=Path, default=paths.BROKERS_CSV, help="Merged registry CSV")
+    sample.add_argument("--output", type=Path, default=paths.POLICY_SAMPLE_CSV, help="Sample CSV")
+    sample.add_argument("--estimate", type=Path, nargs="?", const=paths.LLM_RESULTS_CSV, default=None,
+                        help="Also estimate the answer percentages from these LLM results")
+    sample.set_defaults(handler=_sample_policies)
+
+    analyze = commands.add_parser("analyze", help="Summarize the LLM policy answers into a table")
+    analyze.add_argument("--input", type=Path, default=paths.LLM_RESULTS_CSV, help="LLM analysis CSV")
+    analyze.add_argument("--output", type=Path, default=paths.POLICY_SUMMARY_CSV, help="Summary CSV")
+    analyze.set_defaults(handler=_analyze)
+
+    report = commands.add_parser("report", help="Print the text report of the LLM policy answers")
+    report.add_argument("--input", type=Path, default=paths.LLM_RESULTS_CSV, help="LLM analysis CSV")
+    report.add_argument("--output", type=Path, default=None, help="Write the report to a file")
+    report.set_defaults(handler=_report)
+
+    charts = commands.add_parser("charts", help="Render the figures whose data or spec changed")
+    charts.add_argument("figures", nargs="*", help="Figures to build (default: all)")
+    charts.add_argument("--force", action="store_true", help="Render even if unchanged")
+    charts.add_argument("--jobs", type=int, default=None, help="Render processes (default: CPU count)")
+    charts.add_argument("--list", action="store_true", help="List registered figures and exit")
+    charts.set_defaults(handler=_charts)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
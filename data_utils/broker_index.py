@@ -0,0 +1,268 @@
+"""
+Broker Feature Index
+====================
+
+A bit-packed broker x attribute index for ad-hoc questions about the merged
+registry: how many brokers collect a data type, which attributes co-occur,
+how the Collects* answers correlate, and which brokers match a filter such
+as "registered in Texas and Vermont and collecting biometric data".
+
+Each attribute is one bitset over the brokers (64 brokers per word):
+- `<Collects column>=<value>` for every value of the Collects* columns
+  (0 = no, 1 = yes, 2 = not reported),
+- the RegistrySource_* columns,
+- `<question>:<category>=<value>` for the LLM policy answers (Q1-Q3) of
+  brokers whose policy was analyzed, matched on the compacted broker name.
+
+Queries AND/OR the bitsets and count them with a popcount, so they touch a
+few hundred bytes instead of scanning the DataFrame.
+
+Usage:
+    index = load_broker_index()
+    index.count("RegistrySource_Texas", "RegistrySource_Vermont", "CollectsBiometricData=1")
+    index.brokers("CollectsMinorsData=1", none_of=["Q3:delete=1"])
+    index.correlation()
+"""
+
+import numpy as np
+import pandas as pd
+
+from .columnar_cache import file_hash, read_csv_cached
+from .normalization import compact_lowercase_values
+from .paths import BROKERS_CSV, LLM_RESULTS_CSV
+
+
+DEFAULT_BROKERS_PATH = BROKERS_CSV
+DEFAULT_LLM_RESULTS_PATH = LLM_RESULTS_CSV
+
+# Constants of the SWAR popcount
+_M1, _M2, _M4, _H01 = (np.uint64(value) for value in (
+    0x5555555555555555, 0x3333333333333333, 0x0F0F0F0F0F0F0F0F, 0x0101010101010101
+))
+_index_memo = {}
+
+
+def _popcount(words):
+    """Number of set bits in uint64 words, summed over the last axis."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    words = words - ((words >> np.uint64(1)) & _M1)
+    words = (words & _M2) + ((words >> np.uint64(2)) & _M2)
+    words = (words + (words >> np.uint64(4))) & _M4
+    return ((words * _H01) >> np.uint64(56)).sum(axis=-1, dtype=np.int64)
+
+
+def _pack(matrix):
+    """Pack a (features, brokers) bool matrix into (features, words) uint64."""
+    n_features, n_brokers = matrix.shape
+    n_bytes = -(-n_brokers // 64) * 8
+    packed = np.zeros((n_features, n_bytes), dtype=np.uint8)
+    packed[:, :-(-n_brokers // 8) or None] = np.packbits(matrix, axis=1, bitorder="little")
+    return packed.view(np.uint64)
+
+
+class BrokerIndex:
+    """
+    Bit-packed broker x attribute index (see the module docstring).
+
+    Args:
+        names (array-like): Broker names, one per broker
+        features (dict): Attribute name -> bool array over the brokers
+    """
+
+    def __init__(self, names, features):
+        self.names = np.asarray(names, dtype=object)
+        self.features = list(features)
+        self._positions = {name: position for position, name in enumerate(self.features)}
+        matrix = np.array([np.asarray(features[name], dtype=bool) for name in self.features]).reshape(
+            len(self.features), len(self.names)
+        )
+        self._bits = _pack(matrix)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"BrokerIndex({len(self)} brokers, {len(self.features)} attributes)"
+
+    @classmethod
+    def from_frame(cls, brokers, llm_data=None):
+        """
+        Build the index from the merged registry and optional LLM answers.
+
+        Args:
+            brokers (pd.DataFrame): Merged registry (uq-data-brokers.csv)
+            llm_data (pd.DataFrame, optional): LLM analysis results with Name
+                and the LLM Q1-Q3 columns
+
+        Returns:
+            BrokerIndex: Index over the rows of `brokers`
+        """
+        features = {}
+        for column in [col for col in brokers.columns if col.startswith("Collects")]:
+            values = pd.to_numeric(brokers[column], errors="coerce")
+            for value in np.sort(values.dropna().unique()):
+                features[f"{column}={value:g}"] = (values == value).to_numpy()
+        for column in [col for col in brokers.columns if col.startswith("RegistrySource_")]:
+            features[column] = brokers[column].fillna(False).astype(bool).to_numpy()
+
+        if llm_data is not None:
+            from .privacy_policy_analyzer import LLM_QUESTIONS, decode_llm_responses
+
+            decoded = decode_llm_responses(llm_data)
+            policy_rows = pd.Series(np.arange(len(llm_data)), index=compact_lowercase_values(llm_data["Name"]))
+            policy_rows = policy_rows[~policy_rows.index.duplicated()]
+            rows = policy_rows.reindex(compact_lowercase_values(brokers["Name"])).to_numpy()
+            matched = ~np.isnan(rows)
+            rows = np.where(matched, rows, 0).astype(np.int64)
+            for question in decoded["questions"]:
+                _, categories, max_response = LLM_QUESTIONS[question]
+                codes = decoded["matrix"][rows, decoded["slices"][question]]
+                for position, category in enumerate(categories):
+                    for value in range(max_response + 1):
+                        features[f"{question}:{category}={value}"] = matched & (codes[:, position] == value)
+
+        return cls(brokers["Name"].to_numpy(), features)
+
+    def _rows(self, names):
+        missing = [name for name in names if name not in self._positions]
+        if missing:
+            raise KeyError(f"Unknown attributes: {', '.join(missing)}")
+        return [self._positions[name] for name in names]
+
+    def query(self, *all_of, any_of=(), none_of=()):
+        """
+        Bitset of the brokers having every attribute in `all_of`, at least one
+        in `any_of` (if given) and none in `none_of`.
+
+        Returns:
+            np.ndarray: Packed uint64 bitset
+        """
+        bits = self._bits
+        result = np.bitwise_and.reduce(bits[self._rows(all_of)], axis=0) if all_of else self._all()
+        if any_of:
+            result = result & np.bitwise_or.reduce(bits[self._rows(any_of)], axis=0)
+        if none_of:
+            result = result & ~np.bitwise_or.reduce(bits[self._rows(none_of)], axis=0)
+        return result
+
+    def _all(self):
+        result = np.full(self._bits.shape[1], np.uint64(0xFFFFFFFFFFFFFFFF), dtype=np.uint64)
+        if len(self) % 64:
+            result[-1] = np.uint64((1 << (len(self) % 64)) - 1)
+        return result
+
+    def count(self, *all_of, any_of=(), none_of=()):
+        """
+        Number of brokers matching a query (arguments as for `query`).
+
+        Returns:
+            int: Broker count
+        """
+        return int(_popcount(self.query(*all_of, any_of=any_of, none_of=none_of)))
+
+    def brokers(self, *all_of, any_of=(), none_of=()):
+        """
+        Names of the brokers matching a query (arguments as for `query`).
+
+        Returns:
+            np.ndarray: Broker names in registry order
+        """
+        bits = self.query(*all_of, any_of=any_of, none_of=none_of)
+        matches = np.unpackbits(bits.view(np.uint8), bitorder="little")[:len(self)].astype(bool)
+        return self.names[matches]
+
+    def value_counts(self, column):
+        """
+        Brokers per value of a Collects* column or LLM category.
+
+        Args:
+            column (str): e.g. "CollectsBiometricData" or "Q1:marketing"
+
+        Returns:
+            pd.Series: Count indexed by value
+        """
+        prefix = f"{column}="
+        names = [name for name in self.features if name.startswith(prefix)]
+        if not names:
+            raise KeyError(f"Unknown column: {column}")
+        counts = _popcount(self._bits[self._rows(names)])
+        return pd.Series(counts, index=[float(name[len(prefix):]) for name in names], name=column)
+
+    def cooccurrence(self, features=None):
+        """
+        Brokers having both attributes, for every pair of attributes.
+
+        Args:
+            features (list, optional): Attributes (defaults to all)
+
+        Returns:
+            pd.DataFrame: Symmetric count matrix (diagonal = attribute counts)
+        """
+        features = list(features or self.features)
+        bits = self._bits[self._rows(features)]
+        counts = _popcount(bits[:, None, :] & bits[None, :, :])
+        return pd.DataFrame(counts, index=features, columns=features)
+
+    def correlation(self, columns=None, yes=1, no=0):
+        """
+        Pearson correlation of yes/no answers, over the brokers answering
+        both (pairwise complete, like DataFrame.corr() after replacing other
+        values with NaN).
+
+        Args:
+            columns (list, optional): Collects* columns or LLM categories
+                (defaults to all Collects* columns)
+            yes (int): Value counted as 1
+            no (int): Value counted as 0
+
+        Returns:
+            pd.DataFrame: Correlation matrix
+        """
+        if columns is None:
+            columns = list(dict.fromkeys(name.split("=")[0] for name in self.features if name.startswith("Collects")))
+        yes_bits = np.stack([self._feature_or_empty(f"{column}={yes:g}") for column in columns])
+        answered = yes_bits | np.stack([self._feature_or_empty(f"{column}={no:g}") for column in columns])
+
+        # All pairwise intersections of the yes and answered bitsets in one popcount
+        stacked = np.concatenate([yes_bits, answered])
+        counts = _popcount(stacked[:, None, :] & stacked[None, :, :]).astype(np.float64)
+        k = len(columns)
+        sum_xy, sum_x, n = counts[:k, :k], counts[:k, k:], counts[k:, k:]
+        sum_y = sum_x.T
+        # For 0/1 values sum(x^2) == sum(x)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = (n * sum_xy - sum_x * sum_y) / np.sqrt((n * sum_x - sum_x ** 2) * (n * sum_y - sum_y ** 2))
+        return pd.DataFrame(corr, index=columns, columns=columns)
+
+    def _feature_or_empty(self, name):
+        if name in self._positions:
+            return self._bits[self._positions[name]]
+        return np.zeros(self._bits.shape[1], dtype=np.uint64)
+
+
+def load_broker_index(brokers_path=None, llm_results_path=None):
+    """
+    Build (or reuse) the index of the merged registry and the LLM results.
+
+    The index is memoized on the content hashes of both files, so repeated
+    calls only rebuild it after either file changed.
+
+    Args:
+        brokers_path (str, optional): Merged registry CSV
+            (defaults to data/cleaned_data/uq-data-brokers.csv)
+        llm_results_path (str, optional): LLM analysis CSV (defaults to
+            privacy-policy-scraping-final.csv); pass False to leave out the
+            policy answers
+
+    Returns:
+        BrokerIndex: The index
+    """
+    brokers_path = brokers_path or DEFAULT_BROKERS_PATH
+    if llm_results_path is None:
+        llm_results_path = DEFAULT_LLM_RESULTS_PATH
+    key = (file_hash(brokers_path), file_hash(llm_results_path) if llm_results_path else None)
+    if key not in _index_memo:
+        llm_data = read_csv_cached(llm_results_path, schema=True) if llm_results_path else None
+        _index_memo[key] = BrokerIndex.from_frame(read_csv_cached(brokers_path, schema=True), llm_data)
+    return _index_memo[key]
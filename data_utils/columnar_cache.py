@@ -0,0 +1,309 @@
+"""
+Columnar Cache Utilities
+========================
+
+Typed Parquet cache for the CSV datasets that notebooks and scripts re-read
+(e.g. `uq-data-brokers.csv` and the privacy policy CSVs). The first read
+parses the CSV once and writes a Parquet copy keyed on the source file's
+content hash; later reads are memory-mapped and only materialize the
+requested columns. By default reads return the dtypes pd.read_csv would.
+
+With `schema=True` the dtypes declared in schema.py are applied before
+caching: Collects* columns are nullable Int8, RegistrySource_* columns
+Arrow booleans, State/Country/RegistrySource/County/City categoricals and
+other integer columns are downcast. Callers opting in must not rely on
+pd.read_csv's int64/object columns (e.g. `.sum()` overflowing int8, or
+string methods on categoricals).
+
+Workbooks (the full registry XLSX) get the same treatment without the
+schema: the sheet is streamed once in read-only mode and stored as Parquet
+so that later reads return exactly what pd.read_excel would, without
+parsing the XLSX. The workbook's hash is remembered together with its size
+and modification time, so unchanged workbooks are not even re-hashed.
+
+Falls back to a plain CSV or XLSX parse when pyarrow is not installed.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .schema import apply_schema
+from .instrumentation import instrumented
+from .paths import CACHE_DIR
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+# Bump when the dtype rules change so stale cache files are not reused
+CACHE_VERSION = 2
+XLSX_CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = CACHE_DIR
+
+_hash_memo = {}
+
+
+def file_hash(file_path):
+    """
+    Compute the SHA-256 of a file, memoized on its size and modification time.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _hash_memo:
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+        _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+
+def cache_path_for(file_path, cache_dir=None, schema=False):
+    """
+    Locate the cache file for a source file's current contents.
+
+    Args:
+        file_path (str): Path to the source CSV
+        cache_dir (str, optional): Cache directory (defaults to data/.cache)
+        schema (bool): Cache with the schema dtypes (False: pd.read_csv dtypes)
+
+    Returns:
+        Path: Parquet cache file path
+    """
+    cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    key = f"{file_hash(file_path)[:16]}-v{CACHE_VERSION}" + ("" if schema else "-raw")
+    return cache_dir / f"{Path(file_path).stem}-{key}.parquet"
+
+
+@instrumented()
+def read_csv_cached(file_path, columns=None, cache_dir=None, schema=False):
+    """
+    Read a CSV through the columnar cache.
+
+    Args:
+        file_path (str): Path to the source CSV
+        columns (list, optional): Columns to read; others are never materialized
+        cache_dir (str, optional): Cache directory (defaults to data/.cache)
+        schema (bool): Apply the schema.py dtypes (see the module docstring)
+            instead of returning the dtypes pd.read_csv would
+
+    Returns:
+        pd.DataFrame: Dataset, columns in the requested order
+    """
+    prepare = (lambda data: apply_schema(data, compact_text=False)) if schema else (lambda data: data)
+    if not HAS_PYARROW:
+        data = prepare(pd.read_csv(file_path, usecols=columns))
+        return data[columns] if columns else data
+
+    cache_file = cache_path_for(file_path, cache_dir, schema)
+    if not cache_file.exists():
+        data = prepare(pd.read_csv(file_path))
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial cache
+        temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        data.to_parquet(temp_file, index=False)
+        os.replace(temp_file, cache_file)
+
+    data = pd.read_parquet(cache_file, columns=columns, memory_map=True)
+    if not schema:
+        # Parquet returns missing text as None where pd.read_csv gives NaN
+        for col in data.columns[data.dtypes == object]:
+            data[col] = data[col].mask(data[col].isna(), np.nan)
+    return data
+
+
+# --- WORKBOOK CACHE ---
+# Type tags of the values of mixed-type object columns (e.g. ZIP codes
+# stored partly as numbers and partly as text), which Parquet cannot hold
+# in one column; they are stored as text plus a "<column>::type" column.
+_TYPE_SUFFIX = "::type"
+_ENCODERS = [
+    (bool, "b", str),
+    ((int, np.integer), "i", str),
+    ((float, np.floating), "f", repr),
+    (datetime, "d", datetime.isoformat),
+    (str, "s", str)
+]
+_DECODERS = {
+    "b": lambda text: text == "True",
+    "i": int,
+    "f": float,
+    "d": datetime.fromisoformat,
+    "s": str
+}
+
+
+def iter_xlsx_rows(file_path):
+    """
+    Yield the rows of the first worksheet in read-only mode, converting
+    cells the same way pd.read_excel does and skipping trailing empty rows.
+
+    Args:
+        file_path (str): Path to the workbook
+
+    Yields:
+        list: Cell values of one row (the header row first)
+    """
+    from openpyxl import load_workbook
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+    def convert_cell(cell):
+        if cell.value is None:
+            return ""
+        if cell.data_type == TYPE_ERROR:
+            return np.nan
+        if cell.data_type == TYPE_NUMERIC:
+            val = int(cell.value)
+            return val if val == cell.value else float(cell.value)
+        return cell.value
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        sheet.reset_dimensions()
+        pending_empty = 0
+        for row in sheet.rows:
+            converted_row = [convert_cell(cell) for cell in row]
+            if all(value == "" for value in converted_row):
+                # Only emit empty rows once we know they are not trailing
+                pending_empty += 1
+                continue
+            for _ in range(pending_empty):
+                yield []
+            pending_empty = 0
+            yield converted_row
+    finally:
+        workbook.close()
+
+
+def _encode_mixed(data):
+    """Replace mixed-type object columns by text plus a type tag column."""
+    encoded = {}
+    for col in data.columns:
+        values = data[col]
+        if values.dtype != object:
+            encoded[col] = values
+            continue
+        present = values.notna().to_numpy()
+        kinds = {type(value) for value in values[present]}
+        if len(kinds) <= 1 and kinds <= {str}:
+            encoded[col] = values
+            continue
+        texts = np.full(len(values), None, dtype=object)
+        tags = np.full(len(values), None, dtype=object)
+        for position in np.flatnonzero(present):
+            value = values.iat[position]
+            for types, tag, encode in _ENCODERS:
+                if isinstance(value, types):
+                    texts[position], tags[position] = encode(value), tag
+                    break
+            else:
+                raise TypeError(f"Cannot cache {type(value).__name__} values of column {col}")
+        encoded[col] = texts
+        encoded[f"{col}{_TYPE_SUFFIX}"] = tags
+    return pd.DataFrame(encoded, index=data.index)
+
+
+def _decode_mixed(data):
+    """Undo _encode_mixed and restore NaN as the missing value of text columns."""
+    for tag_col in [col for col in data.columns if col.endswith(_TYPE_SUFFIX)]:
+        col = tag_col[:-len(_TYPE_SUFFIX)]
+        values = np.full(len(data), np.nan, dtype=object)
+        for position, (text, tag) in enumerate(zip(data[col], data[tag_col])):
+            if tag is not None:
+                values[position] = _DECODERS[tag](text)
+        data[col] = values
+        data = data.drop(columns=tag_col)
+    for col in data.columns[data.dtypes == object]:
+        data[col] = data[col].where(data[col].notna(), np.nan)
+    return data
+
+
+def _parse_xlsx(file_path):
+    # pd.read_excel builds its frame the same way from the converted rows
+    rows = list(iter_xlsx_rows(file_path))
+    if not rows:
+        return pd.DataFrame()
+    return pd.io.parsers.TextParser(rows, header=0).read()
+
+
+def _select_columns(data, columns):
+    """The requested columns of `data` that it has, in the requested order."""
+    return data[[col for col in columns if col in data.columns]] if columns else data
+
+
+def _workbook_hash(path, cache_dir):
+    """Content hash of a workbook, re-computed only when its size or mtime changed."""
+    stat = path.stat()
+    key_file = cache_dir / f"{path.stem}-xlsx-key.json"
+    try:
+        known = json.loads(key_file.read_text())
+    except (OSError, ValueError):
+        known = {}
+    if known.get("path") == str(path) and known.get("size") == stat.st_size \
+            and known.get("mtime_ns") == stat.st_mtime_ns:
+        return known["sha256"]
+    digest = file_hash(path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key_file.write_text(json.dumps({"path": str(path), "size": stat.st_size,
+                                    "mtime_ns": stat.st_mtime_ns, "sha256": digest}))
+    return digest
+
+
+@instrumented()
+def read_excel_cached(file_path, columns=None, cache_dir=None):
+    """
+    Read the first sheet of a workbook through its columnar copy.
+
+    Args:
+        file_path (str): Path to the XLSX file
+        columns (list, optional): Columns to read (those missing from the
+            sheet are skipped); others are never materialized from the
+            columnar copy, but the first read still parses every cell
+        cache_dir (str, optional): Cache directory (defaults to data/.cache)
+
+    Returns:
+        pd.DataFrame: The sheet as pd.read_excel returns it
+    """
+    if not HAS_PYARROW:
+        return _select_columns(pd.read_excel(file_path), columns)
+
+    import pyarrow.parquet as pq
+
+    path = Path(file_path).resolve()
+    cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    cache_file = cache_dir / f"{path.stem}-{_workbook_hash(path, cache_dir)[:16]}-xlsx-v{XLSX_CACHE_VERSION}.parquet"
+    if not cache_file.exists():
+        data = _parse_xlsx(path)
+        try:
+            encoded = _encode_mixed(data)
+        except TypeError as e:
+            print(f"Not caching {path.name}: {e}")
+            return _select_columns(data, columns)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        encoded.to_parquet(temp_file, index=False)
+        os.replace(temp_file, cache_file)
+        return _select_columns(data, columns)
+
+    if columns:
+        stored = set(pq.read_schema(cache_file).names)
+        columns = [part for col in columns for part in (col, f"{col}{_TYPE_SUFFIX}") if part in stored]
+    return _decode_mixed(pd.read_parquet(cache_file, columns=columns, memory_map=True))
@@ -1,8 +1,36 @@
 import pandas as pd
-import re
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from pathlib import Path
 
+from .columnar_cache import iter_xlsx_rows, read_excel_cached
+from .entity_resolution import assign_entity_clusters
+from .instrumentation import instrumented
+from .normalization import normalize_company_names
+from .paths import BROKERS_CSV, RAW_REGISTRY
+from .registry_sources import CANONICAL_COLUMNS, NOT_REPORTED, check_sources, read_source, read_sources
+
 # --- HELPER FUNCTIONS ---
+def _merge_aggregations(columns) -> dict:
+    """
+    Builds the per-column aggregation used to merge records sharing a name.
+    """
+    merge_key = ['Name']
+    one_hot_cols = [col for col in columns if col.startswith('RegistrySource_')]
+    collects_cols = [col for col in columns if col.startswith('Collects')]
+    other_cols = pd.Index(columns).difference(merge_key + one_hot_cols + collects_cols).to_list()
+    # 'any': For one-hot cols, if *any* merged row was True, the result is True.
+    # 'max': For 'Collects' cols, '1' (Yes) will win over '0' (No) or NaN.
+    # 'first': For other cols (like UUID), we just take the first one.
+    return {
+        **{col: 'any' for col in one_hot_cols},
+        **{col: 'max' for col in collects_cols},
+        **{col: 'first' for col in other_cols}
+    }
+
+
+@instrumented()
 def initial_clean_and_one_hot(data: pd.DataFrame) -> pd.DataFrame:
     """
     Drops duplicates, rows with no 'Collects' data, 
@@ -20,53 +48,393 @@ def initial_clean_and_one_hot(data: pd.DataFrame) -> pd.DataFrame:
     return df_final
 
 
-def merge_by_normalized_name(data: pd.DataFrame) -> pd.DataFrame:
+@instrumented()
+def merge_by_normalized_name(data: pd.DataFrame, workers: int = None) -> pd.DataFrame:
     """
     Normalizes company names and merges records, combining 
     data sources and collected data types.
-    """
-    def normalize_name(name):
-        if not isinstance(name, str):
-            return ""
-        name = name.upper()
-        name = re.sub(r'\b(INC|LLC|CORPORATION)\b', '', name)  # remove suffixes
-        name = re.sub(r'[^\w\s]', '', name)  # remove punctuation
-        name = re.sub(r'\s+', ' ', name).strip()  # remove whitespace
-        return name
 
-    data['Name'] = data['Name'].apply(normalize_name)
-    merge_key = ['Name']
-    one_hot_cols = [col for col in data.columns if col.startswith('RegistrySource_')]
+    With `workers` > 1 the 'any'/'max' columns are reduced by a process pool
+    over hash partitions of the names (see _parallel_merge); the result is
+    the same.
+    """
+    data['Name'] = normalize_company_names(data['Name'])
+    merged_dict = _merge_aggregations(data.columns)
     collects_cols = [col for col in data.columns if col.startswith('Collects')]
-    other_cols = data.columns.difference(merge_key + one_hot_cols + collects_cols).to_list()
-    # 'any': For one-hot cols, if *any* merged row was True, the result is True.
-    # 'max': For 'Collects' cols, '1' (Yes) will win over '0' (No) or NaN.
-    # 'first': For other cols (like UUID), we just take the first one.
-    merged_dict = {
-        **{col: 'any' for col in one_hot_cols},
-        **{col: 'max' for col in collects_cols},
-        **{col: 'first' for col in other_cols}
-    }
     data[collects_cols] = data[collects_cols].fillna(0)
-    return data.groupby(merge_key, as_index=False).agg(merged_dict)
+    if workers and workers > 1:
+        return _parallel_merge(data, merged_dict, workers)
+    return data.groupby(['Name'], as_index=False).agg(merged_dict)
+
+
+@instrumented()
+def merge_entity_clusters(data: pd.DataFrame, **resolution_options) -> pd.DataFrame:
+    """
+    Merges already name-merged records whose names are near-duplicates
+    (see entity_resolution.assign_entity_clusters). Each cluster keeps its
+    alphabetically first name.
+    """
+    merged_dict = {'Name': 'min', **_merge_aggregations(data.columns)}
+    clusters = assign_entity_clusters(data, **resolution_options)
+    merged = data.assign(ClusterID=clusters).groupby('ClusterID', as_index=False).agg(merged_dict)
+    return merged.drop(columns='ClusterID')
+
+
+@instrumented()
+def read_registry(input_file_path: str) -> pd.DataFrame:
+    """
+    Loads the registry columns (registry_sources.CANONICAL_COLUMNS, which
+    initial_clean_and_one_hot carries into the cleaned registry) of a
+    registry file (CSV or XLSX) into memory. Workbooks are parsed once and
+    then only these columns are read from their columnar copy (see
+    columnar_cache.read_excel_cached).
+    """
+    if Path(input_file_path).suffix.lower() == '.csv':
+        return pd.read_csv(input_file_path, usecols=lambda col: col in CANONICAL_COLUMNS)
+    return read_excel_cached(input_file_path, columns=CANONICAL_COLUMNS)
+
+
+@instrumented()
+def read_registry_with_sources(input_file_path: str, sources: list, workers: int = None) -> tuple:
+    """
+    Loads a registry file together with other registries mapped onto its
+    layout (see registry_sources). The other registries are parsed in
+    worker processes while the registry file is read.
+    Returns (registry DataFrame, list of source DataFrames).
+    """
+    check_sources(sources)
+    with ProcessPoolExecutor(max_workers=workers or len(sources)) as pool:
+        futures = [pool.submit(read_source, name) for name in sources]
+        data = read_registry(input_file_path)
+        return data, [future.result() for future in futures]
+
+
+@instrumented()
+def merge_source_rows(merged: pd.DataFrame, source_frames: list) -> pd.DataFrame:
+    """
+    Adds the rows of other registries (see registry_sources) to an already
+    merged registry without overriding it:
+    - RegistrySource_* columns are OR-ed,
+    - a source's Collects* value only fills cells where the broker has no
+      reported (0/1) value; brokers no registry reports on get 2,
+    - other columns keep the merged value and are filled where missing.
+    """
+    sources = pd.concat(source_frames, ignore_index=True).drop_duplicates()
+    sources = pd.get_dummies(sources, columns=['RegistrySource'])
+    sources['Name'] = normalize_company_names(sources['Name'])
+    # Unlike merge_by_normalized_name, unreported Collects* stay NaN here
+    sources = sources.groupby('Name').agg(_merge_aggregations(sources.columns))
+
+    merged = merged.set_index('Name')
+    names = merged.index.union(sources.index)
+    combined = merged.reindex(names)
+    sources = sources.reindex(names)
+
+    one_hot_cols = sorted(set(col for col in combined.columns.union(sources.columns)
+                              if col.startswith('RegistrySource_')))
+    collects_cols = [col for col in combined.columns if col.startswith('Collects')]
+    other_cols = [col for col in combined.columns if col not in one_hot_cols and col not in collects_cols]
+    unlisted = pd.Series(False, index=names)
+    for col in one_hot_cols:
+        combined[col] = combined.get(col, unlisted).eq(True) | sources.get(col, unlisted).eq(True)
+    for col in collects_cols:
+        values = combined[col]
+        filled = values.where(values.isin([0, 1]), sources[col])
+        combined[col] = filled.fillna(values).fillna(NOT_REPORTED)
+    for col in other_cols:
+        if col in sources:
+            combined[col] = combined[col].where(combined[col].notna(), sources[col])
+    return combined[one_hot_cols + collects_cols + other_cols].reset_index()
+
+
+# --- STREAMING HELPERS ---
+def iter_registry_chunks(input_file_path: str, chunksize: int):
+    """
+    Reads a registry file (CSV or XLSX) in chunks of at most `chunksize` rows.
+
+    Values are left uninferred (object dtype, missing values as NaN) so that
+    dtypes can be decided once over the whole file, as the in-memory path does.
+    """
+    if Path(input_file_path).suffix.lower() == '.csv':
+        yield from pd.read_csv(input_file_path, chunksize=chunksize, dtype=object)
+        return
+
+    rows = iter_xlsx_rows(input_file_path)
+    header = next(rows, None)
+    if header is None:
+        return
+    width = len(header)
+    buffer = []
+    for row in rows:
+        buffer.append((row + [""] * width)[:width])
+        if len(buffer) == chunksize:
+            yield pd.io.parsers.TextParser(buffer, names=header, dtype=object).read()
+            buffer = []
+    if buffer:
+        yield pd.io.parsers.TextParser(buffer, names=header, dtype=object).read()
+
+
+def _observe_column_kinds(chunk: pd.DataFrame, kinds: dict) -> None:
+    """
+    Records, per column, whether every value seen so far is numeric, whether
+    any is fractional and whether any is missing.
+    """
+    for col in chunk.columns:
+        state = kinds.setdefault(col, {'numeric': True, 'float': False, 'has_na': False})
+        values = chunk[col].dropna()
+        state['has_na'] |= len(values) < len(chunk)
+        if state['numeric'] and len(values):
+            try:
+                converted = pd.to_numeric(values)
+            except (ValueError, TypeError):
+                state['numeric'] = False
+            else:
+                state['float'] |= converted.dtype.kind == 'f'
+
+
+def _finalize_column(values: pd.Series, state: dict) -> pd.Series:
+    """
+    Casts an aggregated column to the dtype a whole-file read would infer.
+    """
+    if not state['numeric']:
+        return values.astype(object)
+    values = pd.to_numeric(values)
+    if state['float'] or state['has_na']:
+        return values.astype('float64')
+    return values
+
+
+def _aggregate_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Applies the cleaning and merge steps to a single raw chunk.
+    """
+    collects_cols = [col for col in chunk.columns if col.startswith('Collects')]
+    chunk[collects_cols] = chunk[collects_cols].apply(pd.to_numeric)
+    chunk = chunk[~chunk[collects_cols].isna().all(axis=1)]
+    chunk = pd.get_dummies(chunk, columns=['RegistrySource'])
+    return merge_by_normalized_name(chunk)
+
+
+def _combine_partials(frames: list) -> pd.DataFrame:
+    """
+    Folds partial aggregates into one. 'any', 'max' and 'first' are
+    associative, so re-aggregating partials in order keeps the result exact.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    columns = frames[0].columns
+    for frame in frames[1:]:
+        columns = columns.union(frame.columns, sort=False)
+    one_hot_cols = [col for col in columns if col.startswith('RegistrySource_')]
+    frames = [
+        frame.assign(**{col: False for col in one_hot_cols if col not in frame}).reindex(columns=columns)
+        for frame in frames
+    ]
+    combined = pd.concat(frames, ignore_index=True)
+    return combined.groupby(['Name'], as_index=False).agg(_merge_aggregations(combined.columns))
+
+
+@instrumented()
+def stream_clean_and_merge(input_file_path: str, chunksize: int = 50_000) -> pd.DataFrame:
+    """
+    Streaming equivalent of initial_clean_and_one_hot followed by
+    merge_by_normalized_name. Only one chunk plus the partial aggregate
+    (one row per normalized name) is held in memory at a time.
+    """
+    store = []  # running aggregate followed by partials not yet folded in
+    pending_rows = 0
+    kinds = {}
+    for chunk in iter_registry_chunks(input_file_path, chunksize):
+        _observe_column_kinds(chunk, kinds)
+        partial = _aggregate_chunk(chunk)
+        store.append(partial)
+        pending_rows += len(partial)
+        if pending_rows >= chunksize:
+            store = [_combine_partials(store)]
+            pending_rows = 0
+
+    if not store:
+        return pd.DataFrame()
+    store = _combine_partials(store)
+
+    one_hot_cols = sorted(col for col in store.columns if col.startswith('RegistrySource_'))
+    collects_cols = [col for col in kinds if col.startswith('Collects')]
+    other_cols = store.columns.difference(['Name'] + one_hot_cols + collects_cols).to_list()
+    result = store[['Name'] + one_hot_cols + collects_cols + other_cols].copy()
+    result[one_hot_cols] = result[one_hot_cols].astype(bool)
+    for col in collects_cols + other_cols:
+        result[col] = _finalize_column(result[col], kinds[col])
+    return result
+
+# --- PARALLEL MERGE HELPERS ---
+def _attach_array(spec: tuple):
+    """
+    Attaches to a shared-memory array described by (name, shape, dtype).
+    Returns the segment (to be closed by the caller) and the array view.
+    """
+    name, shape, dtype = spec
+    segment = shared_memory.SharedMemory(name=name)
+    return segment, np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+
+def _share_array(array: np.ndarray, segments: list) -> tuple:
+    """
+    Copies an array into a new shared-memory segment (appended to `segments`).
+    """
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    segments.append(segment)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+    return segment.name, array.shape, array.dtype.str
+
+
+def _reduce_partition(rows_spec: tuple, codes_spec: tuple, values_spec: tuple,
+                      result_spec: tuple, start: int, stop: int) -> int:
+    """
+    Worker body: max-reduces the value rows rows[start:stop] (one partition)
+    per group code and writes one result row per group. Partitions hold
+    disjoint groups, so workers never write the same result row.
+    """
+    attached = [_attach_array(spec) for spec in (rows_spec, codes_spec, values_spec, result_spec)]
+    segments = [segment for segment, _ in attached]
+    rows, codes, values, result = (array for _, array in attached)
+    del attached
+    try:
+        part_rows = rows[start:stop]
+        part_codes = codes[part_rows]
+        order = np.argsort(part_codes, kind='stable')
+        part_rows, part_codes = part_rows[order], part_codes[order]
+        group_starts = np.flatnonzero(np.r_[True, part_codes[1:] != part_codes[:-1]])
+        result[part_codes[group_starts]] = np.maximum.reduceat(values[part_rows], group_starts, axis=0)
+        return len(group_starts)
+    finally:
+        # The views must be released before their segments can be closed
+        del rows, codes, values, result
+        for segment in segments:
+            segment.close()
+
+
+def _first_valid(values: pd.Series, codes: np.ndarray, n_groups: int):
+    """
+    Vectorized groupby 'first': the first non-null value of each group.
+    """
+    valid = np.flatnonzero(values.notna().to_numpy())[::-1]
+    positions = np.full(n_groups, -1, dtype=np.int64)
+    # Assigning in reverse leaves the earliest row of each group
+    positions[codes[valid]] = valid
+    array = values.to_numpy()
+    missing = positions < 0
+    if not missing.any():
+        return array[positions]
+    # groupby fills object columns with None and other columns with NaN
+    result = array[np.where(missing, 0, positions)]
+    if result.dtype != object:
+        result = result.astype(np.float64)
+    result[missing] = None if result.dtype == object else np.nan
+    return result
+
+
+def _restore_dtype(values: np.ndarray, dtype):
+    """
+    Casts a reduced column back to the dtype of the input column, including
+    extension dtypes (Int8, category, Arrow booleans) that numpy cannot
+    interpret, as the serial groupby keeps them.
+    """
+    return pd.Series(values, copy=False).astype(dtype).array
+
+
+def _parallel_merge(data: pd.DataFrame, merged_dict: dict, workers: int) -> pd.DataFrame:
+    """
+    Sharded equivalent of data.groupby(['Name'], as_index=False).agg(merged_dict)
+    for 'any'/'max'/'first' aggregations.
+
+    Rows are hash-partitioned by name into `workers` partitions. The 'any'
+    and 'max' columns, the row order and the group codes are placed in shared
+    memory, and each worker reduces one partition with vectorized reductions
+    into its own rows of a shared result block. 'first' columns (object
+    data) are resolved in the parent with one vectorized pass per column.
+    Every column keeps its input dtype, so schema-compacted frames (see
+    schema.apply_schema) give the same result as the serial groupby.
+    """
+    reduced_cols = [col for col, how in merged_dict.items() if how in ('any', 'max')]
+    if not all(pd.api.types.is_bool_dtype(data[col]) or pd.api.types.is_numeric_dtype(data[col])
+               for col in reduced_cols):
+        return data.groupby(['Name'], as_index=False).agg(merged_dict)
+
+    codes, names = pd.factorize(data['Name'], sort=True)
+    n_groups = len(names)
+    partitions = (pd.util.hash_array(np.asarray(names, dtype=object)) % workers)[codes]
+    rows = np.argsort(partitions, kind='stable')
+    bounds = np.searchsorted(partitions[rows], np.arange(workers + 1))
+
+    segments = []
+    try:
+        values = data[reduced_cols].to_numpy(dtype=np.float64)
+        specs = [_share_array(array, segments) for array in (rows, codes.astype(np.int64), values)]
+        result_spec = _share_array(np.zeros((n_groups, len(reduced_cols))), segments)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_reduce_partition, *specs, result_spec, bounds[i], bounds[i + 1])
+                for i in range(workers) if bounds[i + 1] > bounds[i]
+            ]
+            for future in futures:
+                future.result()
+        reduced = np.ndarray((n_groups, len(reduced_cols)), buffer=segments[-1].buf).copy()
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    merged = {'Name': np.asarray(names, dtype=object)}
+    for position, col in enumerate(reduced_cols):
+        column = reduced[:, position]
+        merged[col] = _restore_dtype(column > 0 if merged_dict[col] == 'any' else column, data[col].dtype)
+    for col, how in merged_dict.items():
+        if how == 'first':
+            merged[col] = _first_valid(data[col], codes, n_groups)
+            if not isinstance(data[col].dtype, np.dtype):
+                merged[col] = _restore_dtype(merged[col], data[col].dtype)
+    return pd.DataFrame({col: merged[col] for col in ['Name'] + list(merged_dict)})
 
 # --- MAIN FUNCTION ---
-def clean_data(input_file_path: str) -> pd.DataFrame:
+@instrumented()
+def clean_data(input_file_path: str, chunksize: int = None, resolve_entities: bool = False,
+               output_path: str = BROKERS_CSV, workers: int = None, sources: list = None) -> pd.DataFrame:
     """
     Main pipeline function to load, clean, and merge data broker data.
+
+    If `chunksize` is given the registry is streamed in chunks of that many
+    rows instead of being loaded whole; the result is the same.
+    Otherwise `workers` > 1 merges with a process pool (see
+    merge_by_normalized_name).
+    `sources` names other registries (keys of registry_sources.SOURCES),
+    parsed in parallel and added with merge_source_rows, which only fills
+    values the registry does not report.
+    If `resolve_entities` is set, near-duplicate names are merged as well.
+    The result is saved to `output_path`.
     """
     try:
-        data = pd.read_excel(input_file_path)
+        if chunksize:
+            source_frames = read_sources(sources, workers) if sources else []
+            result_df = stream_clean_and_merge(input_file_path, chunksize)
+        elif sources:
+            data, source_frames = read_registry_with_sources(input_file_path, sources, workers)
+        else:
+            data, source_frames = read_registry(input_file_path), []
     except FileNotFoundError:
         print(f"Error: File not found at {input_file_path}")
         return pd.DataFrame()
     except Exception as e:
-        print(f"Error reading Excel file: {e}")
+        print(f"Error reading registry file: {e}")
         return pd.DataFrame()
-    
-    df_cleaned = initial_clean_and_one_hot(data)
-    result_df = merge_by_normalized_name(df_cleaned)
-    output_path = Path("../data/cleaned_data/uq-data-brokers.csv")
+
+    if not chunksize:
+        df_cleaned = initial_clean_and_one_hot(data)
+        result_df = merge_by_normalized_name(df_cleaned, workers)
+    if source_frames:
+        result_df = merge_source_rows(result_df, source_frames)
+    if resolve_entities:
+        result_df = merge_entity_clusters(result_df)
+    output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     result_df.to_csv(output_path, index=False)
     print(f"File saved to {output_path}")
@@ -74,6 +442,5 @@ def clean_data(input_file_path: str) -> pd.DataFrame:
 
 
 if __name__ == '__main__':
-     raw_file = '../data/raw_data/Data_Broker_Full_Registry_2025.xlsx'
-     cleaned_df = clean_data(raw_file)
-     print(cleaned_df.head())
\ No newline at end of file
+     cleaned_df = clean_data(RAW_REGISTRY)
+     print(cleaned_df.head())
@@ -0,0 +1,197 @@
+"""
+Broker Entity Resolution Utilities
+==================================
+
+Functions for clustering near-duplicate broker records that exact name
+matching misses (e.g. "EXPERIAN MARKETING SOLUTIONS" vs "EXPERIAN MARKETING
+SOLUTION" across the Vermont, Texas, Oregon and California registries).
+
+Records are only compared within blocks that share a key (sorted name tokens,
+a name prefix, the privacy policy domain or the street address), and
+oversized blocks are skipped, so the number of comparisons grows roughly
+linearly with the registry instead of quadratically.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .normalization import compact_lowercase_values
+
+
+def name_ngrams(name, n=3):
+    """
+    Character n-grams of a padded name, used for similarity scoring.
+
+    Args:
+        name (str): Normalized company name
+        n (int): N-gram length
+
+    Returns:
+        frozenset: Set of n-grams
+    """
+    padded = f" {name} "
+    return frozenset(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+
+
+def name_similarity(left, right):
+    """
+    Jaccard similarity of two n-gram sets.
+
+    Args:
+        left (frozenset): N-grams of the first name
+        right (frozenset): N-grams of the second name
+
+    Returns:
+        float: Similarity between 0 and 1
+    """
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def policy_domain(url):
+    """
+    Extract the host of a URL without a leading "www.".
+
+    Args:
+        url (str): Raw URL
+
+    Returns:
+        str: Lowercase host, or "" if the URL has none
+    """
+    if not isinstance(url, str):
+        return ""
+    url = url.strip()
+    if "://" not in url:
+        url = "http://" + url
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def _blocking_keys(names, domains, addresses, prefix_length):
+    """
+    Build a mapping of blocking key -> record positions.
+    """
+    blocks = {}
+    for position, name in enumerate(names):
+        tokens = name.split()
+        keys = []
+        if tokens:
+            keys.append("tok:" + " ".join(sorted(tokens)))
+            keys.append("pre:" + "".join(tokens)[:prefix_length])
+        keys.extend("dom:" + domain for domain in domains[position])
+        keys.extend("adr:" + address for address in addresses[position])
+        for key in keys:
+            blocks.setdefault(key, []).append(position)
+    return blocks
+
+
+def _match_block_batch(args):
+    """
+    Compare all pairs inside each block of a batch and return the matches.
+    """
+    blocks, ngrams, name_threshold, shared_key_threshold = args
+    matches = []
+    for key, positions in blocks:
+        threshold = name_threshold if key[:4] in ("tok:", "pre:") else shared_key_threshold
+        for left, right in combinations(positions, 2):
+            if name_similarity(ngrams[left], ngrams[right]) >= threshold:
+                matches.append((left, right))
+    return matches
+
+
+def _find(parents, position):
+    while parents[position] != position:
+        parents[position] = parents[parents[position]]
+        position = parents[position]
+    return position
+
+
+def assign_entity_clusters(data, name_col="Name", url_col="PrivacyPolicyURL",
+                           address_cols=("Address", "ZipCode"), name_threshold=0.8,
+                           shared_key_threshold=0.5, max_block_size=200,
+                           prefix_length=6, n_jobs=None):
+    """
+    Assign a cluster ID to every row so that near-duplicate brokers share one.
+
+    Rows with the same normalized name always share a cluster. Distinct names
+    are merged when their n-gram similarity reaches `name_threshold`, or
+    `shared_key_threshold` if they also share a policy domain or address.
+
+    Args:
+        data (pd.DataFrame): Broker records with normalized names
+        name_col (str): Column containing normalized names
+        url_col (str): Column containing privacy policy URLs (optional)
+        address_cols (tuple): Columns combined into the address key (optional)
+        name_threshold (float): Similarity needed within name blocks
+        shared_key_threshold (float): Similarity needed within domain/address blocks
+        max_block_size (int): Blocks larger than this are not compared
+        prefix_length (int): Characters of the compacted name used as a block key
+        n_jobs (int, optional): Worker processes (defaults to all CPU cores)
+
+    Returns:
+        pd.Series: Integer cluster IDs aligned with `data`, numbered in
+            order of each cluster's smallest name
+    """
+    codes, names = pd.factorize(data[name_col].fillna(""), sort=True)
+    names = list(names)
+    record_count = len(names)
+
+    def keys_by_name(values):
+        grouped = pd.DataFrame({"code": codes, "key": values.to_numpy()})
+        grouped = grouped[grouped["key"] != ""].drop_duplicates()
+        keys = [[] for _ in range(record_count)]
+        for code, key in zip(grouped["code"], grouped["key"]):
+            keys[code].append(key)
+        return keys
+
+    if url_col in data.columns:
+        domains = keys_by_name(data[url_col].map(policy_domain))
+    else:
+        domains = [[] for _ in range(record_count)]
+    present_address_cols = [col for col in address_cols if col in data.columns]
+    if present_address_cols:
+        address = compact_lowercase_values(data[present_address_cols[0]])
+        for col in present_address_cols[1:]:
+            address = address.where(address == "", address + "|" + compact_lowercase_values(data[col]))
+        addresses = keys_by_name(address)
+    else:
+        addresses = [[] for _ in range(record_count)]
+
+    blocks = [
+        (key, positions)
+        for key, positions in _blocking_keys(names, domains, addresses, prefix_length).items()
+        if 1 < len(positions) <= max_block_size
+    ]
+    ngrams = [name_ngrams(name) for name in names]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs > 1 and len(blocks) > n_jobs:
+        batches = [
+            (blocks[i::n_jobs], ngrams, name_threshold, shared_key_threshold)
+            for i in range(n_jobs)
+        ]
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            match_lists = list(executor.map(_match_block_batch, batches))
+    else:
+        match_lists = [_match_block_batch((blocks, ngrams, name_threshold, shared_key_threshold))]
+
+    parents = list(range(record_count))
+    for matches in match_lists:
+        for left, right in matches:
+            left_root, right_root = _find(parents, left), _find(parents, right)
+            if left_root != right_root:
+                # Keep the smallest position (alphabetically first name) as root
+                parents[max(left_root, right_root)] = min(left_root, right_root)
+
+    roots = np.array([_find(parents, position) for position in range(record_count)], dtype=np.int64)
+    _, cluster_ids = np.unique(roots, return_inverse=True)
+    return pd.Series(cluster_ids[codes], index=data.index, name="ClusterID")
@@ -0,0 +1,361 @@
+"""
+Figure Build Pipeline
+=====================
+
+Registry of the project's Altair figures and a batch renderer for them.
+
+Every figure is keyed on the hash of its embedded data and the hash of the
+rest of its Vega-Lite spec. A manifest in data/.cache records the key each
+output file was rendered from, so unchanged figures are skipped and only the
+changed ones are rendered, in parallel worker processes (requires
+vl-convert-python).
+
+Usage:
+    python -m data_utils.figures                 # build all stale figures
+    python -m data_utils.figures --list
+    python -m data_utils.figures disparity-use-cases --force
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from .instrumentation import instrumented
+from .paths import BROKERS_CSV, CACHE_DIR, LLM_RESULTS_CSV, PROJECT_ROOT, SURVEY_CSV
+
+
+IMGS_DIR = PROJECT_ROOT / "notebooks" / "imgs"
+DEFAULT_MANIFEST = CACHE_DIR / "figures.json"
+
+# Name -> {"output": Path, "build": callable returning an Altair chart}
+FIGURES = {}
+
+# LLM answers the policy and disparity figures are built from (see build_figures)
+_llm_results = LLM_RESULTS_CSV
+# (input name, path) -> (content hash, loaded data), see _memoized
+_input_memo = {}
+
+# Altair numbers interactive views and params per process; ignored when hashing
+_GENERATED_NAME_PATTERN = re.compile(r'"(view|param)_\d+"')
+
+
+def register_figure(name, output):
+    """
+    Decorator registering a figure builder.
+
+    Args:
+        name (str): Figure name used on the command line
+        output (str): Output file name in notebooks/imgs (or an absolute path)
+
+    Returns:
+        callable: Decorator returning the builder unchanged
+    """
+    def decorator(build):
+        FIGURES[name] = {"output": IMGS_DIR / output, "build": build}
+        return build
+    return decorator
+
+
+def figure_key(spec):
+    """
+    Hash a Vega-Lite spec into (data hash, spec hash).
+
+    Args:
+        spec (dict): Spec from chart.to_dict()
+
+    Returns:
+        tuple: (data_hash, spec_hash) hex digests
+    """
+    datasets = spec.get("datasets", {})
+    layout = {key: value for key, value in spec.items() if key != "datasets"}
+    data_hash = hashlib.sha256(json.dumps(datasets, sort_keys=True).encode("utf-8")).hexdigest()
+    layout_json = _GENERATED_NAME_PATTERN.sub(r'"\1"', json.dumps(layout, sort_keys=True))
+    spec_hash = hashlib.sha256(layout_json.encode("utf-8")).hexdigest()
+    return data_hash, spec_hash
+
+
+def _manifest_key(output):
+    return os.path.relpath(output, PROJECT_ROOT)
+
+
+def _render(spec_json, output):
+    """
+    Render a spec to SVG or PNG (chosen by suffix) and write it atomically.
+    Runs in the worker processes.
+    """
+    import vl_convert
+
+    start = time.perf_counter()
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output.with_name(output.name + f".{os.getpid()}.tmp")
+    if output.suffix == ".png":
+        temp_path.write_bytes(vl_convert.vegalite_to_png(spec_json, scale=2))
+    else:
+        temp_path.write_text(vl_convert.vegalite_to_svg(spec_json), encoding="utf-8")
+    os.replace(temp_path, output)
+    return time.perf_counter() - start
+
+
+@instrumented()
+def build_figures(names=None, force=False, max_workers=None, manifest_path=None, llm_results=None):
+    """
+    Render every stale figure.
+
+    Args:
+        names (list, optional): Figures to build (defaults to all registered)
+        force (bool): Render even if the output is up to date
+        max_workers (int, optional): Render processes (defaults to the CPU count)
+        manifest_path (str, optional): Manifest file (defaults to data/.cache/figures.json)
+        llm_results (str, optional): LLM answers CSV for the policy and disparity
+            figures (defaults to the committed LLM results)
+
+    Returns:
+        pd.DataFrame: One row per figure with output, status and seconds
+    """
+    global _llm_results
+
+    names = list(names or FIGURES)
+    unknown = [name for name in names if name not in FIGURES]
+    if unknown:
+        raise KeyError(f"Unknown figures: {', '.join(unknown)}")
+
+    manifest_path = Path(manifest_path) if manifest_path else DEFAULT_MANIFEST
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    results, pending = {}, {}
+    previous_llm_results, _llm_results = _llm_results, Path(llm_results) if llm_results else LLM_RESULTS_CSV
+    try:
+        for name in names:
+            output = FIGURES[name]["output"]
+            start = time.perf_counter()
+            spec = FIGURES[name]["build"]().to_dict()
+            key = list(figure_key(spec))
+            if not force and output.exists() and manifest.get(_manifest_key(output)) == key:
+                results[name] = {"status": "unchanged", "seconds": time.perf_counter() - start}
+            else:
+                pending[name] = (json.dumps(spec), key)
+    finally:
+        _llm_results = previous_llm_results
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(len(pending), max_workers or os.cpu_count() or 1)) as executor:
+            futures = {
+                name: executor.submit(_render, spec_json, str(FIGURES[name]["output"]))
+                for name, (spec_json, _) in pending.items()
+            }
+            for name, future in futures.items():
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    results[name] = {"status": f"failed: {e}", "seconds": None}
+                    manifest.pop(_manifest_key(FIGURES[name]["output"]), None)
+                else:
+                    results[name] = {"status": "rendered", "seconds": seconds}
+                    manifest[_manifest_key(FIGURES[name]["output"])] = pending[name][1]
+
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+    summary = pd.DataFrame([
+        {"figure": name, "output": FIGURES[name]["output"].name, **results[name]}
+        for name in names
+    ])
+    print(f"Built {len(summary)} figures: " +
+          ", ".join(f"{count} {status}" for status, count in summary["status"].value_counts().items()))
+    return summary
+
+
+# Figure definitions
+# ==================
+
+def _memoized(name, path, load):
+    """
+    Memoize load() on the content hash of `path`, so inputs rewritten
+    between builds (e.g. by the pipeline's clean or llm stages) are reloaded
+    instead of being served stale. Only the latest version is kept.
+    """
+    from .columnar_cache import file_hash
+    key = (name, str(path))
+    content_hash = file_hash(path)
+    if key not in _input_memo or _input_memo[key][0] != content_hash:
+        _input_memo[key] = (content_hash, load())
+    return _input_memo[key][1]
+
+
+def _brokers():
+    from .columnar_cache import read_csv_cached
+    return _memoized("brokers", BROKERS_CSV, lambda: read_csv_cached(BROKERS_CSV, schema=True))
+
+
+def _survey():
+    return _memoized("survey", SURVEY_CSV, lambda: pd.read_csv(SURVEY_CSV))
+
+
+def _survey_indicators():
+    from .survey import decode_survey
+    return _memoized("survey_indicators", SURVEY_CSV, lambda: decode_survey(_survey()))
+
+
+def _policy_questions_from(path):
+    from .privacy_policy_analyzer import (
+        analyze_data_use_practices, analyze_sharing_entities, analyze_user_controls,
+        decode_llm_responses, load_privacy_policy_data
+    )
+
+    def load():
+        llm_data = load_privacy_policy_data(path)
+        decoded = decode_llm_responses(llm_data)
+        return {
+            "Q1": analyze_data_use_practices(llm_data, decoded)[0],
+            "Q2": analyze_sharing_entities(llm_data, decoded)[0],
+            "Q3": analyze_user_controls(llm_data, decoded)[0]
+        }
+    return _memoized("policy_questions", path, load)
+
+
+def _policy_questions():
+    return _policy_questions_from(_llm_results)
+
+
+def _policy_rates():
+    from .privacy_policy_analyzer import explicit_permission_rates
+    return explicit_permission_rates(_llm_results)
+
+
+def _gap_module():
+    notebooks_dir = str(PROJECT_ROOT / "notebooks")
+    if notebooks_dir not in sys.path:
+        sys.path.insert(0, notebooks_dir)
+    import gap_analysis_chart
+    return gap_analysis_chart
+
+
+@register_figure("policy-data-use", "Permitted Data Use Cases in Privacy Policies of Data Brokers.svg")
+def _policy_data_use_chart():
+    from .privacy_policy_analyzer import LLM_QUESTIONS, create_policy_analysis_chart
+    return create_policy_analysis_chart(
+        data=_policy_questions()["Q1"],
+        category_columns=LLM_QUESTIONS["Q1"][1],
+        title='Permitted Data Use Cases in Privacy Policies of Data Brokers',
+        xlabel='Data Use Category',
+        legend_labels=['0 = Explicitly Not Allowed', '1 = Explicitly Allowed', '2 = Not Mentioned']
+    )
+
+
+@register_figure("policy-entity-sharing", "Permitted Entity Data Sharing in Privacy Policies of Data Brokers.svg")
+def _policy_entity_sharing_chart():
+    from .privacy_policy_analyzer import LLM_QUESTIONS, create_policy_analysis_chart
+    return create_policy_analysis_chart(
+        data=_policy_questions()["Q2"],
+        category_columns=LLM_QUESTIONS["Q2"][1],
+        title='Permitted Entity Data Sharing in Privacy Policies of Data Brokers',
+        xlabel='Entity Type',
+        legend_labels=['0 = Explicitly Not Allowed', '1 = Explicitly Allowed', '2 = Not Mentioned']
+    )
+
+
+@register_figure("policy-user-rights", "User Rights and Controls in Privacy Policies of Data Brokers.svg")
+def _policy_user_rights_chart():
+    from .privacy_policy_analyzer import LLM_QUESTIONS, create_policy_analysis_chart
+    return create_policy_analysis_chart(
+        data=_policy_questions()["Q3"],
+        category_columns=LLM_QUESTIONS["Q3"][1],
+        title='User Rights and Controls in Privacy Policies of Data Brokers',
+        xlabel='User Right Category',
+        legend_labels=['0 = No Explicit Guarantee', '1 = Explicit Guarantee']
+    )
+
+
+@register_figure("registry-data-types", "Permitted Data Types Collected By Data Brokers.svg")
+def _registry_data_types_chart():
+    from .privacy_policy_analyzer import create_policy_analysis_chart
+    data_type_labels = {
+        "CollectsMinorsData": "Minors",
+        "CollectsReproductiveHealthData": "Reproductive Health",
+        "CollectsEmploymentData": "Employment",
+        "CollectsNetworkData": "Network",
+        "CollectsCommercialData": "Commercial",
+        "CollectsBiometricData": "Biometric",
+        "CollectsAddresses": "Address",
+        "CollectsSSNGovID": "Government Identification"
+    }
+    data_type = (
+        _brokers()[list(data_type_labels)]
+        .apply(pd.to_numeric, errors='coerce')
+        .astype('Int64')
+        .rename(columns=data_type_labels)
+    )
+    return create_policy_analysis_chart(
+        data=data_type,
+        category_columns=list(data_type_labels.values()),
+        title='Permitted Data Types Collected By Data Brokers',
+        xlabel='Data Type',
+        legend_labels=['0 = Explicitly Not Allowed', '1 = Explicitly Allowed', '2 = Not Reported']
+    )
+
+
+@register_figure("disparity-data-types", "Disparity - Data Types.svg")
+def _disparity_data_types_chart():
+    gap = _gap_module()
+    return gap.create_dumbbell_chart(
+        gap.create_gap_chart_data_types(_brokers(), _survey_indicators()),
+        title='Disparity: Data Broker Collection vs. Consumer Comfort (Data Types)',
+        x_label='Percentage (%)',
+        y_label='Data Type',
+        aggregate=True
+    )
+
+
+@register_figure("disparity-use-cases", "Disparity - Use Cases.svg")
+def _disparity_use_cases_chart():
+    gap = _gap_module()
+    return gap.create_dumbbell_chart(
+        gap.create_gap_chart_use_cases(_survey_indicators(), policy_rates=_policy_rates()),
+        title='Disparity: Data Broker Collection vs. Consumer Comfort (Use Cases)',
+        x_label='Percentage (%)',
+        y_label='Use Case',
+        aggregate=True
+    )
+
+
+@register_figure("disparity-entities", "Disparity - Entities.svg")
+def _disparity_entities_chart():
+    gap = _gap_module()
+    return gap.create_dumbbell_chart(
+        gap.create_gap_chart_entities(_survey_indicators(), policy_rates=_policy_rates()),
+        title='Disparity: Data Broker Sharing vs. Consumer Comfort (Entities)',
+        x_label='Percentage (%)',
+        y_label='Entity',
+        aggregate=True
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the project's figures into notebooks/imgs.")
+    parser.add_argument("figures", nargs="*", help="Figures to build (default: all)")
+    parser.add_argument("--force", action="store_true", help="Render even if unchanged")
+    parser.add_argument("--jobs", type=int, default=None, help="Render processes (default: CPU count)")
+    parser.add_argument("--llm-results", type=Path, default=None,
+                        help="LLM answers CSV for the policy figures (default: the committed results)")
+    parser.add_argument("--list", action="store_true", help="List registered figures and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, figure in FIGURES.items():
+            print(f"{name:24s} {figure['output'].name}")
+        return
+    print(build_figures(args.figures or None, force=args.force, max_workers=args.jobs,
+                        llm_results=args.llm_results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
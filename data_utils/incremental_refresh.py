@@ -0,0 +1,191 @@
+"""
+Incremental Registry Refresh Utilities
+======================================
+
+Functions for refreshing the cleaned broker dataset from a newly published
+registry snapshot without reprocessing unchanged brokers.
+
+Each snapshot row is hashed, and the hashes of all rows sharing a normalized
+name (in file order) are combined into a per-broker digest. Only brokers whose
+digest was added, removed or changed since the previous refresh are cleaned
+and merged again; every other broker is carried over from the previous result.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from .data_cleaner import initial_clean_and_one_hot, merge_by_normalized_name, read_registry
+from .normalization import normalize_company_names
+from .privacy_policy_extractor import clean_policy_rows
+
+
+STATE_FILE = "registry_state.pkl"
+CHANGELOG_FILE = "changelog.csv"
+REQUEUE_FILE = "privacy_policies_requeue.csv"
+
+
+def _canonical_text(values):
+    """
+    Render a column as text that does not depend on the dtype pandas inferred
+    for the snapshot (e.g. 2 and 2.0 both become "2", missing becomes "").
+    """
+    missing = values.isna()
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        numbers = values.astype("float64")
+        integral = ~missing & (numbers % 1 == 0)
+        text = numbers.astype(str)
+        text[integral] = numbers[integral].astype("int64").astype(str)
+    else:
+        text = values.astype(str)
+    return text.mask(missing, "")
+
+
+def broker_digests(data):
+    """
+    Compute a content digest per normalized broker name.
+
+    Args:
+        data (pd.DataFrame): Raw registry snapshot
+
+    Returns:
+        pd.Series: Hex digest indexed by normalized name
+    """
+    canonical = pd.DataFrame({col: _canonical_text(data[col]) for col in data.columns})
+    row_hashes = pd.util.hash_pandas_object(canonical, index=False)
+    frame = pd.DataFrame({
+        "Name": normalize_company_names(data["Name"]).to_numpy(),
+        "row_hash": row_hashes.to_numpy()
+    })
+    return frame.groupby("Name", sort=False)["row_hash"].agg(
+        lambda hashes: hashlib.blake2b(hashes.to_numpy().tobytes(), digest_size=16).hexdigest()
+    )
+
+
+def diff_digests(previous, current):
+    """
+    Classify brokers as added, removed or changed between two digest sets.
+
+    Args:
+        previous (pd.Series): Digests from the previous snapshot
+        current (pd.Series): Digests from the new snapshot
+
+    Returns:
+        pd.DataFrame: One row per affected broker with Name and change
+    """
+    aligned = pd.concat([previous.rename("previous"), current.rename("current")], axis=1)
+    change = pd.Series(pd.NA, index=aligned.index, dtype=object)
+    change[aligned["previous"].isna()] = "added"
+    change[aligned["current"].isna()] = "removed"
+    changed_mask = aligned["previous"].notna() & aligned["current"].notna() & (aligned["previous"] != aligned["current"])
+    change[changed_mask] = "changed"
+    change = change.dropna().sort_index()
+    return pd.DataFrame({"Name": change.index, "change": change.to_numpy()})
+
+
+def _merge_subset(data, names):
+    """
+    Clean and merge only the snapshot rows belonging to the given brokers.
+    """
+    subset = data[normalize_company_names(data["Name"]).isin(names)]
+    return merge_by_normalized_name(initial_clean_and_one_hot(subset))
+
+
+def _order_like_full_run(result, data):
+    """
+    Sort rows and columns and cast dtypes the way a full clean of `data` would.
+    """
+    one_hot_cols = sorted(col for col in result.columns if col.startswith("RegistrySource_"))
+    collects_cols = [col for col in data.columns if col.startswith("Collects")]
+    other_cols = result.columns.difference(["Name"] + one_hot_cols + collects_cols).to_list()
+    result = result[["Name"] + one_hot_cols + collects_cols + other_cols]
+    result = result.sort_values("Name", ignore_index=True)
+    dtypes = {col: bool for col in one_hot_cols}
+    dtypes.update({col: data[col].dtype for col in collects_cols + other_cols})
+    result = result.astype(dtypes)
+    # groupby 'first' yields None for all-missing groups in object columns
+    object_cols = [col for col in other_cols if dtypes[col] == object]
+    result[object_cols] = result[object_cols].where(result[object_cols].notna(), None)
+    return result
+
+
+def refresh_registry(snapshot_path, state_dir, output_path=None):
+    """
+    Refresh the cleaned broker dataset from a new registry snapshot.
+
+    On the first run every broker is treated as added. Later runs only
+    re-aggregate brokers whose rows changed, append the changes to
+    `changelog.csv` and write the affected brokers' privacy policies to
+    `privacy_policies_requeue.csv` (both in `state_dir`).
+
+    Args:
+        snapshot_path (str): Path to the new registry snapshot (CSV or XLSX)
+        state_dir (str): Directory holding the refresh state and changelog
+        output_path (str, optional): Where to save the refreshed cleaned CSV
+
+    Returns:
+        tuple: (cleaned_dataset, changelog) for this refresh
+    """
+    state_dir = Path(state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    state_file = state_dir / STATE_FILE
+
+    data = read_registry(snapshot_path)
+    digests = broker_digests(data)
+
+    if state_file.exists():
+        state = pd.read_pickle(state_file)
+        previous_digests, previous_result = state["digests"], state["result"]
+    else:
+        previous_digests, previous_result = pd.Series(dtype=object), None
+
+    changelog = diff_digests(previous_digests, digests)
+    affected = set(changelog["Name"])
+    reprocess = changelog.loc[changelog["change"] != "removed", "Name"]
+
+    refreshed = _merge_subset(data, set(reprocess))
+    if previous_result is None:
+        result = refreshed
+    else:
+        kept = previous_result[~previous_result["Name"].isin(affected)]
+        one_hot_cols = [
+            col for col in kept.columns.union(refreshed.columns)
+            if col.startswith("RegistrySource_")
+        ]
+        frames = [
+            frame.assign(**{col: False for col in one_hot_cols if col not in frame})
+            for frame in (kept, refreshed)
+            if len(frame)
+        ]
+        result = pd.concat(frames, ignore_index=True) if frames else refreshed
+        # Sources that no longer appear in the snapshot are dropped, as in a full run
+        stale_sources = [col for col in one_hot_cols if not result[col].any()]
+        result = result.drop(columns=stale_sources)
+    result = _order_like_full_run(result, data)
+
+    previous_policies = (
+        set(clean_policy_rows(previous_result)["PrivacyPolicyURL_Clean"])
+        if previous_result is not None else set()
+    )
+    requeue = clean_policy_rows(result[result["Name"].isin(set(reprocess))])
+    requeue = requeue[~requeue["PrivacyPolicyURL_Clean"].isin(previous_policies)]
+    requeue.to_csv(state_dir / REQUEUE_FILE, index=False)
+
+    changelog.insert(0, "snapshot", Path(snapshot_path).name)
+    changelog.insert(0, "refreshed_at", datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    changelog_file = state_dir / CHANGELOG_FILE
+    changelog.to_csv(changelog_file, mode="a", header=not changelog_file.exists(), index=False)
+
+    pd.to_pickle({"digests": digests, "result": result}, state_file)
+
+    if output_path:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        result.to_csv(output_path, index=False)
+        print(f"File saved to {output_path}")
+
+    print(f"Registry refreshed: {len(changelog)} brokers changed "
+          f"({len(requeue)} policies queued for analysis)")
+    return result, changelog
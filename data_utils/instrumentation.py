@@ -0,0 +1,312 @@
+"""
+Stage Instrumentation
+=====================
+
+Records wall time, CPU time, peak RSS, rows in/out and bytes read for the
+instrumented data_utils functions and exports them as JSON or Prometheus
+text.
+
+Instrumentation is off unless the DATA_UTILS_PROFILE environment variable is
+set to a true value (or `enable()` is called); when off, an instrumented call
+costs one flag check. With DATA_UTILS_PROFILE_OUTPUT set, the records are
+written to that file when the interpreter exits (Prometheus text if the name
+ends in .prom, JSON otherwise).
+
+Measurements (Linux values come from /proc, elsewhere they are None):
+- `cpu_seconds` is process CPU time, so it includes worker threads and any
+  concurrently running stages.
+- `peak_rss_mb` is the process high-water mark since the first of the
+  currently open spans was opened (the mark is reset then, where the kernel
+  allows); for nested or concurrent spans it is an upper bound.
+- `bytes_read` counts bytes read through system calls by the whole process
+  during the span, including reads served from the page cache.
+- `rows_in` is the length of the first DataFrame/Series argument and
+  `rows_out` the length of the returned one, unless set on the span.
+
+Usage:
+    DATA_UTILS_PROFILE=1 DATA_UTILS_PROFILE_OUTPUT=profile.json python -m data_utils.pipeline
+
+    @instrumented()
+    def clean(data): ...
+
+    with span("load") as record:
+        record.rows_out = len(frame)
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: memory columns are reported as None
+    resource = None
+
+
+ENV_FLAG = "DATA_UTILS_PROFILE"
+ENV_OUTPUT = "DATA_UTILS_PROFILE_OUTPUT"
+
+_enabled = os.environ.get(ENV_FLAG, "").strip().lower() not in ("", "0", "false", "no", "off")
+_records = []
+_lock = threading.Lock()
+_local = threading.local()
+_open_spans = 0
+
+
+def enable(on=True):
+    """Turn instrumentation on or off for the rest of the process."""
+    global _enabled
+    _enabled = bool(on)
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Discard all recorded spans."""
+    with _lock:
+        _records.clear()
+
+
+def records():
+    """
+    Recorded spans, oldest first.
+
+    Returns:
+        list: One dict per finished span
+    """
+    with _lock:
+        return [dict(record) for record in _records]
+
+
+def _rss_mb():
+    if resource is None:
+        return None
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return None
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as handle:
+            handle.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb():
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def _bytes_read():
+    try:
+        with open("/proc/self/io") as handle:
+            for line in handle:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+
+def _rows(value):
+    shape = getattr(value, "shape", None)
+    return int(shape[0]) if shape else None
+
+
+class Span:
+    """
+    An open measurement. `rows_in`, `rows_out` and `bytes_read` may be set
+    by the instrumented code; values left as None are filled in automatically
+    where possible.
+    """
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.bytes_read = None
+
+
+@contextmanager
+def span(name, rows_in=None):
+    """
+    Measure the enclosed block as one stage.
+
+    Args:
+        name (str): Stage name
+        rows_in (int, optional): Input row count
+
+    Yields:
+        Span: Open span (a throwaway one when instrumentation is off)
+    """
+    record = Span(name, rows_in)
+    if not _enabled:
+        yield record
+        return
+
+    global _open_spans
+    with _lock:
+        if _open_spans == 0:
+            _reset_peak_rss()
+        _open_spans += 1
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    started_at = datetime.now(timezone.utc)
+    rss_start, read_start = _rss_mb(), _bytes_read()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    error = None
+    try:
+        yield record
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        read_end = _bytes_read()
+        _local.depth = depth
+        if record.bytes_read is None and read_start is not None and read_end is not None:
+            record.bytes_read = read_end - read_start
+        with _lock:
+            _open_spans -= 1
+            _records.append({
+                "name": name,
+                "started_at": started_at.isoformat(timespec="milliseconds"),
+                "depth": depth,
+                "seconds": wall,
+                "cpu_seconds": cpu,
+                "rss_start_mb": rss_start,
+                "peak_rss_mb": _peak_rss_mb(),
+                "rows_in": record.rows_in,
+                "rows_out": record.rows_out,
+                "bytes_read": record.bytes_read,
+                "thread": threading.current_thread().name,
+                "error": error
+            })
+
+
+def instrumented(name=None):
+    """
+    Decorator recording each call of the function as a span.
+
+    Args:
+        name (str, optional): Stage name (defaults to module.qualname without
+            the data_utils prefix)
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(func):
+        stage_name = name or f"{func.__module__.removeprefix('data_utils.')}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            rows_in = next((rows for rows in map(_rows, args) if rows is not None), None)
+            with span(stage_name, rows_in) as record:
+                result = func(*args, **kwargs)
+                if record.rows_out is None:
+                    record.rows_out = _rows(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def export_json(path=None):
+    """
+    Serialize the recorded spans as JSON.
+
+    Args:
+        path (str, optional): File to write the JSON to
+
+    Returns:
+        str: JSON document with the process id and the spans
+    """
+    document = json.dumps({"pid": os.getpid(), "spans": records()}, indent=2)
+    if path:
+        Path(path).write_text(document)
+    return document
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def export_prometheus(path=None):
+    """
+    Aggregate the recorded spans per stage in the Prometheus text format.
+
+    Args:
+        path (str, optional): File to write the metrics to (e.g. for the
+            node exporter's textfile collector)
+
+    Returns:
+        str: Metrics text
+    """
+    totals = {}
+    for record in records():
+        stage = totals.setdefault(record["name"], {
+            "calls": 0, "errors": 0, "seconds": 0.0, "cpu_seconds": 0.0,
+            "rows_in": 0, "rows_out": 0, "bytes_read": 0, "peak_rss_bytes": 0.0
+        })
+        stage["calls"] += 1
+        stage["errors"] += record["error"] is not None
+        for key in ("seconds", "cpu_seconds", "rows_in", "rows_out", "bytes_read"):
+            stage[key] += record[key] or 0
+        stage["peak_rss_bytes"] = max(stage["peak_rss_bytes"], (record["peak_rss_mb"] or 0) * 2**20)
+
+    metrics = [
+        ("calls", "counter", "Instrumented calls"),
+        ("errors", "counter", "Instrumented calls that raised"),
+        ("seconds", "counter", "Wall-clock seconds spent in the stage"),
+        ("cpu_seconds", "counter", "Process CPU seconds spent in the stage"),
+        ("rows_in", "counter", "Input rows"),
+        ("rows_out", "counter", "Output rows"),
+        ("bytes_read", "counter", "Bytes read by the process during the stage"),
+        ("peak_rss_bytes", "gauge", "Highest peak resident set size observed for the stage")
+    ]
+    lines = []
+    for key, kind, description in metrics:
+        metric = f"data_utils_stage_{key}" + ("_total" if kind == "counter" else "")
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, stage in totals.items():
+            lines.append(f'{metric}{{stage="{_label(name)}"}} {stage[key]}')
+    text = "\n".join(lines) + "\n"
+    if path:
+        Path(path).write_text(text)
+    return text
+
+
+def _export_at_exit():
+    path = os.environ.get(ENV_OUTPUT)
+    if path and records():
+        if path.endswith(".prom"):
+            export_prometheus(path)
+        else:
+            export_json(path)
+
+
+atexit.register(_export_at_exit)
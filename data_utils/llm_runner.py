@@ -0,0 +1,401 @@
+"""
+LLM Policy Analysis Runner
+==========================
+
+Runs the standardized privacy policy prompts over many policies concurrently.
+
+The runner is backend-agnostic: anything implementing `LLMClient` can be
+plugged in. `OpenAIChatClient` talks to an OpenAI-compatible HTTP API over a
+pooled connection (requires httpx) and `MockLLMClient` answers locally for
+tests and dry runs. Responses are stored in a content-addressed cache keyed
+on (policy text hash, prompt hash, model), so reruns only pay for policies
+or prompts that changed.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from pathlib import Path
+
+from .privacy_policy_analyzer import LLM_QUESTIONS
+from .instrumentation import instrumented
+from .paths import CACHE_DIR
+from .privacy_policy_extractor import create_llm_analysis_prompt
+
+
+DEFAULT_MODEL = "gpt-4o-mini"
+DEFAULT_CACHE_DIR = CACHE_DIR / "llm_responses"
+# Sampling temperature of retries after an invalid response; at temperature 0
+# the model would likely repeat the same answer
+RETRY_TEMPERATURE = 0.7
+
+_LIST_RESPONSE_PATTERN = re.compile(r"\[\s*(\d+(?:\s*,\s*\d+)*)\s*\]")
+
+
+class RetryableLLMError(Exception):
+    """Raised by clients for failures worth retrying (rate limits, 5xx, timeouts)."""
+
+
+class LLMClient:
+    """
+    Interface for LLM backends used by the runner.
+
+    Implementations should reuse their connections across calls and release
+    them in `aclose`.
+    """
+
+    async def complete(self, prompt, policy_text, model, temperature=0.0):
+        """
+        Send one prompt + policy text to the model.
+
+        Args:
+            prompt (str): Analysis instructions
+            policy_text (str): Privacy policy text
+            model (str): Model name
+            temperature (float): Sampling temperature
+
+        Returns:
+            str: Raw model response
+        """
+        raise NotImplementedError
+
+    async def aclose(self):
+        """Release any pooled connections."""
+
+
+class MockLLMClient(LLMClient):
+    """
+    Local backend that answers deterministically from a hash of its input.
+
+    Args:
+        latency (float): Seconds to wait per call
+        failure_rate (float): Fraction of calls raising RetryableLLMError
+        seed (int): Seed for the failure injection
+    """
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    async def complete(self, prompt, policy_text, model, temperature=0.0):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._random.random() < self.failure_rate:
+            raise RetryableLLMError("Injected mock failure")
+        categories = len(re.findall(r"^\d+\.", prompt, flags=re.MULTILINE)) or 5
+        digest = hashlib.sha256(f"{model}\n{prompt}\n{policy_text}".encode()).digest()
+        return "[" + ", ".join(str(byte % 3) for byte in digest[:categories]) + "]"
+
+
+class OpenAIChatClient(LLMClient):
+    """
+    Backend for OpenAI-compatible chat completion APIs.
+
+    A single pooled httpx.AsyncClient is reused for every request.
+
+    Args:
+        base_url (str): API base URL (e.g. "https://api.openai.com/v1")
+        api_key (str, optional): API key (defaults to $OPENAI_API_KEY)
+        max_connections (int): Connection pool size
+        timeout (float): Per-request timeout in seconds
+        transport (httpx.AsyncBaseTransport, optional): Custom transport, e.g. for tests
+    """
+
+    def __init__(self, base_url="https://api.openai.com/v1", api_key=None, max_connections=32, timeout=60.0,
+                 transport=None):
+        import httpx
+
+        self._httpx = httpx
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key or os.environ.get('OPENAI_API_KEY', '')}"},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+            transport=transport
+        )
+
+    async def complete(self, prompt, policy_text, model, temperature=0.0):
+        try:
+            response = await self._client.post("/chat/completions", json={
+                "model": model,
+                "temperature": temperature,
+                "messages": [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": policy_text}
+                ]
+            })
+        except self._httpx.TransportError as e:
+            raise RetryableLLMError(str(e)) from e
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RetryableLLMError(f"HTTP {response.status_code}")
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+class RateLimiter:
+    """
+    Token bucket limiting calls to `rate` per second with bursts of `burst`.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def text_hash(text):
+    """
+    SHA-256 hex digest of a text.
+
+    Args:
+        text (str): Text to hash
+
+    Returns:
+        str: Hex digest
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk store of validated LLM responses.
+
+    Args:
+        cache_dir (str, optional): Directory for cache entries
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+
+    @staticmethod
+    def key(policy_hash, prompt_hash, model):
+        return text_hash(f"{policy_hash}:{prompt_hash}:{model}")
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        path = self._path(key)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())["response"]
+
+    def put(self, key, response, **metadata):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps({"response": response, **metadata}))
+        os.replace(temp_path, path)
+
+
+def validate_list_response(response, n_categories, max_response=2):
+    """
+    Validate a "[0, 1, 2, ...]" style response.
+
+    Args:
+        response (str): Raw model response
+        n_categories (int): Expected number of answers
+        max_response (int): Largest valid answer
+
+    Returns:
+        str: Normalized response such as "[1, 0, 2]", or None if invalid
+    """
+    match = _LIST_RESPONSE_PATTERN.search(response or "")
+    if not match:
+        return None
+    answers = [int(value) for value in re.split(r"\s*,\s*", match.group(1))]
+    if len(answers) != n_categories or any(answer > max_response for answer in answers):
+        return None
+    return "[" + ", ".join(map(str, answers)) + "]"
+
+
+def default_prompts():
+    """
+    Prompts run by default, keyed by output column.
+
+    Returns:
+        dict: {"LLM Q1": prompt, "LLM Q2": prompt, "LLM Q3": prompt}
+    """
+    return {column: create_llm_analysis_prompt(question) for question, (column, _, _) in LLM_QUESTIONS.items()}
+
+
+async def run_policy_analysis(policies, client=None, prompts=None, model=DEFAULT_MODEL, cache=None,
+                              concurrency=16, rate_limit=None, max_retries=5, backoff=1.0,
+                              text_col="PolicyText", dedup_index=None, store=None, prompt_version=None):
+    """
+    Run every prompt over every policy with bounded concurrency.
+
+    Identical (policy text, prompt, model) requests are sent at most once,
+    both within a run and, through the cache, across runs. With a
+    `dedup_index`, near-identical policies also share the answer of their
+    canonical representative. Policies without text are not sent; their
+    LLM_Error is "no policy text".
+
+    Args:
+        policies (pd.DataFrame): Policies with Name, PrivacyPolicyURL and policy text
+        client (LLMClient, optional): Backend to call (defaults to an
+            OpenAIChatClient, closed when the run ends; a client passed in is
+            left open for the caller to close)
+        prompts (dict, optional): Output column -> prompt (defaults to default_prompts())
+        model (str): Model name
+        cache (ResponseCache, optional): Response cache (defaults to data/.cache/llm_responses;
+            pass False to disable caching)
+        concurrency (int): Maximum requests in flight
+        rate_limit (float, optional): Maximum requests started per second
+        max_retries (int): Retries per request after the first attempt; transport,
+            rate limit and server errors back off, invalid responses are
+            resampled at RETRY_TEMPERATURE
+        backoff (float): Base delay in seconds for exponential backoff
+        text_col (str): Column containing policy text
+        dedup_index (PolicyDedupIndex, optional): Near-duplicate index to use and extend
+        store (PolicyAnswerStore, optional): Answer store to upsert the results into
+        prompt_version (str, optional): Prompt version recorded in the store
+            (defaults to a hash of the prompts)
+
+    Returns:
+        pd.DataFrame: Name, PrivacyPolicyURL, one column per prompt and LLM_Error
+    """
+    prompts = prompts or default_prompts()
+    owns_client = client is None
+    if owns_client:
+        client = OpenAIChatClient()
+    if cache is None:
+        cache = ResponseCache()
+    elif cache is False:
+        cache = None
+    arity = {column: len(categories) for column, categories, _ in LLM_QUESTIONS.values()}
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+    stats = {"calls": 0, "cache_hits": 0, "failures": 0, "near_duplicates": 0}
+
+    prompt_hashes = {column: text_hash(prompt) for column, prompt in prompts.items()}
+    texts = policies[text_col].fillna("").astype(str).tolist()
+    # Rows without text would all share the prompt for the empty policy
+    has_text = [bool(text.strip()) for text in texts]
+    policy_hashes = [text_hash(text) for text in texts]
+    if dedup_index is not None:
+        canonical_hashes = [
+            dedup_index.add(text, policy_hash) if present else policy_hash
+            for text, policy_hash, present in zip(texts, policy_hashes, has_text)
+        ]
+        stats["near_duplicates"] = len({
+            policy_hash for policy_hash, canonical in zip(policy_hashes, canonical_hashes) if policy_hash != canonical
+        })
+        policy_hashes = canonical_hashes
+
+    # One job per distinct (policy, prompt) pair; rows sharing it reuse the answer
+    jobs = {}
+    for row, policy_hash in enumerate(policy_hashes):
+        if not has_text[row]:
+            continue
+        for column in prompts:
+            key = ResponseCache.key(policy_hash, prompt_hashes[column], model)
+            jobs.setdefault(key, (row, column, policy_hash))
+    results = {}
+
+    async def call_with_retries(key, row, column, policy_hash):
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                stats["cache_hits"] += 1
+                return cached
+        last_error, temperature = None, 0.0
+        for attempt in range(max_retries + 1):
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                stats["calls"] += 1
+                raw = await client.complete(prompts[column], texts[row], model, temperature=temperature)
+            except RetryableLLMError as e:
+                last_error = e
+                if attempt < max_retries:
+                    await asyncio.sleep(min(60.0, backoff * 2 ** attempt) * (0.5 + random.random()))
+                continue
+            response = validate_list_response(raw, arity.get(column, 5))
+            if response is not None:
+                if cache is not None:
+                    cache.put(key, response, model=model, policy_hash=policy_hash,
+                              prompt_hash=prompt_hashes[column])
+                return response
+            last_error, temperature = ValueError(f"Invalid response: {raw!r}"), RETRY_TEMPERATURE
+        raise last_error
+
+    queue = asyncio.Queue()
+    for key, job in jobs.items():
+        queue.put_nowait((key, job))
+
+    async def worker():
+        while True:
+            try:
+                key, job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                results[key] = await call_with_retries(key, *job)
+            except Exception as e:
+                stats["failures"] += 1
+                results[key] = e
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    output = policies[["Name", "PrivacyPolicyURL"]].copy()
+    errors = [[] if present else ["no policy text"] for present in has_text]
+    for column in prompts:
+        answers = []
+        for row, policy_hash in enumerate(policy_hashes):
+            if not has_text[row]:
+                answers.append(None)
+                continue
+            result = results[ResponseCache.key(policy_hash, prompt_hashes[column], model)]
+            if isinstance(result, Exception):
+                errors[row].append(f"{column}: {result}")
+                answers.append(None)
+            else:
+                answers.append(result)
+        output[column] = answers
+    output["LLM_Error"] = ["; ".join(row_errors) or None for row_errors in errors]
+    if store is not None:
+        prompt_version = prompt_version or text_hash("\n".join(prompt_hashes[column] for column in sorted(prompts)))[:12]
+        store.upsert(output, model, prompt_version)
+
+    print(f"Analyzed {len(output)} policies: {stats['calls']} model calls, "
+          f"{stats['cache_hits']} cache hits, {stats['failures']} failures"
+          + (f", {stats['near_duplicates']} near-duplicate policies reused" if dedup_index is not None else ""))
+    return output
+
+
+@instrumented()
+def analyze_policies(policies, client=None, **kwargs):
+    """
+    Synchronous wrapper around run_policy_analysis (see its arguments).
+
+    Returns:
+        pd.DataFrame: Analysis results
+    """
+    return asyncio.run(run_policy_analysis(policies, client, **kwargs))
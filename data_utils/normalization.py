@@ -0,0 +1,116 @@
+"""
+Name and URL Normalization Utilities
+====================================
+
+Shared normalization kernels for company names and privacy policy URLs.
+Batch functions factorize their input first, so each distinct raw value is
+normalized once no matter how often it repeats in a registry.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+LEGAL_SUFFIX_PATTERN = re.compile(r'\b(INC|LLC|CORPORATION)\b')
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=65536, typed=True)
+def normalize_company_name(name):
+    """
+    Normalize a single company name for merging across registries.
+
+    Args:
+        name (str): Raw company name
+
+    Returns:
+        str: Uppercased name without legal suffixes, punctuation or
+            repeated whitespace ("" for non-string input)
+    """
+    if not isinstance(name, str):
+        return ""
+    name = name.upper()
+    name = LEGAL_SUFFIX_PATTERN.sub('', name)
+    name = PUNCTUATION_PATTERN.sub('', name)
+    return WHITESPACE_PATTERN.sub(' ', name).strip()
+
+
+@lru_cache(maxsize=65536, typed=True)
+def compact_lowercase(value):
+    """
+    Lowercase a value and remove all whitespace.
+
+    Args:
+        value: Raw name or URL
+
+    Returns:
+        str: Compacted string ("" for missing values)
+    """
+    if pd.isna(value):
+        return ""
+    return WHITESPACE_PATTERN.sub('', str(value).lower())
+
+
+def _map_unique(values, kernel):
+    """
+    Apply a batch kernel to the distinct values of `values` and broadcast
+    the results back to every row.
+    """
+    values = pd.Series(values)
+    keys = values
+    if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) != "string":
+        # 1, 1.0 and True hash equal, so key mixed columns on type and text
+        keys = (values.map(lambda value: type(value).__name__) + "\0" + values.astype(str)).where(values.notna())
+    codes, _ = pd.factorize(keys, use_na_sentinel=True)
+    _, first_rows = np.unique(codes[codes >= 0], return_index=True)
+    uniques = values.to_numpy(dtype=object)[codes >= 0][first_rows]
+    normalized = np.append(kernel(pd.Series(uniques, dtype=object)).to_numpy(dtype=object), "")
+    return pd.Series(normalized[codes], index=values.index, name=values.name, dtype=object)
+
+
+def _normalize_company_name_kernel(names):
+    is_text = names.map(lambda name: isinstance(name, str)).astype(bool)
+    if not is_text.any():
+        return pd.Series("", index=names.index, dtype=object)
+    normalized = (
+        names.where(is_text).str.upper()
+        .str.replace(LEGAL_SUFFIX_PATTERN, '', regex=True)
+        .str.replace(PUNCTUATION_PATTERN, '', regex=True)
+        .str.replace(WHITESPACE_PATTERN, ' ', regex=True)
+        .str.strip()
+    )
+    return normalized.where(is_text, "")
+
+
+def _compact_lowercase_kernel(values):
+    return values.map(str).str.lower().str.replace(WHITESPACE_PATTERN, '', regex=True)
+
+
+def normalize_company_names(names):
+    """
+    Vectorized equivalent of applying normalize_company_name to every row.
+
+    Args:
+        names (pd.Series): Raw company names
+
+    Returns:
+        pd.Series: Normalized names, aligned with the input index
+    """
+    return _map_unique(names, _normalize_company_name_kernel)
+
+
+def compact_lowercase_values(values):
+    """
+    Vectorized equivalent of applying compact_lowercase to every row.
+
+    Args:
+        values (pd.Series): Raw names or URLs
+
+    Returns:
+        pd.Series: Compacted strings, aligned with the input index
+    """
+    return _map_unique(values, _compact_lowercase_kernel)
@@ -0,0 +1,24 @@
+"""
+Project Paths
+=============
+
+Locations of the project's data files, resolved from the repository root so
+that scripts behave the same from any working directory.
+"""
+
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = PROJECT_ROOT / "data/.cache"
+
+RAW_REGISTRY = PROJECT_ROOT / "data/raw_data/Data_Broker_Full_Registry_2025.xlsx"
+BROKERS_CSV = PROJECT_ROOT / "data/cleaned_data/uq-data-brokers.csv"
+POLICY_DIR = PROJECT_ROOT / "data/cleaned_data/privacy_policies"
+POLICIES_CSV = POLICY_DIR / "privacy_policies_cleaned.csv"
+UNIQUE_POLICIES_CSV = POLICY_DIR / "privacy_policies_unique_shuffled.csv"
+POLICY_SAMPLE_CSV = POLICY_DIR / "privacy_policies_sample.csv"
+LLM_ANALYSIS_CSV = POLICY_DIR / "llm_analysis.csv"
+LLM_RESULTS_CSV = PROJECT_ROOT / "data/raw_data/privacy_policies/privacy-policy-scraping-final.csv"
+POLICY_SUMMARY_CSV = POLICY_DIR / "policy_summary.csv"
+SURVEY_CSV = PROJECT_ROOT / "data/raw_data/survey/survey_results.csv"
@@ -0,0 +1,343 @@
+"""
+Pipeline Orchestrator
+=====================
+
+Declares the project's processing steps (clean, merge, policy prep, fetch,
+LLM analysis, summary, charts) as stages with input and output files, and
+runs them as a dependency graph: a stage depends on every stage producing
+one of its inputs.
+
+A stage is rerun only when it is stale, i.e. when the content hash of an
+input changed, an output is missing or was modified since the stage last
+wrote it, or the stage has never run. Stages whose dependencies are done
+run concurrently in a thread pool. Hashes and per-stage timings are kept in
+data/.cache/pipeline_state.json, which is rewritten as each stage finishes,
+so an interrupted run does not redo the stages it completed.
+
+The fetch and LLM stages need network access (and an API key for the LLM
+stage), so they are only included with `--network`. With them, the summary
+and charts are built from the LLM stage's output instead of the committed
+LLM results.
+
+Usage:
+    python -m data_utils.pipeline                  # run every stale stage
+    python -m data_utils.pipeline summarize charts # run targets and their dependencies
+    python -m data_utils.pipeline --list
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from .columnar_cache import file_hash
+from .instrumentation import span
+from .paths import (
+    BROKERS_CSV, CACHE_DIR, LLM_ANALYSIS_CSV, LLM_RESULTS_CSV, POLICIES_CSV, POLICY_DIR, POLICY_SUMMARY_CSV,
+    RAW_REGISTRY, SURVEY_CSV, UNIQUE_POLICIES_CSV
+)
+
+
+DEFAULT_STATE_PATH = CACHE_DIR / "pipeline_state.json"
+CLEANED_REGISTRY = CACHE_DIR / "pipeline/registry_cleaned.pkl"
+FETCH_OUTCOMES_CSV = CACHE_DIR / "pipeline/policy_fetch.csv"
+
+
+class Stage:
+    """
+    One pipeline step.
+
+    Args:
+        name (str): Stage name
+        run (callable): Function producing the outputs (called without arguments)
+        inputs (list): Files read by the stage
+        outputs (list): Files written by the stage
+    """
+
+    def __init__(self, name, run, inputs, outputs):
+        self.name = name
+        self.run = run
+        self.inputs = [Path(path) for path in inputs]
+        self.outputs = [Path(path) for path in outputs]
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+def stage_dependencies(stages):
+    """
+    Derive the dependency graph from stage inputs and outputs.
+
+    Args:
+        stages (list): Stage objects
+
+    Returns:
+        dict: Stage name -> set of names of the stages it depends on
+    """
+    producers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producers:
+                raise ValueError(f"{output} is produced by both {producers[output]} and {stage.name}")
+            producers[output] = stage.name
+    return {
+        stage.name: {producers[path] for path in stage.inputs if path in producers and producers[path] != stage.name}
+        for stage in stages
+    }
+
+
+def _hashes(paths):
+    return {str(path): file_hash(path) if path.exists() else None for path in paths}
+
+
+def _is_stale(stage, record):
+    if record is None:
+        return True
+    if any(not path.exists() for path in stage.outputs):
+        return True
+    return record.get("inputs") != _hashes(stage.inputs) or record.get("outputs") != _hashes(stage.outputs)
+
+
+def _stages_needed(stages, dependencies, targets):
+    needed, pending = set(), list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(dependencies[name])
+    return [stage for stage in stages if stage.name in needed]
+
+
+def _save_state(state_path, state):
+    """Write the state file atomically, so an interrupted write keeps the previous one."""
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = state_path.with_name(state_path.name + ".tmp")
+    temp_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+    os.replace(temp_path, state_path)
+
+
+def run_pipeline(stages=None, targets=None, force=False, max_workers=4, state_path=None):
+    """
+    Run stale stages in dependency order, independent branches concurrently.
+
+    Args:
+        stages (list, optional): Stage objects (defaults to default_stages())
+        targets (list, optional): Stage names to bring up to date, with their
+            dependencies (defaults to all stages)
+        force (bool): Rerun the selected stages even if they are up to date
+        max_workers (int): Maximum stages running at once
+        state_path (str, optional): State file (defaults to data/.cache/pipeline_state.json)
+
+    Returns:
+        pd.DataFrame: One row per stage with status, start offset and seconds
+    """
+    stages = stages if stages is not None else default_stages()
+    dependencies = stage_dependencies(stages)
+    by_name = {stage.name: stage for stage in stages}
+    unknown = [name for name in targets or [] if name not in by_name]
+    if unknown:
+        raise KeyError(f"Unknown stages: {', '.join(unknown)}")
+    selected = _stages_needed(stages, dependencies, targets) if targets else list(stages)
+    selected_names = {stage.name for stage in selected}
+
+    state_path = Path(state_path) if state_path else DEFAULT_STATE_PATH
+    state = json.loads(state_path.read_text()) if state_path.exists() else {}
+
+    results = {}
+    remaining = {stage.name for stage in selected}
+    running = {}
+    pipeline_start = time.perf_counter()
+
+    def execute(stage):
+        start = time.perf_counter()
+        if not force and not _is_stale(stage, state.get(stage.name)):
+            return "skipped", start, time.perf_counter() - start
+        for output in stage.outputs:
+            output.parent.mkdir(parents=True, exist_ok=True)
+        with span(f"pipeline.{stage.name}"):
+            stage.run()
+        missing = [str(path) for path in stage.outputs if not path.exists()]
+        if missing:
+            raise RuntimeError(f"Stage {stage.name} did not write {', '.join(missing)}")
+        return "ran", start, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while remaining or running:
+            # Repeat until no stage changes state, so blocked stages propagate
+            changed = True
+            while changed:
+                changed = False
+                for name in sorted(remaining):
+                    blockers = dependencies[name] & selected_names
+                    if any(results.get(dep, {}).get("status") in ("failed", "blocked") for dep in blockers):
+                        results[name] = {"status": "blocked", "start": None, "seconds": None}
+                    elif all(dep in results for dep in blockers):
+                        running[executor.submit(execute, by_name[name])] = name
+                    else:
+                        continue
+                    remaining.discard(name)
+                    changed = True
+            if not running:
+                if remaining:
+                    raise ValueError(f"Dependency cycle between stages: {', '.join(sorted(remaining))}")
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                stage = by_name[name]
+                try:
+                    status, start, seconds = future.result()
+                except Exception as e:
+                    print(f"Stage {name} failed: {e}")
+                    results[name] = {"status": "failed", "start": None, "seconds": None, "error": str(e)}
+                    if state.pop(name, None) is not None:
+                        _save_state(state_path, state)
+                    continue
+                results[name] = {"status": status, "start": start - pipeline_start, "seconds": seconds}
+                if status == "ran":
+                    state[name] = {
+                        "inputs": _hashes(stage.inputs),
+                        "outputs": _hashes(stage.outputs),
+                        "seconds": seconds,
+                        "finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
+                    }
+                    _save_state(state_path, state)
+
+    summary = pd.DataFrame([{"stage": stage.name, **results[stage.name]} for stage in selected])
+    print(f"Pipeline finished in {time.perf_counter() - pipeline_start:.2f}s: " +
+          ", ".join(f"{count} {status}" for status, count in summary["status"].value_counts().items()))
+    return summary
+
+
+# Stage definitions
+# =================
+
+def _clean_registry():
+    from .data_cleaner import initial_clean_and_one_hot, read_registry
+    initial_clean_and_one_hot(read_registry(RAW_REGISTRY)).to_pickle(CLEANED_REGISTRY)
+
+
+def _merge_registry():
+    from .data_cleaner import merge_by_normalized_name
+    result = merge_by_normalized_name(pd.read_pickle(CLEANED_REGISTRY))
+    result.to_csv(BROKERS_CSV, index=False)
+    print(f"File saved to {BROKERS_CSV}")
+
+
+def _prepare_policies():
+    from .privacy_policy_extractor import prepare_privacy_policy_dataset
+    prepare_privacy_policy_dataset(BROKERS_CSV, POLICY_DIR)
+
+
+def _fetch_policies():
+    from .policy_fetcher import fetch_policies
+    policies = pd.read_csv(UNIQUE_POLICIES_CSV)
+    fetch_policies(policies["PrivacyPolicyURL_Clean"], revalidate_after=7 * 24 * 3600).to_csv(
+        FETCH_OUTCOMES_CSV, index=False
+    )
+
+
+def _analyze_policies():
+    from .llm_runner import analyze_policies
+    from .policy_dedup import PolicyDedupIndex
+    from .policy_fetcher import attach_policy_text
+    from .policy_store import PolicyAnswerStore
+    policies = attach_policy_text(pd.read_csv(UNIQUE_POLICIES_CSV)).dropna(subset=["PolicyText"])
+    dedup_index = PolicyDedupIndex.load()
+    analysis = analyze_policies(policies, dedup_index=dedup_index, store=PolicyAnswerStore())
+    _with_committed_answers(analysis).to_csv(LLM_ANALYSIS_CSV, index=False)
+    dedup_index.save()
+
+
+def _with_committed_answers(analysis):
+    """
+    Complete the LLM stage's answers with the committed LLM results.
+
+    Answers the run did not produce (failed calls or questions missing from
+    custom prompts) are taken from LLM_RESULTS_CSV, matched on
+    PrivacyPolicyURL; policies missing from either file are kept.
+
+    Args:
+        analysis (pd.DataFrame): Output of analyze_policies
+
+    Returns:
+        pd.DataFrame: Name, PrivacyPolicyURL, the "LLM Q*" columns and LLM_Error
+    """
+    from .privacy_policy_analyzer import LLM_QUESTIONS
+    committed = pd.read_csv(LLM_RESULTS_CSV).drop_duplicates("PrivacyPolicyURL").set_index("PrivacyPolicyURL")
+    fresh = analysis.drop_duplicates("PrivacyPolicyURL").set_index("PrivacyPolicyURL")
+    merged = fresh.drop(columns="Name").combine_first(committed)
+    merged["Name"] = merged["Name"].fillna(fresh["Name"])
+    question_cols = [column for column, _, _ in LLM_QUESTIONS.values()]
+    return merged.reset_index().reindex(columns=["Name", "PrivacyPolicyURL", *question_cols, "LLM_Error"])
+
+
+def _summarize_policies(llm_results=LLM_RESULTS_CSV):
+    from .privacy_policy_analyzer import prepare_privacy_policy_summary
+    summary = prepare_privacy_policy_summary(pd.read_csv(llm_results), records=False)
+    summary["summary_table"].to_csv(POLICY_SUMMARY_CSV, index=False)
+
+
+def _build_charts(llm_results=LLM_RESULTS_CSV):
+    from .figures import build_figures
+    build_figures(llm_results=llm_results)
+
+
+def default_stages(include_network=False):
+    """
+    The project's stages.
+
+    Args:
+        include_network (bool): Include the fetch and LLM analysis stages; the
+            summary and charts then read the LLM stage's output
+
+    Returns:
+        list: Stage objects
+    """
+    from .figures import FIGURES
+
+    llm_results = LLM_ANALYSIS_CSV if include_network else LLM_RESULTS_CSV
+    stages = [
+        Stage("clean", _clean_registry, [RAW_REGISTRY], [CLEANED_REGISTRY]),
+        Stage("merge", _merge_registry, [CLEANED_REGISTRY], [BROKERS_CSV]),
+        Stage("policy-prep", _prepare_policies, [BROKERS_CSV], [POLICIES_CSV, UNIQUE_POLICIES_CSV]),
+        Stage("summarize", partial(_summarize_policies, llm_results), [llm_results], [POLICY_SUMMARY_CSV]),
+        Stage("charts", partial(_build_charts, llm_results), [BROKERS_CSV, llm_results, SURVEY_CSV],
+              [figure["output"] for figure in FIGURES.values()])
+    ]
+    if include_network:
+        stages[3:3] = [
+            Stage("fetch", _fetch_policies, [UNIQUE_POLICIES_CSV], [FETCH_OUTCOMES_CSV]),
+            Stage("llm", _analyze_policies, [UNIQUE_POLICIES_CSV, FETCH_OUTCOMES_CSV, LLM_RESULTS_CSV],
+                  [LLM_ANALYSIS_CSV])
+        ]
+    return stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the data broker analysis pipeline.")
+    parser.add_argument("targets", nargs="*", help="Stages to bring up to date (default: all)")
+    parser.add_argument("--force", action="store_true", help="Rerun stages even if up to date")
+    parser.add_argument("--jobs", type=int, default=4, help="Maximum stages running at once")
+    parser.add_argument("--network", action="store_true", help="Include the fetch and LLM stages")
+    parser.add_argument("--list", action="store_true", help="List stages and their dependencies and exit")
+    args = parser.parse_args(argv)
+
+    stages = default_stages(include_network=args.network)
+    if args.list:
+        dependencies = stage_dependencies(stages)
+        for stage in stages:
+            print(f"{stage.name:12s} <- {', '.join(sorted(dependencies[stage.name])) or '(inputs only)'}")
+        return
+    print(run_pipeline(stages, args.targets or None, force=args.force, max_workers=args.jobs).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Policy Near-Duplicate Detection
+===============================
+
+MinHash/LSH index over fetched privacy policy text. Many brokers publish the
+same boilerplate or white-label policy under different URLs; the index maps
+each policy to a canonical representative so byte-identical and
+near-identical texts share one LLM analysis.
+
+Policies are identified by the SHA-256 of their text, so a policy that did
+not change between crawls maps to the same entry (and the same cached LLM
+response) without being compared again.
+"""
+
+import hashlib
+import pickle
+import re
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from .paths import CACHE_DIR
+
+
+DEFAULT_INDEX_PATH = CACHE_DIR / "policy_dedup.pkl"
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def policy_text_hash(text):
+    """
+    SHA-256 hex digest identifying a policy text.
+
+    Args:
+        text (str): Policy text
+
+    Returns:
+        str: Hex digest
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def shingle_hashes(text, shingle_size=5):
+    """
+    Hash the word shingles of a text.
+
+    Args:
+        text (str): Policy text
+        shingle_size (int): Words per shingle
+
+    Returns:
+        np.ndarray: Unique 32-bit shingle hashes (as uint64)
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    return np.unique(np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64))
+
+
+class PolicyDedupIndex:
+    """
+    MinHash signatures bucketed by LSH bands, keyed by policy text hash.
+
+    With the defaults (128 permutations in 16 bands of 8) pairs above ~0.7
+    Jaccard similarity almost always share a bucket; candidates are then
+    confirmed against `threshold` using the full signatures.
+
+    Args:
+        threshold (float): Estimated Jaccard similarity for a near-duplicate
+        num_perm (int): MinHash permutations
+        bands (int): LSH bands (must divide num_perm)
+        shingle_size (int): Words per shingle
+        seed (int): Seed for the permutations
+    """
+
+    def __init__(self, threshold=0.9, num_perm=128, bands=16, shingle_size=5, seed=1):
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self.signatures = {}
+        self.buckets = [dict() for _ in range(bands)]
+        self.canonical = {}
+
+    def signature(self, text):
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text (str): Policy text
+
+        Returns:
+            np.ndarray: uint32 signature of length num_perm
+        """
+        hashes = shingle_hashes(text, self.shingle_size)
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, text, text_hash=None):
+        """
+        Register a policy and return the hash of its canonical representative.
+
+        Exact repeats and already-indexed texts are resolved from the hash
+        alone; new texts are compared against LSH candidates and become a new
+        canonical policy if none is similar enough.
+
+        Args:
+            text (str): Policy text
+            text_hash (str, optional): Precomputed policy_text_hash(text)
+
+        Returns:
+            str: Text hash of the canonical policy
+        """
+        text_hash = text_hash or policy_text_hash(text)
+        if text_hash in self.canonical:
+            return self.canonical[text_hash]
+
+        signature = self.signature(text)
+        band_keys = self._band_keys(signature)
+        candidates = {candidate for band, key in enumerate(band_keys) for candidate in self.buckets[band].get(key, ())}
+        best, best_similarity = None, self.threshold
+        for candidate in candidates:
+            similarity = float(np.mean(self.signatures[candidate] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+
+        if best is not None:
+            self.canonical[text_hash] = best
+            return best
+
+        # Only canonical policies are bucketed, so near-duplicates cannot chain
+        self.signatures[text_hash] = signature
+        for band, key in enumerate(band_keys):
+            self.buckets[band].setdefault(key, []).append(text_hash)
+        self.canonical[text_hash] = text_hash
+        return text_hash
+
+    def save(self, path=None):
+        """
+        Persist the index with pickle.
+
+        Args:
+            path (str, optional): Destination file (defaults to data/.cache/policy_dedup.pkl)
+        """
+        path = Path(path) if path else DEFAULT_INDEX_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as handle:
+            pickle.dump(self, handle)
+
+    @classmethod
+    def load(cls, path=None, **options):
+        """
+        Load a persisted index, or create an empty one if there is none yet.
+
+        Args:
+            path (str, optional): File written by save() (defaults to data/.cache/policy_dedup.pkl)
+            **options: PolicyDedupIndex arguments for a new index
+
+        Returns:
+            PolicyDedupIndex: The index
+        """
+        path = Path(path) if path else DEFAULT_INDEX_PATH
+        if not path.exists():
+            return cls(**options)
+        with open(path, "rb") as handle:
+            return pickle.load(handle)
+
+
+def assign_canonical_policies(policies, index=None, text_col="PolicyText"):
+    """
+    Add PolicyTextHash and CanonicalPolicyHash columns to a policy frame.
+
+    Args:
+        policies (pd.DataFrame): Policies with fetched text
+        index (PolicyDedupIndex, optional): Index to use and extend
+        text_col (str): Column containing policy text
+
+    Returns:
+        pd.DataFrame: Copy of the policies with the hash columns (None where
+            the text is missing)
+    """
+    index = index or PolicyDedupIndex()
+    policies = policies.copy()
+    text_hashes, canonical_hashes = [], []
+    for text in policies[text_col]:
+        if isinstance(text, str) and text:
+            text_hash = policy_text_hash(text)
+            text_hashes.append(text_hash)
+            canonical_hashes.append(index.add(text, text_hash))
+        else:
+            text_hashes.append(None)
+            canonical_hashes.append(None)
+    policies["PolicyTextHash"] = text_hashes
+    policies["CanonicalPolicyHash"] = canonical_hashes
+    return policies
@@ -0,0 +1,319 @@
+"""
+Privacy Policy Fetcher
+======================
+
+Downloads the privacy policies listed in `PrivacyPolicyURL_Clean` and stores
+their extracted text for LLM analysis.
+
+Requests run concurrently over a pooled httpx client, with a per-host limit
+on parallel requests and a minimum delay between requests to the same host.
+Every fetched URL gets a small JSON record (ETag, Last-Modified, status,
+text hash) and a gzip-compressed text file in the store directory, both
+written atomically. Reruns resume where a crashed run stopped, and known URLs
+are revalidated with conditional requests so unchanged policies cost a 304.
+If revalidating a previously fetched URL fails, its record keeps the last
+good text hash and validators, with the error (and `failed_at`) next to them.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from .instrumentation import instrumented
+from .paths import CACHE_DIR
+
+
+DEFAULT_STORE_DIR = CACHE_DIR / "policies"
+USER_AGENT = "data-broker-analysis policy fetcher (research; +https://mjayjoh.github.io/data-broker-analysis/)"
+
+_BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "tr", "table", "section", "article",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "footer", "blockquote"
+}
+_SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Collects visible text, breaking lines at block-level elements.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(html):
+    """
+    Extract readable text from an HTML document.
+
+    Args:
+        html (str): Raw HTML
+
+    Returns:
+        str: Visible text with one block per line
+    """
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    lines = (re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in "".join(parser.parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def url_key(url):
+    """
+    Stable file key for a URL.
+
+    Args:
+        url (str): Policy URL
+
+    Returns:
+        str: Hex digest of the URL
+    """
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class PolicyStore:
+    """
+    On-disk store of fetch records and compressed policy text.
+
+    Args:
+        store_dir (str, optional): Directory for the store
+    """
+
+    def __init__(self, store_dir=None):
+        self.store_dir = Path(store_dir) if store_dir else DEFAULT_STORE_DIR
+
+    def _base(self, url):
+        key = url_key(url)
+        return self.store_dir / key[:2] / key
+
+    def record(self, url):
+        path = self._base(url).with_suffix(".json")
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def text(self, url):
+        path = self._base(url).with_suffix(".txt.gz")
+        if not path.exists():
+            return None
+        return gzip.decompress(path.read_bytes()).decode("utf-8")
+
+    def save(self, url, record, text=None):
+        base = self._base(url)
+        base.parent.mkdir(parents=True, exist_ok=True)
+        suffix = f".{os.getpid()}.tmp"
+        if text is not None:
+            text_path = base.with_suffix(".txt.gz")
+            temp_path = text_path.with_name(text_path.name + suffix)
+            temp_path.write_bytes(gzip.compress(text.encode("utf-8")))
+            os.replace(temp_path, text_path)
+        # The record is written last, so a record always points at complete text
+        record_path = base.with_suffix(".json")
+        temp_path = record_path.with_name(record_path.name + suffix)
+        temp_path.write_text(json.dumps(record))
+        os.replace(temp_path, record_path)
+
+
+class HostThrottle:
+    """
+    Per-host politeness: at most `max_per_host` requests in flight and at
+    least `min_delay` seconds between request starts to the same host.
+    """
+
+    def __init__(self, max_per_host=2, min_delay=1.0):
+        self.max_per_host = max_per_host
+        self.min_delay = min_delay
+        self._semaphores = {}
+        self._locks = {}
+        self._last_start = {}
+
+    async def __call__(self, host, request):
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with semaphore:
+            async with lock:
+                wait = self._last_start.get(host, 0) + self.min_delay - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._last_start[host] = time.monotonic()
+            return await request()
+
+
+async def fetch_policies_async(urls, store=None, concurrency=32, max_per_host=2, min_delay=1.0,
+                               revalidate_after=None, timeout=30.0, max_retries=2, transport=None):
+    """
+    Fetch and store the text of many policy URLs.
+
+    URLs already in the store are skipped when their record is younger than
+    `revalidate_after` seconds (or always, if it is None) and conditionally
+    revalidated otherwise.
+
+    Args:
+        urls (iterable): Policy URLs
+        store (PolicyStore, optional): Where to keep records and text
+        concurrency (int): Maximum requests in flight overall
+        max_per_host (int): Maximum requests in flight per host
+        min_delay (float): Minimum seconds between requests to one host
+        revalidate_after (float, optional): Record age that triggers revalidation
+        timeout (float): Per-request timeout in seconds
+        max_retries (int): Retries for connection errors, 429 and 5xx responses
+        transport (httpx.AsyncBaseTransport, optional): Custom transport, e.g. for tests
+
+    Returns:
+        pd.DataFrame: One row per URL with status, outcome and text hash
+    """
+    import httpx
+
+    store = store or PolicyStore()
+    throttle = HostThrottle(max_per_host, min_delay)
+    urls = list(dict.fromkeys(url for url in urls if isinstance(url, str) and url))
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    outcomes = {}
+
+    async def fetch_one(client, url):
+        previous = store.record(url)
+        now = datetime.now(timezone.utc)
+        if previous is not None and previous.get("text_sha256"):
+            if revalidate_after is None:
+                return {**previous, "outcome": "cached"}
+            fetched_at = datetime.fromisoformat(previous["fetched_at"])
+            if (now - fetched_at).total_seconds() < revalidate_after:
+                return {**previous, "outcome": "cached"}
+
+        headers = {}
+        if previous is not None:
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+
+        def failed(status, error, record=None):
+            if previous is not None and previous.get("text_sha256"):
+                # Keep the last good text and validators; fetched_at is kept
+                # too, so the URL is revalidated again on the next run
+                record = {**previous, "status": status, "error": error, "failed_at": now.isoformat()}
+            else:
+                record = {**(record or {"url": url, "fetched_at": now.isoformat()}),
+                          "status": status, "error": error, "text_sha256": None}
+            store.save(url, record)
+            return {**record, "outcome": "failed"}
+
+        target = url if "://" in url else "https://" + url
+        host = urlsplit(target).hostname or ""
+        for attempt in range(max_retries + 1):
+            try:
+                response = await throttle(host, lambda: client.get(target, headers=headers))
+            except httpx.HTTPError as e:
+                error = f"{type(e).__name__}: {e}"
+                response = None
+            else:
+                if response.status_code != 429 and response.status_code < 500:
+                    break
+                error = f"HTTP {response.status_code}"
+            if attempt < max_retries:
+                await asyncio.sleep(min_delay * 2 ** attempt)
+        else:
+            return failed(response.status_code if response else None, error)
+
+        record = {
+            "url": url,
+            "final_url": str(response.url),
+            "status": response.status_code,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": now.isoformat(),
+            "error": None
+        }
+        if response.status_code == 304 and previous is not None:
+            record = {**{k: v for k, v in previous.items() if k != "failed_at"},
+                      **{k: v for k, v in record.items() if v is not None}, "status": 304, "error": None}
+            store.save(url, record)
+            return {**record, "outcome": "not_modified"}
+        if response.status_code >= 400:
+            return failed(response.status_code, f"HTTP {response.status_code}", record)
+
+        content_type = response.headers.get("Content-Type", "")
+        text = html_to_text(response.text) if "html" in content_type or not content_type else response.text
+        record["text_sha256"] = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        changed = previous is None or previous.get("text_sha256") != record["text_sha256"]
+        store.save(url, record, text if changed else None)
+        return {**record, "outcome": "fetched" if changed else "unchanged"}
+
+    async def worker(client):
+        while True:
+            try:
+                url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            outcomes[url] = await fetch_one(client, url)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(follow_redirects=True, timeout=timeout, limits=limits,
+                                 headers={"User-Agent": USER_AGENT}, transport=transport) as client:
+        await asyncio.gather(*(worker(client) for _ in range(max(1, concurrency))))
+
+    result = pd.DataFrame([outcomes[url] for url in urls])
+    if len(result):
+        print(f"Fetched {len(result)} policies: " +
+              ", ".join(f"{count} {outcome}" for outcome, count in result["outcome"].value_counts().items()))
+    return result
+
+
+@instrumented()
+def fetch_policies(urls, **kwargs):
+    """
+    Synchronous wrapper around fetch_policies_async (see its arguments).
+
+    Returns:
+        pd.DataFrame: Fetch outcomes
+    """
+    return asyncio.run(fetch_policies_async(urls, **kwargs))
+
+
+def attach_policy_text(policies, store=None, url_col="PrivacyPolicyURL_Clean"):
+    """
+    Add a PolicyText column with the stored text of each policy URL.
+
+    Args:
+        policies (pd.DataFrame): Policies, e.g. privacy_policies_unique_shuffled.csv
+        store (PolicyStore, optional): Store written by fetch_policies
+        url_col (str): Column containing policy URLs
+
+    Returns:
+        pd.DataFrame: Copy of the policies with PolicyText (None if not fetched)
+    """
+    store = store or PolicyStore()
+    policies = policies.copy()
+    policies["PolicyText"] = [store.text(url) if isinstance(url, str) else None for url in policies[url_col]]
+    return policies
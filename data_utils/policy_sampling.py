@@ -0,0 +1,340 @@
+"""
+Policy Annotation Sampling
+==========================
+
+Budget-aware stratified sample of the unique privacy policies for LLM
+annotation, and stratified estimates (with standard errors) of the Q1-Q3
+answer percentages from the annotated part of the sample.
+
+Policies are stratified by the broker's attributes in the merged registry:
+- registry: the registries listing the broker (RegistrySource_* columns),
+- collects: how many Collects* data types the broker reports collecting
+  ("0", "1-2" or "3+"),
+- domain: top-level domain of the policy URL's host only ("com", "net",
+  "io", ...), not the site: every .com policy shares one domain key.
+Strata with fewer than `min_stratum` policies are pooled by replacing their
+most specific key (domain, then collects, then registry) with "*".
+
+Each policy gets a priority from a seeded hash of its cleaned URL. Within a
+stratum policies are taken in priority order, which is a simple random
+sample that does not depend on row order and grows by appending when the
+budget is raised. The sampler is streaming: for every stratum it only keeps
+the lowest-priority policies that the whole budget could pay for (a bottom-k
+reservoir), so policies can be added chunk by chunk.
+
+The budget is in LLM calls (each policy costing `calls_per_policy`) or, with
+per-policy `costs` such as estimated tokens, in those units. It is allocated
+greedily:
+1. every stratum, largest first, gets up to `min_per_stratum` policies while
+   the budget allows, so each stratum's variance can be estimated;
+2. then the stratum with the least spent per policy in it (spent cost /
+   stratum size) is repeatedly extended by its next policy, skipping strata
+   whose next policy no longer fits, until nothing fits.
+With equal costs step 2 approaches allocation proportional to stratum size,
+except that strata whose minimum already exceeds their share get nothing
+more until the others catch up.
+
+Usage:
+    sample = sample_policies(unique_policies, brokers, budget=200, calls_per_policy=3)
+    estimate_answer_shares(sample, llm_data)
+"""
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import instrumented
+from .normalization import compact_lowercase_values
+
+
+STRATUM_KEYS = ["StratumRegistry", "StratumCollects", "StratumDomain"]
+POOLED = "*"
+
+_HOST_PATTERN = r"^(?:[a-z][a-z0-9+.-]*://)?(?:www\.)?([^/:?#\s]+)"
+
+
+def policy_strata(policies, brokers):
+    """
+    Stratum keys of each policy from its broker's registry attributes.
+
+    Args:
+        policies (pd.DataFrame): Policies with Name and PrivacyPolicyURL
+        brokers (pd.DataFrame): Merged registry (uq-data-brokers.csv)
+
+    Returns:
+        pd.DataFrame: StratumRegistry, StratumCollects and StratumDomain,
+            indexed like `policies` ("unknown" for brokers not in the registry)
+    """
+    brokers = brokers.drop_duplicates(subset="Name").set_index("Name")
+    registry_cols = sorted(col for col in brokers.columns if col.startswith("RegistrySource_"))
+    collects_cols = [col for col in brokers.columns if col.startswith("Collects")]
+
+    listed = brokers[registry_cols].fillna(False).astype(bool).to_numpy()
+    names = np.array([col.removeprefix("RegistrySource_") for col in registry_cols], dtype=object)
+    registry = pd.Series(["+".join(names[row]) or "none" for row in listed], index=brokers.index)
+    collected = (brokers[collects_cols].apply(pd.to_numeric, errors="coerce") == 1).sum(axis=1)
+    collects = pd.cut(collected, [-1, 0, 2, np.inf], labels=["0", "1-2", "3+"]).astype(str)
+
+    hosts = policies["PrivacyPolicyURL"].astype("string").str.strip().str.lower().str.extract(_HOST_PATTERN)[0]
+    domain = hosts.str.rsplit(".", n=1).str[-1].fillna("unknown")
+
+    return pd.DataFrame({
+        "StratumRegistry": registry.reindex(policies["Name"]).fillna("unknown").to_numpy(),
+        "StratumCollects": collects.reindex(policies["Name"]).fillna("unknown").to_numpy(),
+        "StratumDomain": domain.astype(object).to_numpy()
+    }, index=policies.index)
+
+
+def policy_priorities(urls, seed=42):
+    """
+    Uniform [0, 1) priorities from a seeded hash of the cleaned policy URLs.
+
+    Args:
+        urls (pd.Series): Policy URLs
+        seed (int): Sampling seed
+
+    Returns:
+        np.ndarray: float64 priority per URL
+    """
+    cleaned = compact_lowercase_values(urls.astype("string")).fillna("").to_numpy(dtype=object)
+    hashes = pd.util.hash_array(cleaned, hash_key=f"{seed:016d}"[-16:])
+    return (hashes >> np.uint64(11)).astype(np.float64) / 2.0 ** 53
+
+
+class StratifiedPolicySampler:
+    """
+    Streaming stratified sampler over policies (see the module docstring).
+
+    Args:
+        budget (float): Total cost to spend (LLM calls, or the unit of `costs`)
+        calls_per_policy (int): Cost of a policy when no costs are given
+        min_stratum (int): Strata smaller than this are pooled
+        min_per_stratum (int): Policies every stratum gets first, budget permitting
+        seed (int): Sampling seed
+    """
+
+    def __init__(self, budget, calls_per_policy=1, min_stratum=10, min_per_stratum=2, seed=42):
+        if budget <= 0:
+            raise ValueError("budget must be positive")
+        self.budget = budget
+        self.calls_per_policy = calls_per_policy
+        self.min_stratum = min_stratum
+        self.min_per_stratum = min_per_stratum
+        self.seed = seed
+        self._sizes = {}
+        self._reservoirs = {}
+
+    def add(self, policies, costs=None):
+        """
+        Add a chunk of policies.
+
+        Args:
+            policies (pd.DataFrame): Policies with PrivacyPolicyURL and the
+                STRATUM_KEYS columns (see policy_strata)
+            costs (array-like, optional): Cost of each policy (defaults to
+                calls_per_policy)
+        """
+        chunk = policies.assign(
+            Priority=policy_priorities(policies["PrivacyPolicyURL"], self.seed),
+            Cost=self.calls_per_policy if costs is None else np.asarray(costs, dtype=np.float64)
+        )
+        for key, group in chunk.groupby(STRATUM_KEYS, sort=False):
+            self._sizes[key] = self._sizes.get(key, 0) + len(group)
+            reservoir = self._reservoirs.get(key)
+            self._reservoirs[key] = self._truncate(group if reservoir is None else pd.concat([reservoir, group]))
+
+    def _truncate(self, reservoir):
+        # Keep the lowest priorities until their cost covers the whole budget
+        reservoir = reservoir.sort_values("Priority", kind="stable")
+        spent_before = reservoir["Cost"].cumsum().to_numpy() - reservoir["Cost"].to_numpy()
+        return reservoir[spent_before < self.budget]
+
+    def _pooled_strata(self):
+        """Map each fine stratum key to its pooled stratum key."""
+        keys = {key: list(key) for key in self._sizes}
+        for level in reversed(range(len(STRATUM_KEYS))):
+            sizes = {}
+            for key, pooled in keys.items():
+                sizes[tuple(pooled)] = sizes.get(tuple(pooled), 0) + self._sizes[key]
+            for key, pooled in keys.items():
+                if sizes[tuple(pooled)] < self.min_stratum:
+                    pooled[level] = POOLED
+        return {key: tuple(pooled) for key, pooled in keys.items()}
+
+    def sample(self):
+        """
+        Draw the sample from the policies added so far.
+
+        Returns:
+            pd.DataFrame: Sampled policies in priority order with Stratum,
+                StratumSize (policies in the stratum), StratumSampled,
+                Weight (StratumSize / StratumSampled), Priority and Cost
+        """
+        pooled = self._pooled_strata()
+        sizes, reservoirs = {}, {}
+        for key, stratum in pooled.items():
+            sizes[stratum] = sizes.get(stratum, 0) + self._sizes[key]
+            reservoirs.setdefault(stratum, []).append(self._reservoirs[key])
+        candidates = {
+            stratum: self._truncate(pd.concat(frames)) for stratum, frames in reservoirs.items()
+        }
+        taken = {stratum: 0 for stratum in candidates}
+        spent = {stratum: 0.0 for stratum in candidates}
+        remaining = float(self.budget)
+
+        def take(stratum):
+            nonlocal remaining
+            cost = candidates[stratum]["Cost"].iat[taken[stratum]]
+            taken[stratum] += 1
+            spent[stratum] += cost
+            remaining -= cost
+
+        def next_cost(stratum):
+            if taken[stratum] >= len(candidates[stratum]):
+                return None
+            return candidates[stratum]["Cost"].iat[taken[stratum]]
+
+        # Minimum per stratum, largest strata first
+        for stratum in sorted(candidates, key=lambda s: (-sizes[s], s)):
+            while taken[stratum] < self.min_per_stratum:
+                cost = next_cost(stratum)
+                if cost is None or cost > remaining:
+                    break
+                take(stratum)
+
+        # Then always extend the stratum with the least spent per policy, i.e.
+        # the one furthest below its proportional share
+        heap = [(spent[s] / sizes[s], s) for s in candidates]
+        heapq.heapify(heap)
+        while heap:
+            _, stratum = heapq.heappop(heap)
+            cost = next_cost(stratum)
+            if cost is None or cost > remaining:
+                continue
+            take(stratum)
+            heapq.heappush(heap, (spent[stratum] / sizes[stratum], stratum))
+
+        frames = []
+        for stratum, frame in candidates.items():
+            if taken[stratum]:
+                frames.append(frame.iloc[:taken[stratum]].assign(
+                    Stratum=" / ".join(stratum),
+                    StratumSize=sizes[stratum],
+                    StratumSampled=taken[stratum],
+                    Weight=sizes[stratum] / taken[stratum]
+                ))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames).sort_values("Priority", kind="stable", ignore_index=True)
+
+
+@instrumented()
+def sample_policies(policies, brokers, budget, calls_per_policy=1, costs=None, min_stratum=10,
+                    min_per_stratum=2, seed=42, chunksize=None):
+    """
+    Stratified sample of policies for LLM annotation within a budget.
+
+    Args:
+        policies (pd.DataFrame): Unique policies with Name and PrivacyPolicyURL
+        brokers (pd.DataFrame): Merged registry used for the strata
+        budget (float): LLM calls (or units of `costs`) to spend
+        calls_per_policy (int): LLM calls per policy (e.g. 3 when Q1-Q3 are
+            asked separately)
+        costs (array-like, optional): Per-policy cost such as estimated tokens
+        min_stratum (int): Strata smaller than this are pooled
+        min_per_stratum (int): Policies every stratum gets first, budget permitting
+        seed (int): Sampling seed
+        chunksize (int, optional): Feed the sampler this many policies at a time
+
+    Returns:
+        pd.DataFrame: See StratifiedPolicySampler.sample
+    """
+    sampler = StratifiedPolicySampler(budget, calls_per_policy, min_stratum, min_per_stratum, seed)
+    data = pd.concat([policies, policy_strata(policies, brokers)], axis=1)
+    costs = None if costs is None else np.asarray(costs, dtype=np.float64)
+    step = chunksize or max(len(data), 1)
+    for start in range(0, len(data), step):
+        sampler.add(data.iloc[start:start + step], None if costs is None else costs[start:start + step])
+    return sampler.sample()
+
+
+@instrumented()
+def estimate_answer_shares(sample, llm_data, questions=("Q1", "Q2", "Q3"), z=1.96):
+    """
+    Stratified estimates of the answer percentages with standard errors.
+
+    Per stratum h with N_h policies of which n_h were validly annotated, the
+    share p_h of an answer is combined as sum(W_h * p_h) with W_h = N_h / N
+    and variance sum(W_h^2 * (1 - n_h / N_h) * p_h * (1 - p_h) / (n_h - 1)).
+    Sampled policies without a valid answer are left out of their stratum,
+    and strata without any are left out of the weights. The standard error
+    is NaN while a stratum has a single answer (and is not fully annotated).
+
+    Args:
+        sample (pd.DataFrame): Output of sample_policies
+        llm_data (pd.DataFrame): LLM analysis results with PrivacyPolicyURL
+            and the LLM Q* columns
+        questions (tuple): Question keys from LLM_QUESTIONS
+        z (float): Normal quantile of the (Wald) confidence interval, 1.96
+            for 95%; it is too narrow for shares close to 0 or 100%
+
+    Returns:
+        pd.DataFrame: question, category, category_label, response,
+            response_label, percentage, std_error, ci_low, ci_high (in
+            percentage points) and policies (valid answers in the sample)
+    """
+    from .privacy_policy_analyzer import CATEGORY_TITLES, LLM_QUESTIONS, QUESTION_LABELS, RESPONSE_LABELS, decode_llm_responses
+
+    answers = llm_data.assign(
+        _url=compact_lowercase_values(llm_data["PrivacyPolicyURL"].astype("string"))
+    ).drop_duplicates(subset="_url", keep="last")
+    annotated = sample[["PrivacyPolicyURL", "Stratum", "StratumSize"]].assign(
+        _url=compact_lowercase_values(sample["PrivacyPolicyURL"].astype("string"))
+    ).merge(answers.drop(columns=["PrivacyPolicyURL"]), on="_url", how="inner")
+
+    decoded = decode_llm_responses(annotated, questions)
+    matrix = decoded["matrix"]
+    strata, stratum_index = pd.factorize(annotated["Stratum"])
+    sizes = annotated.groupby("Stratum")["StratumSize"].first().reindex(stratum_index).to_numpy(np.float64)
+    n_strata = len(stratum_index)
+
+    valid = np.zeros((n_strata, matrix.shape[1]))
+    np.add.at(valid, strata, matrix >= 0)
+    has_data = valid > 0
+    weights = np.where(has_data, sizes[:, None], 0.0)
+    weights = np.divide(weights, weights.sum(axis=0), out=np.zeros_like(weights), where=weights.sum(axis=0) > 0)
+    fpc = np.where(has_data, 1 - valid / sizes[:, None], 0.0)
+    # One answer in a stratum that is not a census gives no variance estimate
+    inestimable = (has_data & (valid < 2) & (fpc > 0)).any(axis=0)
+
+    column_questions = np.empty(matrix.shape[1], dtype=object)
+    for question in decoded["questions"]:
+        column_questions[decoded["slices"][question]] = QUESTION_LABELS.get(question, question)
+    categories = np.asarray(decoded["columns"], dtype=object)
+    positions = np.arange(len(categories))
+
+    rows = []
+    max_response = max(LLM_QUESTIONS[question][2] for question in decoded["questions"])
+    for response in range(max_response + 1):
+        hits = np.zeros((n_strata, matrix.shape[1]))
+        np.add.at(hits, strata, matrix == response)
+        shares = np.divide(hits, valid, out=np.zeros_like(hits), where=has_data)
+        estimate = (weights * shares).sum(axis=0)
+        variance = (weights ** 2 * fpc * shares * (1 - shares) / np.maximum(valid - 1, 1)).sum(axis=0)
+        std_error = np.where(inestimable, np.nan, np.sqrt(variance))
+        rows.append(pd.DataFrame({
+            "position": positions,
+            "question": column_questions,
+            "category": categories,
+            "category_label": [CATEGORY_TITLES.get(category, category) for category in categories],
+            "response": response,
+            "response_label": RESPONSE_LABELS.get(response, response),
+            "percentage": estimate * 100,
+            "std_error": std_error * 100,
+            "ci_low": np.clip(estimate - z * std_error, 0, 1) * 100,
+            "ci_high": np.clip(estimate + z * std_error, 0, 1) * 100,
+            "policies": valid.sum(axis=0).astype(np.int64)
+        }))
+    result = pd.concat(rows, ignore_index=True).sort_values(["position", "response"], ignore_index=True)
+    return result.drop(columns="position")
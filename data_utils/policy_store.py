@@ -0,0 +1,228 @@
+"""
+LLM Policy Answer Store
+=======================
+
+SQLite store of decoded LLM policy answers, so analyses can filter and
+aggregate answers without re-reading and re-parsing the results CSV.
+
+Each row holds one analysis of a broker's policy: the broker name, policy
+URL and its hash, model, prompt version, and one integer column per LLM
+category (e.g. `q1_marketing`), NULL where the answer is missing or
+invalid. Rows are keyed on (name, URL hash, model, prompt version) and
+indexed on each of the name, URL hash and (model, prompt version).
+
+Upserts run in one write transaction each. The database uses WAL mode with
+a busy timeout, so several analysis workers, threads or processes, can write
+while others read. Each call opens its own connection.
+
+Usage:
+    store = PolicyAnswerStore()
+    store.import_csv(LLM_RESULTS_CSV, model="gpt-4o-mini", prompt_version="final")
+    store.answer_counts("Q1", model="gpt-4o-mini")
+"""
+
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .llm_runner import text_hash
+from .normalization import compact_lowercase_values
+from .paths import CACHE_DIR
+from .privacy_policy_analyzer import LLM_QUESTIONS, decode_llm_responses
+
+
+DEFAULT_STORE_PATH = CACHE_DIR / "policy_answers.sqlite"
+
+# (question, category) -> integer column
+ANSWER_COLUMNS = {
+    (question, category): f"{question.lower()}_{category}"
+    for question, (_, categories, _) in LLM_QUESTIONS.items()
+    for category in categories
+}
+
+_KEY_COLUMNS = ["name", "url_hash", "model", "prompt_version"]
+
+
+def _schema():
+    answer_columns = ",\n    ".join(f"{column} INTEGER" for column in ANSWER_COLUMNS.values())
+    return f"""
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_clean TEXT NOT NULL,
+    policy_url TEXT,
+    url_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    {answer_columns},
+    error TEXT,
+    updated_at TEXT NOT NULL,
+    UNIQUE (name, url_hash, model, prompt_version)
+);
+CREATE INDEX IF NOT EXISTS answers_name ON answers (name_clean);
+CREATE INDEX IF NOT EXISTS answers_url_hash ON answers (url_hash);
+CREATE INDEX IF NOT EXISTS answers_model_prompt ON answers (model, prompt_version);
+"""
+
+
+class PolicyAnswerStore:
+    """
+    SQLite store of decoded LLM answers (see the module docstring).
+
+    Args:
+        path (str, optional): Database file (defaults to data/.cache/policy_answers.sqlite)
+        timeout (float): Seconds to wait for another writer's lock
+    """
+
+    def __init__(self, path=None, timeout=30.0):
+        self.path = Path(path) if path else DEFAULT_STORE_PATH
+        self.timeout = timeout
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_schema())
+
+    def _connect(self):
+        # isolation_level=None: transactions are opened explicitly with BEGIN IMMEDIATE
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        connection.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return connection
+
+    def upsert(self, results, model, prompt_version, url_col="PrivacyPolicyURL", error_col="LLM_Error"):
+        """
+        Insert or update analysis results in one transaction.
+
+        Questions whose column is missing from `results` (e.g. a question
+        that was not run) keep their stored answers. Questions that are
+        present overwrite them, so a missing or invalid answer is stored
+        as NULL.
+
+        Args:
+            results (pd.DataFrame): Name, policy URL and "LLM Q*" columns
+                (the output of llm_runner.run_policy_analysis or the results CSV)
+            model (str): Model that produced the answers
+            prompt_version (str): Version of the prompts used
+            url_col (str): Policy URL column
+            error_col (str): Optional error column
+
+        Returns:
+            int: Number of rows written
+        """
+        questions = [question for question, (column, _, _) in LLM_QUESTIONS.items() if column in results.columns]
+        decoded = decode_llm_responses(results, questions)
+        urls = (results[url_col] if url_col in results.columns else pd.Series(None, index=results.index)).astype("string")
+        url_hashes = [text_hash(url) for url in compact_lowercase_values(urls)]
+
+        rows = {
+            "name": results["Name"].astype(str).tolist(),
+            "name_clean": compact_lowercase_values(results["Name"]).tolist(),
+            "policy_url": urls.astype(object).where(urls.notna(), None).tolist(),
+            "url_hash": url_hashes,
+            "model": [model] * len(results),
+            "prompt_version": [prompt_version] * len(results)
+        }
+        for question in questions:
+            _, categories, _ = LLM_QUESTIONS[question]
+            values = decoded["matrix"][:, decoded["slices"][question]]
+            for position, category in enumerate(categories):
+                column = values[:, position].astype(object)
+                column[values[:, position] < 0] = None
+                rows[ANSWER_COLUMNS[(question, category)]] = [None if value is None else int(value) for value in column]
+        if error_col in results.columns:
+            rows["error"] = results[error_col].astype(object).where(results[error_col].notna(), None).tolist()
+        rows["updated_at"] = [datetime.now(timezone.utc).isoformat(timespec="seconds")] * len(results)
+
+        columns = list(rows)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column not in _KEY_COLUMNS)
+        statement = (
+            f"INSERT INTO answers ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({', '.join(_KEY_COLUMNS)}) DO UPDATE SET {updates}"
+        )
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(statement, zip(*rows.values()))
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        return len(results)
+
+    def import_csv(self, file_path, model, prompt_version):
+        """
+        Load an LLM results CSV (e.g. privacy-policy-scraping-final.csv).
+
+        Args:
+            file_path (str): Results CSV
+            model (str): Model that produced the answers
+            prompt_version (str): Version of the prompts used
+
+        Returns:
+            int: Number of rows written
+        """
+        from .columnar_cache import read_csv_cached
+        return self.upsert(read_csv_cached(file_path, schema=True), model, prompt_version)
+
+    @staticmethod
+    def _filters(model=None, prompt_version=None, names=None, url_hashes=None):
+        clauses, parameters = [], []
+        for column, value in (("model", model), ("prompt_version", prompt_version)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                parameters.append(value)
+        for column, values in (("name_clean", names), ("url_hash", url_hashes)):
+            if values is not None:
+                values = list(compact_lowercase_values(pd.Series(list(values)))) if column == "name_clean" else list(values)
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                parameters.extend(values)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", parameters
+
+    def answer_counts(self, question=None, model=None, prompt_version=None, names=None, url_hashes=None):
+        """
+        Count answers per category and response inside SQLite.
+
+        Args:
+            question (str, optional): Question key such as "Q1" (defaults to all)
+            model (str, optional): Only answers of this model
+            prompt_version (str, optional): Only answers of this prompt version
+            names (list, optional): Only these brokers (matched on the compacted name)
+            url_hashes (list, optional): Only these policy URL hashes
+
+        Returns:
+            pd.DataFrame: question, category, response, count (missing answers excluded)
+        """
+        where, parameters = self._filters(model, prompt_version, names, url_hashes)
+        selects = [
+            f"SELECT '{q}' AS question, '{category}' AS category, {column} AS response, COUNT(*) AS count "
+            f"FROM answers{where}{' AND' if where else ' WHERE'} {column} IS NOT NULL GROUP BY {column}"
+            for (q, category), column in ANSWER_COLUMNS.items()
+            if question is None or q == question
+        ]
+        with closing(self._connect()) as connection:
+            counts = pd.read_sql_query(" UNION ALL ".join(selects), connection,
+                                       params=parameters * len(selects))
+        return counts.astype({"response": np.int8, "count": np.int64})
+
+    def answers(self, question=None, model=None, prompt_version=None, names=None, url_hashes=None):
+        """
+        Fetch matching rows with their integer answers.
+
+        Args:
+            question (str, optional): Only this question's answer columns
+            model, prompt_version, names, url_hashes: Filters as for `answer_counts`
+
+        Returns:
+            pd.DataFrame: name, policy_url, url_hash, model, prompt_version and
+                one nullable Int8 column per category
+        """
+        answer_columns = [column for (q, _), column in ANSWER_COLUMNS.items() if question is None or q == question]
+        where, parameters = self._filters(model, prompt_version, names, url_hashes)
+        query = (f"SELECT name, policy_url, url_hash, model, prompt_version, {', '.join(answer_columns)} "
+                 f"FROM answers{where} ORDER BY id")
+        with closing(self._connect()) as connection:
+            frame = pd.read_sql_query(query, connection, params=parameters)
+        return frame.astype({column: "Int8" for column in answer_columns})
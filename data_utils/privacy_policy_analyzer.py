@@ -8,10 +8,52 @@ visualizations to understand data broker practices.
 
 import pandas as pd
 import numpy as np
-import altair as alt
 from pathlib import Path
 
-
+from .columnar_cache import file_hash, read_csv_cached
+from .instrumentation import instrumented
+
+
+# Response column, categories and largest valid answer for each LLM question
+LLM_QUESTIONS = {
+    "Q1": ("LLM Q1", ['marketing', 'personalized_ads', 'employment', 'consumer_finance', 'law_no_subpoena'], 2),
+    "Q2": ("LLM Q2", ['gov', 'corporations', 'education_research'], 2),
+    "Q3": ("LLM Q3", ['access', 'correct', 'delete', 'no_discrimination', 'no_targeted_ads', 'opt_out_data'], 2)
+}
+
+RESPONSE_LABELS = {0: "No", 1: "Yes", 2: "Not Mentioned"}
+
+QUESTION_LABELS = {
+    "Q1": "Data Use (Q1)",
+    "Q2": "Entity Sharing (Q2)",
+    "Q3": "User Rights (Q3)"
+}
+
+CATEGORY_TITLES = {
+    "marketing": "Marketing",
+    "personalized_ads": "Personalized Ads",
+    "employment": "Employment",
+    "consumer_finance": "Consumer Finance",
+    "law_no_subpoena": "Law Enforcement (No Subpoena)",
+    "gov": "Government",
+    "corporations": "Corporations",
+    "education_research": "Education & Research",
+    "access": "Access",
+    "correct": "Correct",
+    "delete": "Delete",
+    "no_discrimination": "No Discrimination",
+    "no_targeted_ads": "No Targeted Ads",
+    "opt_out_data": "Opt-Out Sharing & Collection"
+}
+
+# Removes brackets and whitespace from "[1, 0, 2]"-style responses
+_RESPONSE_STRIP_TABLE = str.maketrans("", "", "[] \t\r\n")
+
+# explicit_permission_rates results keyed on (file content hash, questions)
+_permission_rate_memo = {}
+
+
+@instrumented()
 def load_privacy_policy_data(file_path):
     """
     Load privacy policy analysis data from CSV file.
@@ -20,10 +62,11 @@ def load_privacy_policy_data(file_path):
         file_path (str): Path to the privacy policy CSV file
         
     Returns:
-        pd.DataFrame: Loaded privacy policy data
+        pd.DataFrame: Loaded privacy policy data, with the dtypes
+            pd.read_csv returns (read through columnar_cache.read_csv_cached)
     """
     try:
-        data = pd.read_csv(file_path)
+        data = read_csv_cached(file_path)
         print(f"Privacy policy data loaded successfully: {data.shape[0]} rows, {data.shape[1]} columns")
         return data
     except FileNotFoundError:
@@ -34,6 +77,7 @@ def load_privacy_policy_data(file_path):
         return None
 
 
+@instrumented()
 def parse_llm_responses(data, question_col, category_names, name_col="Name"):
     """
     Parse LLM responses from bracketed format into separate columns.
@@ -68,7 +112,126 @@ def parse_llm_responses(data, question_col, category_names, name_col="Name"):
     return result_df
 
 
-def create_policy_analysis_chart(data, category_columns, title, xlabel, legend_labels=None, legend_title='Response Type', category_labels_map=None):
+def _decode_question(responses, n_categories, max_response):
+    """
+    Decode one question's bracketed responses into an int8 matrix.
+
+    Rows in the canonical "d,d,...,d" form are decoded with a single NumPy
+    pass over their bytes; anything else falls back to splitting in Python.
+    Invalid entries are set to -1.
+
+    Returns:
+        tuple: (values, row_errors)
+    """
+    row_count = len(responses)
+    values = np.full((row_count, n_categories), -1, dtype=np.int8)
+    row_errors = np.zeros(row_count, dtype=bool)
+
+    cleaned = [
+        response.translate(_RESPONSE_STRIP_TABLE) if isinstance(response, str) else ""
+        for response in responses
+    ]
+    width = 2 * n_categories - 1
+    lengths = np.fromiter(map(len, cleaned), dtype=np.int64, count=row_count)
+    fast_rows = np.flatnonzero(lengths == width)
+
+    if len(fast_rows):
+        raw = "".join(cleaned[row] for row in fast_rows).encode("ascii", errors="replace")
+        matrix = np.frombuffer(raw, dtype=np.uint8).reshape(len(fast_rows), width)
+        digits = matrix[:, 0::2].astype(np.int16) - ord("0")
+        well_formed = (matrix[:, 1::2] == ord(",")).all(axis=1) & ((digits >= 0) & (digits <= 9)).all(axis=1)
+        in_range = digits <= max_response if max_response is not None else np.ones_like(digits, dtype=bool)
+        valid = well_formed[:, None] & in_range
+        values[fast_rows] = np.where(valid, digits, -1)
+        row_errors[fast_rows] = ~valid.all(axis=1)
+
+    slow_rows = np.flatnonzero(lengths != width)
+    for row in slow_rows:
+        tokens = cleaned[row].split(",")
+        if len(tokens) != n_categories:
+            row_errors[row] = True
+            continue
+        for position, token in enumerate(tokens):
+            try:
+                number = float(token)
+            except ValueError:
+                row_errors[row] = True
+                continue
+            if number.is_integer() and 0 <= number <= (max_response if max_response is not None else 127):
+                values[row, position] = int(number)
+            else:
+                row_errors[row] = True
+
+    return values, row_errors
+
+
+@instrumented()
+def decode_llm_responses(data, questions=("Q1", "Q2", "Q3")):
+    """
+    Decode all LLM question columns into one preallocated int8 matrix.
+
+    Every distinct response string is decoded once and broadcast to the rows
+    that share it, so repeated answers cost a hash lookup rather than a parse.
+
+    Each question's responses are checked for arity (one answer per category)
+    and value range (0 up to the question's largest valid answer). Invalid
+    answers are stored as -1 and flagged in the per-row error mask.
+
+    Args:
+        data (pd.DataFrame): LLM analysis results with "LLM Q*" columns
+        questions (tuple): Question keys from LLM_QUESTIONS to decode
+
+    Returns:
+        dict: {"matrix": int8 array (rows x categories), "errors": bool array
+            (rows x questions), "columns": category names, "slices": column
+            slice per question, "questions": decoded question keys}
+    """
+    widths = [len(LLM_QUESTIONS[question][1]) for question in questions]
+    matrix = np.empty((len(data), sum(widths)), dtype=np.int8)
+    errors = np.empty((len(data), len(questions)), dtype=bool)
+    slices, columns, start = {}, [], 0
+
+    for position, (question, width) in enumerate(zip(questions, widths)):
+        column, category_names, max_response = LLM_QUESTIONS[question]
+        question_slice = slice(start, start + width)
+        # Decode each distinct response string once; missing responses use
+        # the appended all-invalid row via the -1 code
+        codes, uniques = pd.factorize(data[column])
+        unique_values, unique_errors = _decode_question(
+            np.append(np.asarray(uniques, dtype=object), None), width, max_response
+        )
+        matrix[:, question_slice] = unique_values[codes]
+        errors[:, position] = unique_errors[codes]
+        slices[question] = question_slice
+        columns.extend(category_names)
+        start += width
+
+    return {
+        "matrix": matrix,
+        "errors": errors,
+        "columns": columns,
+        "slices": slices,
+        "questions": list(questions)
+    }
+
+
+def _decoded_question_frame(data, decoded, question, name_col="Name"):
+    """
+    Build the per-question frame returned by the analyze_* functions from a
+    decoded response matrix.
+    """
+    if decoded is None or question not in decoded["slices"]:
+        decoded = decode_llm_responses(data, questions=(question,))
+    category_names = LLM_QUESTIONS[question][1]
+    values = decoded["matrix"][:, decoded["slices"][question]]
+    result_df = pd.DataFrame(values, columns=category_names, index=data.index)
+    if (values < 0).any():
+        result_df = result_df.where(result_df >= 0)
+    result_df.insert(0, name_col, data[name_col])
+    return result_df
+
+
+def create_policy_analysis_chart(data, category_columns, title, xlabel, legend_labels=None, legend_title='Response Type', category_labels_map=None, aggregate=True):
     """
     Create a standardized bar chart for privacy policy analysis using Altair.
     
@@ -80,12 +243,27 @@ def create_policy_analysis_chart(data, category_columns, title, xlabel, legend_l
         legend_labels (list or dict, optional): Mapping from response values to labels.
         legend_title (str, optional): Title for the legend.
         category_labels_map (dict, optional): Dictionary to map snake_case category names to user-friendly labels.
+        aggregate (bool, optional): Count responses in pandas and embed only the per-category
+            counts, so the spec size does not grow with the number of rows (Vega
+            normalizes the stacked counts into percentages). If False, every row is
+            embedded and counted by Vega.
         
     Returns:
         altair.Chart: Generated Altair chart object.
     """
-    # Melt the dataframe to long format
-    long_df = data[category_columns].melt(var_name='category', value_name='response')
+    # Imported here so that the analysis functions load without altair
+    import altair as alt
+
+    if aggregate:
+        # One row per (category, response) with its count
+        long_df = pd.concat([
+            data[col].value_counts(dropna=False, sort=False)
+            .rename_axis('response').reset_index(name='count').assign(category=col)
+            for col in category_columns
+        ], ignore_index=True)
+    else:
+        # Melt the dataframe to long format
+        long_df = data[category_columns].melt(var_name='category', value_name='response')
     
     # Apply category label mapping if provided
     if category_labels_map:
@@ -131,12 +309,22 @@ def create_policy_analysis_chart(data, category_columns, title, xlabel, legend_l
     else:
         long_df['response_label'] = long_df['response']
 
+    if aggregate:
+        long_df = long_df.groupby(['category', 'display_category', 'response_label'], dropna=False, sort=False)[
+            'count'].sum().reset_index()
+        x_encoding = alt.X('count:Q', stack='normalize', title='Count of Records',
+                           axis=alt.Axis(format='%', title='Percentage'))
+        count_tooltip = alt.Tooltip('count:Q', title='Count')
+    else:
+        x_encoding = alt.X('count()', stack='normalize', axis=alt.Axis(format='%', title='Percentage'))
+        count_tooltip = alt.Tooltip('count()', title='Count')
+
     # Create the chart
     chart = alt.Chart(long_df).mark_bar().encode(
         y=alt.Y(x_field, title=xlabel, axis=alt.Axis(labelAngle=0), sort=category_columns),
-        x=alt.X('count()', stack='normalize', axis=alt.Axis(format='%', title='Percentage')),
+        x=x_encoding,
         color=alt.Color('response_label:N', title=legend_title, sort=sort_order),
-        tooltip=[tooltip_category_field, 'response_label:N', alt.Tooltip('count()', title='Count')]
+        tooltip=[tooltip_category_field, 'response_label:N', count_tooltip]
     ).properties(
         title=title
     )
@@ -144,20 +332,21 @@ def create_policy_analysis_chart(data, category_columns, title, xlabel, legend_l
     return chart
 
 
-def analyze_data_use_practices(llm_data):
+def analyze_data_use_practices(llm_data, decoded=None):
     """
     Analyze data use practices from LLM Q1 responses.
     
     Args:
         llm_data (pd.DataFrame): LLM analysis results
+        decoded (dict, optional): Output of decode_llm_responses to reuse
         
     Returns:
         tuple: (processed_data, summary_stats)
     """
-    category_names = ['marketing', 'personalized_ads', 'employment', 'consumer_finance', 'law_no_subpoena']
+    category_names = LLM_QUESTIONS["Q1"][1]
     
     # Parse responses
-    data_use = parse_llm_responses(llm_data, "LLM Q1", category_names)
+    data_use = _decoded_question_frame(llm_data, decoded, "Q1")
     
     # Calculate summary statistics
     summary_stats = {}
@@ -173,20 +362,21 @@ def analyze_data_use_practices(llm_data):
     return data_use, summary_stats
 
 
-def analyze_sharing_entities(llm_data):
+def analyze_sharing_entities(llm_data, decoded=None):
     """
     Analyze entity sharing practices from LLM Q2 responses.
     
     Args:
         llm_data (pd.DataFrame): LLM analysis results
+        decoded (dict, optional): Output of decode_llm_responses to reuse
         
     Returns:
         tuple: (processed_data, summary_stats)
     """
-    category_names = ['gov', 'corporations', 'education_research']
+    category_names = LLM_QUESTIONS["Q2"][1]
     
     # Parse responses  
-    entities = parse_llm_responses(llm_data, "LLM Q2", category_names)
+    entities = _decoded_question_frame(llm_data, decoded, "Q2")
     
     # Calculate summary statistics
     summary_stats = {}
@@ -202,20 +392,21 @@ def analyze_sharing_entities(llm_data):
     return entities, summary_stats
 
 
-def analyze_user_controls(llm_data):
+def analyze_user_controls(llm_data, decoded=None):
     """
     Analyze user rights and controls from LLM Q3 responses.
     
     Args:
         llm_data (pd.DataFrame): LLM analysis results
+        decoded (dict, optional): Output of decode_llm_responses to reuse
         
     Returns:
         tuple: (processed_data, summary_stats)
     """
-    category_names = ['access', 'correct', 'delete', 'no_discrimination', 'no_targeted_ads', 'opt_out_data']
+    category_names = LLM_QUESTIONS["Q3"][1]
     
     # Parse responses
-    controls = parse_llm_responses(llm_data, "LLM Q3", category_names)
+    controls = _decoded_question_frame(llm_data, decoded, "Q3")
     
     # Calculate summary statistics
     summary_stats = {}
@@ -289,90 +480,117 @@ def generate_analysis_report(data_use_stats, entities_stats, controls_stats):
     return "\n".join(report)
 
 
-def _build_response_summary(df, question_key, question_labels, response_labels, category_titles):
+@instrumented()
+def summarize_decoded_responses(decoded, question_labels=None, response_labels=None, category_titles=None):
+    """
+    Count every (question, category, response) combination in one pass.
+
+    Each valid answer in the decoded int8 matrix is mapped to a slot
+    `column * n_responses + response` and all slots are counted with a single
+    np.bincount; shares are the counts divided by each category's valid
+    answers. Combinations that never occur are omitted.
+
+    Args:
+        decoded (dict): Output of decode_llm_responses
+        question_labels (dict, optional): Question key -> display label
+        response_labels (dict, optional): Response value -> display label
+        category_titles (dict, optional): Category name -> display label
+
+    Returns:
+        pd.DataFrame: question, category, category_label, response,
+            response_label, count and share, one row per observed combination
     """
-    Convert wide-format parsed responses into long-form summary suitable for Altair.
+    question_labels = QUESTION_LABELS if question_labels is None else question_labels
+    response_labels = RESPONSE_LABELS if response_labels is None else response_labels
+    category_titles = CATEGORY_TITLES if category_titles is None else category_titles
+
+    matrix = decoded["matrix"]
+    n_columns = matrix.shape[1]
+    n_responses = max(LLM_QUESTIONS[question][2] for question in decoded["questions"]) + 1
+    slots = matrix.astype(np.int64) + np.arange(n_columns, dtype=np.int64) * n_responses
+    slots = slots[matrix >= 0]
+    counts = np.bincount(slots, minlength=n_columns * n_responses).reshape(n_columns, n_responses)
+    totals = counts.sum(axis=1, keepdims=True)
+    shares = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+
+    column_questions = np.empty(n_columns, dtype=object)
+    for question in decoded["questions"]:
+        column_questions[decoded["slices"][question]] = question_labels.get(question, question)
+    categories = np.asarray(decoded["columns"], dtype=object)
+    category_labels = np.array([
+        category_titles.get(category, category.replace("_", " ").title()) for category in categories
+    ], dtype=object)
+
+    column_index, response = np.nonzero(counts)
+    return pd.DataFrame({
+        "question": column_questions[column_index],
+        "category": categories[column_index],
+        "category_label": category_labels[column_index],
+        "response": response,
+        "response_label": pd.Series(response).map(response_labels).to_numpy(dtype=object),
+        "count": counts[column_index, response],
+        "share": shares[column_index, response]
+    })
+
+
+@instrumented()
+def explicit_permission_rates(file_path, questions=("Q1", "Q2")):
     """
-    long_df = df.melt(id_vars=["Name"], var_name="category", value_name="response")
-    long_df = long_df.dropna(subset=["response"])
-    long_df["question"] = question_labels.get(question_key, question_key)
-    long_df["response_label"] = long_df["response"].map(response_labels)
-    long_df["category_label"] = (
-        long_df["category"].map(category_titles)
-        .fillna(long_df["category"].str.replace("_", " ").str.title())
-    )
+    Percentage of analyzed policies that explicitly allow each category.
 
-    counts = (
-        long_df.groupby(["question", "category", "category_label", "response", "response_label"], as_index=False)
-        .size()
-        .rename(columns={"size": "count"})
-    )
-    counts["share"] = counts["count"] / counts.groupby(["question", "category"])["count"].transform("sum")
-    return counts
+    Results are memoized on the file's content hash, so they are recomputed
+    only after new policies have been analyzed.
 
+    Args:
+        file_path (str): Path to the LLM analysis CSV
+        questions (tuple): Question keys from LLM_QUESTIONS to include
 
-def prepare_privacy_policy_summary(llm_data):
+    Returns:
+        pd.Series: Percentage (0-100) of policies answering 1, indexed by category
+    """
+    key = (file_hash(file_path), tuple(questions))
+    if key not in _permission_rate_memo:
+        columns = ["Name"] + [LLM_QUESTIONS[question][0] for question in questions]
+        decoded = decode_llm_responses(read_csv_cached(file_path, columns=columns, schema=True), questions)
+        summary = summarize_decoded_responses(decoded)
+        allowed = summary[summary["response"] == 1].set_index("category")["share"] * 100
+        _permission_rate_memo[key] = allowed.reindex(decoded["columns"], fill_value=0.0).rename("Percentage")
+    return _permission_rate_memo[key].copy()
+
+
+@instrumented()
+def prepare_privacy_policy_summary(llm_data, records=True):
     """
     Prepare aggregated summary data for privacy policy visualizations.
     
     Args:
         llm_data (pd.DataFrame): Raw LLM response dataframe.
+        records (bool): Also return the summary as a list of record dicts.
         
     Returns:
         dict: Summary data and metadata for visualization.
     """
-    data_use, _ = analyze_data_use_practices(llm_data)
-    entities, _ = analyze_sharing_entities(llm_data)
-    controls, _ = analyze_user_controls(llm_data)
+    decoded = decode_llm_responses(llm_data)
 
-    response_labels = {0: "No", 1: "Yes", 2: "Not Mentioned"}
     response_order = ["Yes", "No", "Not Mentioned"]
     response_colors = ["#2ca02c", "#d62728", "#7f7f7f"]
 
-    question_labels = {
-        "Q1": "Data Use (Q1)",
-        "Q2": "Entity Sharing (Q2)",
-        "Q3": "User Rights (Q3)"
-    }
-
-    category_titles = {
-        "marketing": "Marketing",
-        "personalized_ads": "Personalized Ads",
-        "employment": "Employment",
-        "consumer_finance": "Consumer Finance",
-        "law_no_subpoena": "Law Enforcement (No Subpoena)",
-        "gov": "Government",
-        "corporations": "Corporations",
-        "education_research": "Education & Research",
-        "access": "Access",
-        "correct": "Correct",
-        "delete": "Delete",
-        "no_discrimination": "No Discrimination",
-        "no_targeted_ads": "No Targeted Ads",
-        "opt_out_data": "Opt-Out Sharing & Collection"
-    }
-
-    summary_frames = [
-        _build_response_summary(data_use, "Q1", question_labels, response_labels, category_titles),
-        _build_response_summary(entities, "Q2", question_labels, response_labels, category_titles),
-        _build_response_summary(controls, "Q3", question_labels, response_labels, category_titles)
-    ]
-
-    summary_df = pd.concat(summary_frames, ignore_index=True)
+    summary_df = summarize_decoded_responses(decoded)
     summary_df["response_label"] = pd.Categorical(
         summary_df["response_label"],
         categories=response_order,
         ordered=True
     )
-    summary_df.sort_values(["question", "category", "response_label"], inplace=True)
-
-    summary_records = summary_df.to_dict(orient="records")
+    summary_df = summary_df.sort_values(["question", "category", "response_label"], ignore_index=True)
 
-    return {
-        "summary": summary_records,
+    summary = {
+        "summary_table": summary_df,
         "response_order": response_order,
         "response_colors": response_colors
     }
+    if records:
+        summary["summary"] = summary_df.to_dict(orient="records")
+    return summary
 
 
 if __name__ == "__main__":
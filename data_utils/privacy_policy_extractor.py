@@ -6,11 +6,13 @@ Functions for processing data broker privacy policies and preparing data
 for manual or automated analysis.
 """
 
-import os
-import re
-import pandas as pd
 from pathlib import Path
 
+from .columnar_cache import read_csv_cached
+from .instrumentation import instrumented
+from .normalization import compact_lowercase, compact_lowercase_values
+from .paths import BROKERS_CSV, POLICY_DIR
+
 
 def clean_name(name):
     """
@@ -22,12 +24,7 @@ def clean_name(name):
     Returns:
         str: Cleaned name (lowercase, no spaces)
     """
-    if pd.isna(name):
-        return ""
-    
-    name = str(name).lower()
-    name = re.sub(r'\s+', '', name)
-    return name
+    return compact_lowercase(name)
 
 
 def clean_policy_url(policy_url):
@@ -40,28 +37,21 @@ def clean_policy_url(policy_url):
     Returns:
         str: Cleaned URL (lowercase, no spaces)
     """
-    if pd.isna(policy_url):
-        return ""
-        
-    policy_url = str(policy_url).lower()
-    policy_url = re.sub(r'\s+', '', policy_url)
-    return policy_url
+    return compact_lowercase(policy_url)
 
 
-def prepare_privacy_policy_dataset(data_path, output_dir=None):
+@instrumented()
+def clean_policy_rows(data_brokers):
     """
-    Prepare data broker dataset for privacy policy analysis.
+    Select broker names and policy URLs and add their cleaned forms.
     
     Args:
-        data_path (str): Path to the cleaned data brokers CSV file
-        output_dir (str, optional): Directory to save output files
+        data_brokers (pd.DataFrame): Cleaned data brokers data
         
     Returns:
-        tuple: (clean_dataset, unique_policies_dataset)
+        pd.DataFrame: Rows with Name, PrivacyPolicyURL, Name_Clean and
+            PrivacyPolicyURL_Clean (rows missing either value are dropped)
     """
-    # Load data
-    data_brokers = pd.read_csv(data_path)
-    
     # Select relevant columns
     policy_data = data_brokers[["Name", "PrivacyPolicyURL"]].copy()
     
@@ -69,8 +59,26 @@ def prepare_privacy_policy_dataset(data_path, output_dir=None):
     policy_data = policy_data.dropna()
     
     # Clean names and URLs
-    policy_data['Name_Clean'] = policy_data['Name'].apply(clean_name)
-    policy_data['PrivacyPolicyURL_Clean'] = policy_data['PrivacyPolicyURL'].astype('string').apply(clean_policy_url)
+    policy_data['Name_Clean'] = compact_lowercase_values(policy_data['Name'])
+    policy_data['PrivacyPolicyURL_Clean'] = compact_lowercase_values(policy_data['PrivacyPolicyURL'].astype('string'))
+    return policy_data
+
+
+@instrumented()
+def prepare_privacy_policy_dataset(data_path, output_dir=None):
+    """
+    Prepare data broker dataset for privacy policy analysis.
+    
+    Args:
+        data_path (str): Path to the cleaned data brokers CSV file
+        output_dir (str, optional): Directory to save output files
+        
+    Returns:
+        tuple: (clean_dataset, unique_policies_dataset)
+    """
+    # Load data
+    data_brokers = read_csv_cached(data_path, columns=["Name", "PrivacyPolicyURL"])
+    policy_data = clean_policy_rows(data_brokers)
     
     # Remove duplicates based on privacy policy URL (keep last occurrence)
     unique_policies = policy_data.drop_duplicates(subset='PrivacyPolicyURL_Clean', keep='last')
@@ -97,14 +105,8 @@ def prepare_privacy_policy_dataset(data_path, output_dir=None):
     return policy_data, unique_policies_shuffled
 
 
-def create_llm_analysis_prompt():
-    """
-    Generate the standardized prompt for LLM-based privacy policy analysis.
-    
-    Returns:
-        str: Formatted prompt for privacy policy analysis
-    """
-    prompt = """
+_LLM_PROMPTS = {
+    "Q1": """
 We will test what privacy policies mention about data use for the following categories. Only output a list of five numbers {0, 1, or 2} that correspond to the five categories below. Separate them by a comma; for example, respond [0, 1, 0, 0, 2]. 
 
 Categories:
@@ -120,8 +122,54 @@ Indices should correspond to:
 1 =  Privacy policy explicitly mentions ALLOWING this use case.
 2 = Privacy policy does not explicitly mention this use case.
 
+""",
+    "Q2": """
+We will test what privacy policies mention about sharing personal data with the following entities. Only output a list of three numbers {0, 1, or 2} that correspond to the three entities below. Separate them by a comma; for example, respond [0, 1, 2].
+
+Entities:
+
+1. Government
+2. Corporations
+3. Educational or Research Institutions
+
+Indices should correspond to:
+0 = Privacy policy explicitly mentions NOT allowing sharing with this entity.
+1 = Privacy policy explicitly mentions ALLOWING sharing with this entity.
+2 = Privacy policy does not explicitly mention sharing with this entity.
+
+""",
+    "Q3": """
+We will test which user rights and controls privacy policies guarantee for the following provisions. Only output a list of six numbers {0 or 1} that correspond to the six provisions below. Separate them by a comma; for example, respond [1, 1, 0, 1, 0, 1].
+
+Provisions:
+
+1. Right to access personal data
+2. Right to correct personal data
+3. Right to delete personal data
+4. No discrimination for exercising these rights
+5. Option to opt out of targeted advertising
+6. Option to opt out of data collection or sharing
+
+Indices should correspond to:
+0 = Privacy policy does not explicitly guarantee this provision.
+1 = Privacy policy explicitly guarantees this provision.
+
 """
-    return prompt.strip()
+}
+
+
+def create_llm_analysis_prompt(question="Q1"):
+    """
+    Generate the standardized prompt for LLM-based privacy policy analysis.
+    
+    Args:
+        question (str): Question key ("Q1" data use, "Q2" entity sharing,
+            "Q3" user rights)
+    
+    Returns:
+        str: Formatted prompt for privacy policy analysis
+    """
+    return _LLM_PROMPTS[question].strip()
 
 
 def validate_llm_output(llm_response):
@@ -156,15 +204,14 @@ def validate_llm_output(llm_response):
 
 if __name__ == "__main__":
     # Example usage
-    data_path = "../data/cleaned_data/uq-data-brokers.csv"
-    output_dir = "../data/cleaned_data/privacy_policies"
-    
-    clean_data, unique_policies = prepare_privacy_policy_dataset(data_path, output_dir)
+    clean_data, unique_policies = prepare_privacy_policy_dataset(BROKERS_CSV, POLICY_DIR)
     
     print("\nPrivacy Policy Analysis Workflow:")
     print("1. Use the generated CSV to identify unique privacy policies")
-    print("2. Download policies manually or use web scraping")
-    print("3. Apply LLM analysis using the standardized prompt")
+    print("   (or a budgeted stratified sample: python -m data_utils sample-policies --budget N)")
+    print("2. Download policies with policy_fetcher.fetch_policies")
+    print("3. Apply LLM analysis using the standardized prompt (see llm_runner.analyze_policies;")
+    print("   pass policy_dedup.PolicyDedupIndex.load() as dedup_index to reuse answers for near-duplicates)")
     print("4. Validate outputs and compile results")
     
     prompt = create_llm_analysis_prompt()
@@ -0,0 +1,156 @@
+"""
+Registry Source Adapters
+========================
+
+Adapters mapping the other raw registries onto the canonical layout of
+Data_Broker_Full_Registry_2025.xlsx (Name, RegistrySource, contact columns
+and the Collects* columns), so they can be unioned with it before
+initial_clean_and_one_hot and merge_by_normalized_name.
+
+Each adapter in SOURCES gives:
+- `path`: the raw file,
+- `label`: the RegistrySource value of its rows (one-hot encoded later),
+- `read_options`: extra pd.read_csv arguments (header row, index column),
+- `columns`: source header -> canonical column; headers are matched after
+  collapsing whitespace (the California headers contain non-breaking
+  spaces), and only these columns are parsed,
+- `yes_no`: canonical columns holding "Yes"/"No" answers, coded 1/0.
+
+Collects* columns a registry does not report are left missing. The rows are
+added to the merged registry by data_cleaner.merge_source_rows, where a
+source's answers only fill cells the full registry does not report (0/1), so
+they never override its answers; brokers no registry reports on get 2 ("not
+reported"), the code the full registry uses.
+
+Usage:
+    frames = read_sources(["california", "ydr"])
+    clean_data(RAW_REGISTRY, sources=["california", "ydr"])
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import instrumented
+from .paths import PROJECT_ROOT
+
+
+# Columns of the full registry, in its order
+CANONICAL_COLUMNS = [
+    'GroupUUID_Combined', 'Name', 'RegistrySource', 'WebsiteURL', 'PrivacyPolicyURL', 'OptOutURL',
+    'AlternateOptOutURLs', 'AdditionalWebsiteURL', 'Email', 'Phone', 'ContactPerson', 'ContactPersonTitle',
+    'AlternateContactPersons', 'Address', 'AddressLine4', 'City', 'County', 'State', 'ZipCode', 'Country',
+    'DataCategories', 'CollectsNames', 'CollectsAddresses', 'CollectsDOB', 'CollectsPOB', 'CollectsMMN',
+    'CollectsBiometricData', 'CollectsSSNGovID', 'CollectsOtherInfo', 'CollectsMinorsData',
+    'CollectsReproductiveHealthData', 'CollectsEmploymentData', 'CollectsNetworkData', 'CollectsCommercialData'
+]
+# Collects* code of brokers no registry reports on
+NOT_REPORTED = 2
+
+SOURCES = {
+    # CPPA registry export; the first row is a section heading
+    "california": {
+        "path": PROJECT_ROOT / "data/raw_data/California Data Broker Registry 2025.csv",
+        "label": "California (California Privacy Protection Agency)",
+        "read_options": {"header": 1},
+        "columns": {
+            "Data broker name:": "Name",
+            "Data broker primary website:": "WebsiteURL",
+            "Data broker primary contact email address:": "Email",
+            "Data broker primary phone number: [optional]": "Phone",
+            "Data broker primary street address:": "Address",
+            "Data broker city:": "City",
+            "Data broker state:": "State",
+            "Data broker zip code:": "ZipCode",
+            "Data broker country:": "Country",
+            "The data broker collects personal information of minors:": "CollectsMinorsData",
+            "The data broker collects consumers’ reproductive health care data:": "CollectsReproductiveHealthData",
+            ("Data Broker's primary website that contains details on how consumers can exercise their "
+             "CA Consumer Privacy Act rights, including how to delete their personal information:"): "PrivacyPolicyURL"
+        },
+        "yes_no": ["CollectsMinorsData", "CollectsReproductiveHealthData"]
+    },
+    # YourDigitalRights.org broker list; rows carry one more field than the
+    # header (a trailing separator), so no column is used as the index
+    "ydr": {
+        "path": PROJECT_ROOT / "data/raw_data/data-brokers-15-10-2025.csv",
+        "label": "YourDigitalRights",
+        "read_options": {"index_col": False, "encoding": "utf-8-sig"},
+        "columns": {
+            "Company Name": "Name",
+            "Domain": "WebsiteURL",
+            "Privacy Policy URL": "PrivacyPolicyURL",
+            "Emails": "Email",
+            "Phone Numbers": "Phone",
+            "Address": "Address",
+            "Company Geo City": "City",
+            "Company Geo State Code": "State",
+            "Company Geo Postal Code": "ZipCode",
+            "Company Geo Country": "Country"
+        },
+        "yes_no": []
+    }
+}
+
+
+def _header_key(header):
+    return " ".join(str(header).split())
+
+
+@instrumented()
+def read_source(name):
+    """
+    Read one registry and map it onto the canonical layout.
+
+    Args:
+        name (str): Key in SOURCES
+
+    Returns:
+        pd.DataFrame: CANONICAL_COLUMNS, one row per named registry entry
+            (unreported Collects* columns are NaN)
+    """
+    source = SOURCES[name]
+    columns = {_header_key(header): canonical for header, canonical in source["columns"].items()}
+    data = pd.read_csv(source["path"], usecols=lambda header: _header_key(header) in columns,
+                       dtype=str, **source["read_options"])
+    missing = set(columns) - {_header_key(header) for header in data.columns}
+    if missing:
+        raise ValueError(f"{name}: columns not found: {', '.join(sorted(missing))}")
+    data = data.rename(columns=lambda header: columns[_header_key(header)])
+
+    data['Name'] = data['Name'].str.strip()
+    data = data[data['Name'].notna() & (data['Name'] != '')]
+    for col in source["yes_no"]:
+        answers = data[col].str.strip().str.lower()
+        data[col] = answers.map({'yes': 1.0, 'no': 0.0})
+    data = data.reindex(columns=CANONICAL_COLUMNS)
+    data['RegistrySource'] = source["label"]
+    collects_cols = [col for col in CANONICAL_COLUMNS if col.startswith('Collects')]
+    data[collects_cols] = data[collects_cols].astype(np.float64)
+    return data.reset_index(drop=True)
+
+
+def check_sources(names):
+    """Raise KeyError for names that are not in SOURCES."""
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        raise KeyError(f"Unknown registry sources: {', '.join(unknown)} (known: {', '.join(SOURCES)})")
+
+
+def read_sources(names, workers=None):
+    """
+    Read several registries in parallel worker processes.
+
+    Args:
+        names (list): Keys in SOURCES
+        workers (int, optional): Worker processes (defaults to one per source)
+
+    Returns:
+        list: One canonical DataFrame per source, in the order of `names`
+    """
+    check_sources(names)
+    if len(names) <= 1 or workers == 1:
+        return [read_source(name) for name in names]
+    with ProcessPoolExecutor(max_workers=workers or len(names)) as pool:
+        return list(pool.map(read_source, names))
@@ -0,0 +1,97 @@
+"""
+Broker Frame Schema Utilities
+=============================
+
+Declared compact dtypes for the merged broker frame and the LLM response
+data, a downcasting pass that applies them, and a per-column memory report.
+
+Declared dtypes:
+    Collects*          -> Int8 (nullable: 0 = No, 1 = Yes, 2 = Not Reported)
+    RegistrySource_*   -> bit-packed Arrow booleans (numpy bool without pyarrow)
+    State, Country, ...-> category
+    other text         -> Arrow-backed strings (pandas strings without pyarrow)
+"""
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+COLLECTS_DTYPE = "Int8"
+ONE_HOT_DTYPE = "bool[pyarrow]" if HAS_PYARROW else "bool"
+TEXT_DTYPE = "string[pyarrow]" if HAS_PYARROW else "string"
+
+CATEGORICAL_COLUMNS = ["RegistrySource", "State", "Country", "County", "City"]
+
+
+def declared_dtype(column):
+    """
+    Look up the schema dtype declared for a column.
+
+    Args:
+        column (str): Column name
+
+    Returns:
+        str or None: Declared dtype, or None if the column is not declared
+    """
+    if column.startswith("Collects"):
+        return COLLECTS_DTYPE
+    if column.startswith("RegistrySource_"):
+        return ONE_HOT_DTYPE
+    if column in CATEGORICAL_COLUMNS:
+        return "category"
+    return None
+
+
+def apply_schema(data, compact_text=True):
+    """
+    Downcast a broker or LLM response frame to the declared schema.
+
+    Declared columns get their schema dtype, remaining integer columns are
+    downcast to the smallest integer type, and (if `compact_text`) remaining
+    object columns become strings. Float columns such as Phone are left as
+    float64 because float32 cannot hold every phone number exactly.
+
+    Args:
+        data (pd.DataFrame): Broker or LLM response data
+        compact_text (bool): Whether to convert free-text columns to strings
+
+    Returns:
+        pd.DataFrame: Copy of the data with compact dtypes
+    """
+    data = data.copy()
+    for col in data.columns:
+        dtype = declared_dtype(col)
+        if dtype is not None:
+            data[col] = data[col].astype(dtype)
+        elif pd.api.types.is_integer_dtype(data[col]) and not pd.api.types.is_extension_array_dtype(data[col]):
+            data[col] = pd.to_numeric(data[col], downcast="integer")
+        elif compact_text and data[col].dtype == object:
+            data[col] = data[col].astype(TEXT_DTYPE)
+    return data
+
+
+def memory_report(before, after):
+    """
+    Compare per-column memory usage of a frame before and after apply_schema.
+
+    Args:
+        before (pd.DataFrame): Original frame
+        after (pd.DataFrame): Compacted frame
+
+    Returns:
+        pd.DataFrame: dtype and bytes per column before/after, with a TOTAL row
+    """
+    report = pd.DataFrame({
+        "dtype_before": before.dtypes.astype(str),
+        "bytes_before": before.memory_usage(index=False, deep=True),
+        "dtype_after": after.dtypes.astype(str),
+        "bytes_after": after.memory_usage(index=False, deep=True),
+    })
+    report.loc["TOTAL"] = ["", report["bytes_before"].sum(), "", report["bytes_after"].sum()]
+    report["bytes_saved_pct"] = (1 - report["bytes_after"] / report["bytes_before"]) * 100
+    return report
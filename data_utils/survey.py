@@ -0,0 +1,116 @@
+"""
+Survey Decoding Utilities
+=========================
+
+Functions for decoding the "Select all that apply" questions of
+`survey_results.csv` into boolean indicator matrices (one row per
+respondent, one column per option).
+
+Google Forms joins the selected options with ", ", and several options
+contain commas themselves, so options are matched as literal substrings
+rather than by splitting. Each option is matched once per distinct response
+string and the result is broadcast to every respondent who gave it.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+DATA_TYPE_OPTIONS = [
+    "Commercial data (e.g., purchasing and transaction history)",
+    "Employment-related data",
+    "Location data",
+    "Biometric data (e.g., fingerprint, voice, facial recognition)",
+    "Personal information of individuals under 18",
+    "Reproductive health-related information",
+    "Social Security Number and government ID information",
+    "Network data (e.g., IP address, browsing history)",
+    "Not sure"
+]
+
+PURPOSE_OPTIONS = [
+    "Marketing",
+    "Personalized advertising",
+    "Employment-related decisions",
+    "Consumer financer decisions (e.g., loans, credit scores)",
+    "Law enforcement access without a subpoena",
+    "None of the above"
+]
+
+ENTITY_OPTIONS = [
+    "Government agencies",
+    "Corporations",
+    "Educational or research institutions",
+    "None of the above"
+]
+
+POLICY_OPTIONS = [
+    "Right to access personal data",
+    "Right to correct personal data",
+    "Right to delete personal data",
+    "Protections against discrimination",
+    "Restrictions on targeted advertising",
+    "Option to opt out of data collection or sharing"
+]
+
+# Multi-select question columns of survey_results.csv and their options
+MULTISELECT_QUESTIONS = {
+    "2. What types of data do you think data brokers collect? (Select all that apply)": DATA_TYPE_OPTIONS,
+    "3. Which types of your personal data are you comfortable being used for any purpose? (Select all that apply)": DATA_TYPE_OPTIONS,
+    "4. What purposes are you comfortable with your personal data being used for? (Select all that apply)": PURPOSE_OPTIONS,
+    "5. Which entities are you comfortable sharing your personal data with? (Select all that apply)": ENTITY_OPTIONS,
+    "6. Which of the following do you think should be included in data privacy laws and policies? (Select all that apply)": POLICY_OPTIONS
+}
+
+
+def decode_multiselect(responses, options):
+    """
+    Decode a multi-select column into a boolean indicator matrix.
+
+    Args:
+        responses (pd.Series): Joined selections, one per respondent
+        options (list): Option texts to look for
+
+    Returns:
+        pd.DataFrame: Boolean indicators with one column per option, indexed
+            like `responses` (missing responses select nothing)
+    """
+    codes, uniques = pd.factorize(responses)
+    distinct = pd.Series(np.asarray(uniques, dtype=object)).astype(str)
+    # The extra all-False row is selected by the -1 code of missing responses
+    indicators = np.zeros((len(distinct) + 1, len(options)), dtype=bool)
+    for position, option in enumerate(options):
+        indicators[:-1, position] = distinct.str.contains(option, regex=False).to_numpy(dtype=bool)
+    return pd.DataFrame(indicators[codes], index=responses.index, columns=list(options))
+
+
+def decode_survey(survey, questions=None):
+    """
+    Decode every multi-select question of a survey.
+
+    Args:
+        survey (pd.DataFrame): Survey responses
+        questions (dict, optional): Column -> options (defaults to MULTISELECT_QUESTIONS)
+
+    Returns:
+        dict: Column -> indicator matrix from decode_multiselect
+    """
+    questions = questions or MULTISELECT_QUESTIONS
+    return {
+        column: decode_multiselect(survey[column], options)
+        for column, options in questions.items()
+        if column in survey.columns
+    }
+
+
+def option_percentages(indicators):
+    """
+    Percentage of respondents selecting each option.
+
+    Args:
+        indicators (pd.DataFrame): Output of decode_multiselect
+
+    Returns:
+        pd.Series: Percentage (0-100) indexed by option
+    """
+    return indicators.sum() / len(indicators) * 100
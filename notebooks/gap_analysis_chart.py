@@ -1,16 +1,49 @@
+import sys
 import pandas as pd
 import altair as alt
 import numpy as np
 from pathlib import Path
 
-def create_gap_chart_data_types(df_brokers, df_survey):
+# Make data_utils importable when run as a script; paths come from data_utils.paths
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from data_utils.paths import LLM_RESULTS_CSV
+from data_utils.privacy_policy_analyzer import explicit_permission_rates
+from data_utils.survey import option_percentages
+
+LLM_RESULTS_PATH = LLM_RESULTS_CSV
+
+# Survey questions compared with the brokers; the builders take their decoded
+# indicator matrices (data_utils.survey.decode_survey), so the survey is decoded once
+COMFORT_DATA_TYPES = "3. Which types of your personal data are you comfortable being used for any purpose? (Select all that apply)"
+COMFORT_USE_CASES = "4. What purposes are you comfortable with your personal data being used for? (Select all that apply)"
+COMFORT_ENTITIES = "5. Which entities are you comfortable sharing your personal data with? (Select all that apply)"
+
+# LLM Q1 data use category -> (chart label, survey option of question 4)
+USE_CASE_CATEGORIES = {
+    "marketing": ("Marketing", "Marketing"),
+    "personalized_ads": ("Personalized advertising", "Personalized advertising"),
+    "employment": ("Employment decisions", "Employment-related decisions"),
+    "consumer_finance": ("Consumer finance decisions", "Consumer financer decisions (e.g., loans, credit scores)"),
+    "law_no_subpoena": ("Law enforcement (no subpoena)", "Law enforcement access without a subpoena")
+}
+
+# LLM Q2 sharing entity category -> (chart label, survey option of question 5)
+ENTITY_CATEGORIES = {
+    "gov": ("Government agencies", "Government agencies"),
+    "corporations": ("Corporations", "Corporations"),
+    "education_research": ("Educational or research institutions", "Educational or research institutions")
+}
+
+def create_gap_chart_data_types(df_brokers, survey_indicators):
     """
     Prepares data for a gap chart visualizing the disparity between
     data types collected by brokers and those consumers are comfortable with.
 
     Args:
         df_brokers (pd.DataFrame): DataFrame containing data broker information.
-        df_survey (pd.DataFrame): DataFrame containing survey results.
+        survey_indicators (dict): Decoded survey responses (output of decode_survey).
 
     Returns:
         pd.DataFrame: A DataFrame formatted for Altair, with columns for
@@ -41,8 +74,6 @@ def create_gap_chart_data_types(df_brokers, df_survey):
                 broker_percentages.append({'Category': consumer_cat, 'Source': 'Data Brokers (Reported)', 'Percentage': percentage})
 
     # 2. Process Survey Data (Consumer Comfort)
-    comfort_col = "3. Which types of your personal data are you comfortable being used for any purpose? (Select all that apply)"
-    
     # Standardize survey categories to match broker categories for comparison
     consumer_category_map = {
         "Commercial data (e.g., purchasing and transaction history)": "Commercial transactions data",
@@ -55,19 +86,11 @@ def create_gap_chart_data_types(df_brokers, df_survey):
         "Network data (e.g., IP address, browsing history)": "Network data"
     }
 
-    survey_comfort_counts = {}
-    for _cat, short_name in consumer_category_map.items():
-        survey_comfort_counts[short_name] = 0
+    comfort = survey_indicators[COMFORT_DATA_TYPES][list(consumer_category_map)]
+    survey_comfort_percentages = option_percentages(comfort).rename(consumer_category_map)
 
-    for responses in df_survey[comfort_col].dropna():
-        for category_long_name, category_short_name in consumer_category_map.items():
-            if category_long_name in responses:
-                survey_comfort_counts[category_short_name] = survey_comfort_counts.get(category_short_name, 0) + 1
-    
-    total_respondents = len(df_survey)
     consumer_percentages = []
-    for category, count in survey_comfort_counts.items():
-        percentage = (count / total_respondents) * 100
+    for category, percentage in survey_comfort_percentages.items():
         consumer_percentages.append({'Category': category, 'Source': 'Consumers', 'Percentage': percentage})
 
     # Combine and Clean
@@ -101,83 +124,73 @@ def create_gap_chart_data_types(df_brokers, df_survey):
 
     return combined_df
 
-def create_gap_chart_use_cases(df_brokers, df_survey):
+def _policy_gap_data(policy_rates, comfort, categories, broker_source):
+    """
+    Combines explicit policy permission rates with the share of consumers
+    comfortable with the same categories.
+
+    Args:
+        policy_rates (pd.Series): Percentage of all analyzed policies explicitly allowing each LLM category.
+        comfort (pd.DataFrame): Decoded multi-select survey responses (one column per option).
+        categories (dict): LLM category -> (chart label, survey option).
+        broker_source (str): 'Source' value for the policy percentages.
+
+    Returns:
+        pd.DataFrame: A DataFrame formatted for Altair, with columns for
+                      'Category', 'Source', and 'Percentage'.
+    """
+    labels = [label for label, _ in categories.values()]
+    comfort = option_percentages(comfort[[option for _, option in categories.values()]])
+
+    combined_df = pd.concat([
+        pd.DataFrame({'Category': labels, 'Source': broker_source,
+                      'Percentage': policy_rates.reindex(list(categories), fill_value=0.0).to_numpy()}),
+        pd.DataFrame({'Category': labels, 'Source': 'Consumers', 'Percentage': comfort.to_numpy()})
+    ], ignore_index=True)
+
+    # Keep the order of `categories` for consistent plotting
+    combined_df['Category'] = pd.Categorical(combined_df['Category'], categories=labels, ordered=True)
+    return combined_df.sort_values(['Category', 'Source'])
+
+def create_gap_chart_use_cases(survey_indicators, policy_rates=None):
     """
     Prepares data for a gap chart visualizing the disparity between
     use cases permitted by brokers and those consumers are comfortable with.
 
     Args:
-        df_brokers (pd.DataFrame): DataFrame containing data broker information.
-        df_survey (pd.DataFrame): DataFrame containing survey results.
+        survey_indicators (dict): Decoded survey responses (output of decode_survey).
+        policy_rates (pd.Series, optional): Output of explicit_permission_rates; computed
+                                            from LLM_RESULTS_PATH if not given.
 
     Returns:
         pd.DataFrame: A DataFrame formatted for Altair, with columns for
                       'Category', 'Source', and 'Percentage'.
     """
-    # 1. Process Data Broker Data (Use Cases - assuming similar Collects pattern or from analysis)
-    # The notebook output (Figure 3 in index.md) provides these percentages directly.
-    # We will hardcode these based on the analysis output or retrieve from a more structured source if available.
-    # For now, let's assume we can get these from the analysis (e.g., from the `create_policy_analysis_chart` function
-    # or direct parsing of the notebook's generated data if it were saved.)
-    # Given the prompt, we'll use the percentages from the `index.md` text directly.
-    broker_use_case_percentages = [
-        {'Category': 'Marketing', 'Source': 'Data Brokers (Explicit)', 'Percentage': 95.5},
-        {'Category': 'Personalized advertising', 'Source': 'Data Brokers (Explicit)', 'Percentage': 86.0},
-        {'Category': 'Employment decisions', 'Source': 'Data Brokers (Explicit)', 'Percentage': 59.0} # from text "59% allow data to be used in employment decisions"
-    ]
+    if policy_rates is None:
+        policy_rates = explicit_permission_rates(LLM_RESULTS_PATH)
+    return _policy_gap_data(policy_rates, survey_indicators[COMFORT_USE_CASES], USE_CASE_CATEGORIES,
+                            'Data Brokers (Explicit)')
 
-    # 2. Process Survey Data (Consumer Comfort for Use Cases)
-    comfort_col_use_cases = "4. What purposes are you comfortable with your personal data being used for? (Select all that apply)"
-    
-    # Standardize survey categories to match broker categories for comparison
-    consumer_use_case_map = {
-        "Marketing": "Marketing",
-        "Personalized advertising": "Personalized advertising",
-        "Employment decisions (e.g., hiring, promotions)": "Employment decisions",
-        # Add other relevant mappings if they exist in survey data but not in broker text example
-    }
-
-    survey_comfort_use_cases_counts = {}
-    for _cat, short_name in consumer_use_case_map.items():
-        survey_comfort_use_cases_counts[short_name] = 0
-        
-    for responses in df_survey[comfort_col_use_cases].dropna():
-        for category_long_name, category_short_name in consumer_use_case_map.items():
-            if category_long_name in responses:
-                survey_comfort_use_cases_counts[category_short_name] = survey_comfort_use_cases_counts.get(category_short_name, 0) + 1
-    
-    total_respondents = len(df_survey)
-    consumer_use_cases_percentages = []
-    for category, count in survey_comfort_use_cases_counts.items():
-        percentage = (count / total_respondents) * 100
-        consumer_use_cases_percentages.append({'Category': category, 'Source': 'Consumers', 'Percentage': percentage})
+def create_gap_chart_entities(survey_indicators, policy_rates=None):
+    """
+    Prepares data for a gap chart visualizing the disparity between
+    entities brokers may share data with and those consumers are comfortable with.
 
-    # Combine and Clean
-    combined_df = pd.DataFrame(broker_use_case_percentages + consumer_use_cases_percentages)
-    
-    # Ensure all categories have both consumer and broker data for charting
-    pivoted_df = combined_df.pivot_table(index='Category', columns='Source', values='Percentage').fillna(0)
-    combined_df = pivoted_df.reset_index().melt(id_vars='Category', var_name='Source', value_name='Percentage')
+    Args:
+        survey_indicators (dict): Decoded survey responses (output of decode_survey).
+        policy_rates (pd.Series, optional): Output of explicit_permission_rates; computed
+                                            from LLM_RESULTS_PATH if not given.
 
-    # Sort categories for consistent plotting order
-    all_categories = combined_df['Category'].unique()
-    
-    existing_sort_order = [
-        "Marketing",
-        "Personalized advertising",
-        "Employment decisions"
-    ]
-    
-    ordered_categories = [cat for cat in existing_sort_order if cat in all_categories]
-    new_categories = sorted([cat for cat in all_categories if cat not in ordered_categories])
-    dynamic_sort_order = ordered_categories + new_categories
-    
-    combined_df['Category'] = pd.Categorical(combined_df['Category'], categories=dynamic_sort_order, ordered=True)
-    combined_df = combined_df.sort_values('Category')
-    
-    return combined_df
+    Returns:
+        pd.DataFrame: A DataFrame formatted for Altair, with columns for
+                      'Category', 'Source', and 'Percentage'.
+    """
+    if policy_rates is None:
+        policy_rates = explicit_permission_rates(LLM_RESULTS_PATH)
+    return _policy_gap_data(policy_rates, survey_indicators[COMFORT_ENTITIES], ENTITY_CATEGORIES,
+                            'Data Brokers (Explicit)')
 
-def create_dumbbell_chart(data, title, x_label, y_label):
+def create_dumbbell_chart(data, title, x_label, y_label, aggregate=False):
     """
     Creates an Altair dumbbell chart to visualize gaps between two sources.
 
@@ -186,10 +199,19 @@ def create_dumbbell_chart(data, title, x_label, y_label):
         title (str): Chart title.
         x_label (str): Label for the x-axis.
         y_label (str): Label for the y-axis.
+        aggregate (bool): Embed only the mean 'Percentage' per ('Category', 'Source')
+                          instead of every row (and column) of `data`.
 
     Returns:
         alt.Chart: An Altair dumbbell chart.
     """
+    if aggregate:
+        data = (
+            data.groupby(['Category', 'Source'], observed=True, sort=False)['Percentage']
+            .mean()
+            .reset_index()
+        )
+
     base = alt.Chart(data).encode(
         y=alt.Y('Category:N', title=y_label, sort=alt.EncodingSortField(field="Category", op="min", order='descending')),
     )
@@ -234,32 +256,8 @@ def create_dumbbell_chart(data, title, x_label, y_label):
     return chart
 
 if __name__ == '__main__':
-    # Determine the project root dynamically
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-
-    # Load data
-    df_brokers = pd.read_csv(project_root / 'data/cleaned_data/uq-data-brokers.csv')
-    df_survey = pd.read_csv(project_root / 'data/raw_data/survey/survey_results.csv')
-
-    # Create and save Data Types chart
-    data_types_chart_data = create_gap_chart_data_types(df_brokers, df_survey)
-    chart1 = create_dumbbell_chart(
-        data_types_chart_data,
-        title='Disparity: Data Broker Collection vs. Consumer Comfort (Data Types)',
-        x_label='Percentage (%)',
-        y_label='Data Type'
-    )
-    chart1.save(project_root / 'notebooks/imgs/Disparity - Data Types.svg')
-    print("Saved ../notebooks/imgs/Disparity - Data Types.svg")
-
-    # Create and save Use Cases chart
-    use_cases_chart_data = create_gap_chart_use_cases(df_brokers, df_survey)
-    chart2 = create_dumbbell_chart(
-        use_cases_chart_data,
-        title='Disparity: Data Broker Collection vs. Consumer Comfort (Use Cases)',
-        x_label='Percentage (%)',
-        y_label='Use Case'
-    )
-    chart2.save(project_root / 'notebooks/imgs/Disparity - Use Cases.svg')
-    print("Saved ../notebooks/imgs/Disparity - Use Cases.svg")
+    from data_utils.figures import build_figures
+
+    # Render the disparity charts through the figure pipeline, which skips
+    # charts whose data and spec are unchanged and renders the rest in parallel
+    build_figures(['disparity-data-types', 'disparity-use-cases', 'disparity-entities'])